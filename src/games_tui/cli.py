@@ -0,0 +1,234 @@
+import argparse
+import os
+import sys
+import time
+
+from typing import List, Optional
+
+
+def positive_int(text: str) -> int:
+    """
+    Parses a count that must be at least 1, for argparse.
+
+    Args:
+        text (str): The argument.
+    Returns:
+        int: The count.
+    """
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {text!r}")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def non_negative_float(text: str) -> float:
+    """
+    Parses a duration that must not be negative, for argparse.
+
+    Args:
+        text (str): The argument.
+    Returns:
+        float: The duration.
+    """
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid float value: {text!r}")
+    if not value >= 0:
+        raise argparse.ArgumentTypeError(f"must be at least 0, got {value}")
+    return value
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    """
+    Parses the command line arguments of the application.
+
+    Args:
+        argv (List[str]): Arguments, without the program name.
+    Returns:
+        argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog="games-tui", description="Terminal based mini games."
+    )
+    parser.add_argument(
+        "--build-tables",
+        action="store_true",
+        help="generate the Rubik's cube solver tables and exit",
+    )
+    parser.add_argument(
+        "--processes",
+        type=positive_int,
+        default=None,
+        help="worker processes for headless commands (default: all cores)",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="root seed of every deal and scramble of the session (default: random)",
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    verify = commands.add_parser(
+        "verify", help="check that recorded Rubik's cube solves end solved"
+    )
+    verify.add_argument(
+        "files", nargs="*", help="solves files (default: the recorded solves of every cube)"
+    )
+    add_processes(verify)
+    verify.add_argument(
+        "--chunk-size",
+        type=positive_int,
+        default=512,
+        help="solves per work unit (default: 512)",
+    )
+
+    solve = commands.add_parser(
+        "solve",
+        help="solve Rubik's cube scrambles, one per line, printing JSON lines",
+    )
+    solve.add_argument(
+        "file", nargs="?", default="-", help="scrambles file (default: stdin)"
+    )
+    add_processes(solve)
+    solve.add_argument(
+        "--max-length",
+        type=positive_int,
+        default=22,
+        help="solution length that is good enough (default: 22)",
+    )
+    solve.add_argument(
+        "--timeout",
+        type=non_negative_float,
+        default=0.5,
+        help="seconds to look for a short solution (default: 0.5)",
+    )
+    solve.add_argument(
+        "--unordered",
+        action="store_true",
+        help="print results as they finish instead of in input order",
+    )
+    solve.add_argument(
+        "--in-flight",
+        type=positive_int,
+        default=None,
+        help="bound on scrambles being solved at once (default: 4 per process)",
+    )
+    return parser.parse_args(argv)
+
+
+def add_processes(command: argparse.ArgumentParser) -> None:
+    """
+    Accepts --processes after a command too. Unless given there, the value
+    given before the command is kept.
+    """
+    command.add_argument(
+        "--processes",
+        type=positive_int,
+        default=argparse.SUPPRESS,
+        help="worker processes (default: all cores)",
+    )
+
+
+def build_tables(processes: Optional[int]) -> int:
+    """
+    Generates any missing solver tables in the user data directory.
+    """
+    from games.rubiks.pocket import PocketSolver
+    from games.rubiks.tables import TABLES_DIR, Tables
+
+    print(f"Building Rubik's cube solver tables in {TABLES_DIR}")
+    start = time.time()
+    Tables(processes=processes or os.cpu_count(), log=lambda line: print(f"> {line}"))
+    PocketSolver(log=lambda line: print(f"> {line}"))
+    print(f"Tables ready ({time.time() - start:.1f}s)")
+    return 0
+
+
+def verify(files: List[str], processes: Optional[int], chunk_size: int) -> int:
+    """
+    Verifies recorded solves, and reports the failures and throughput of
+    every file. Exits with 1 if any solve does not end solved.
+    """
+    import glob
+
+    from games.rubiks.replay import SOLVES_PATH
+    from games.rubiks.verify import verify_files
+
+    for path in files:
+        if not os.path.isfile(path):
+            print(f"verify: no such file: {path}")
+            return 2
+    if not files:
+        recorded = os.path.join(os.path.dirname(SOLVES_PATH), "*solves.bin")
+        files = sorted(glob.glob(recorded)) or [SOLVES_PATH]
+    ok = True
+    try:
+        for report in verify_files(files, processes, chunk_size):
+            print(
+                f"{report.path}: {report.total} solves, {len(report.failed)} failed "
+                f"({report.throughput():.0f} solves/s)"
+            )
+            for index in report.failed:
+                print(f"> solve {index} does not end solved")
+            ok = ok and not report.failed
+    except (OSError, ValueError) as e:
+        print(f"verify: {e}")
+        return 2
+    return 0 if ok else 1
+
+
+def solve(args: argparse.Namespace) -> int:
+    """
+    Solves the scrambles of a file or stdin over a process pool, and
+    streams one JSON line per scramble to stdout.
+    """
+    import json
+
+    from games.rubiks.bulk import solve_all
+
+    try:
+        f = sys.stdin if args.file == "-" else open(args.file, "r")
+    except OSError as e:
+        print(f"solve: {e}", file=sys.stderr)
+        return 2
+    failed = False
+    with f:
+        results = solve_all(
+            f,
+            processes=args.processes,
+            max_length=args.max_length,
+            timeout=args.timeout,
+            ordered=not args.unordered,
+            in_flight=args.in_flight,
+        )
+        for result in results:
+            failed = failed or "error" in result
+            print(json.dumps(result), flush=True)
+    return 1 if failed else 0
+
+
+def run(argv: List[str]) -> Optional[int]:
+    """
+    Runs the headless command given on the command line, if any.
+
+    Args:
+        argv (List[str]): Arguments, without the program name.
+    Returns:
+        Optional[int]: Exit code of the command, None to start the TUI.
+    """
+    args = parse_args(argv)
+    if args.seed is not None:
+        from games import seeds
+        seeds.reseed(args.seed)
+    if args.build_tables:
+        return build_tables(args.processes)
+    if args.command == "verify":
+        return verify(args.files, args.processes, args.chunk_size)
+    if args.command == "solve":
+        return solve(args)
+    return None
@@ -1,8 +1,7 @@
 import random
 
-from collections import deque
 from enum import Enum
-from typing import List, Deque, Optional, Iterator
+from typing import List, Optional, Iterator, Tuple
 
 
 class Suit(Enum):
@@ -59,121 +58,185 @@ class Rank(Enum):
         return str(self.value)
 
 
-class Card(object):
+# Cards are coded as small integers: 13 * (suit - 1) + (rank - 2) for the
+# 52 ranked cards, and JOKER for jokers. The rank, suit and color of every
+# code are looked up in the tables below, instead of going through the enums.
+
+NUM_RANKS = 13
+JOKER = 4 * NUM_RANKS
+NUM_CARDS = JOKER + 1
+
+RANKS: Tuple[Rank, ...] = tuple(Rank(c % NUM_RANKS + 2) for c in range(JOKER)) + (Rank.JOKER,)
+SUITS: Tuple[Suit, ...] = tuple(Suit(c // NUM_RANKS + 1) for c in range(JOKER)) + (Suit.JOKER,)
+
+# Order of the rank in a suit, aces low; jokers rank below every card.
+
+ORDERS: bytes = bytes(1 if r == Rank.ACE else r.value for r in RANKS)
+
+# Color pair of the suit: red for hearts and diamonds, black otherwise.
+
+COLORS: bytes = bytes(5 if s.value % 2 == 0 else 4 for s in SUITS)
+
+
+def code(rank: Rank, suit: Suit) -> int:
     """
-    A single playing card.
+    Gets the code of a card.
+
+    Args:
+        rank (Rank): Rank of the card.
+        suit (Suit): Suit of the card.
+    Returns:
+        int: The code, JOKER for jokers.
+    Raises:
+        ValueError: If only one of rank and suit is a joker.
+    """
+    if (rank == Rank.JOKER) != (suit == Suit.JOKER):
+        raise ValueError(f"Invalid card: {rank.name} of {suit.name}")
+    if rank == Rank.JOKER:
+        return JOKER
+    return (suit.value - 1) * NUM_RANKS + rank.value - 2
 
-    Attributes:
-        __rank (Rank): The rank of the card.
-        __suit (Suit): The suit of the card.
-        __face_up (bool): Whether the card faces up.
+
+class Card(int):
+    """
+    A single playing card: its code, see code(). There is one instance per
+    code, shared by every deck, so Card(rank, suit) allocates nothing, and
+    cards compare and hash as the integers they are. Cards hold no face up
+    state; the piles they lie in do.
     """
-    __rank: Rank
-    __suit: Suit
-    __face_up: bool
 
-    def __init__(self, rank: Rank, suit: Suit) -> None:
+    __slots__ = ()
+
+    def __new__(cls, rank: Rank, suit: Suit) -> "Card":
         """
-        Initializes a new playing card with value and color
-        specified in arguments of the constructor.
+        Gets the playing card of the rank and suit specified in arguments
+        of the constructor.
 
         Args:
-            value (Rank): Rank of the card. 
+            rank (Rank): Rank of the card.
             suit (Suit): Suit of the card.
         """
-        self.__rank = rank
-        self.__suit = suit
-        self.__face_up = False
+        return CARDS[code(rank, suit)]
+
+    @staticmethod
+    def from_code(code: int) -> "Card":
+        """
+        Gets the card of a code.
+        """
+        return CARDS[code]
 
     def rank(self) -> Rank:
-        return self.__rank
+        return RANKS[self]
 
 
     def suit(self) -> Suit:
-        return self.__suit
+        return SUITS[self]
 
 
-    def flip(self) -> None:
-        self.__face_up = not self.__face_up
+    def compare_color_to(self, other: "Card") -> bool:
+        return COLORS[self] == COLORS[other]
 
 
-    def face_up(self) -> bool:
-        return self.__face_up
+    def color(self) -> int:
+        return COLORS[self]
 
 
-    def compare_color_to(self, other: "Card") -> bool:
-        return self.__suit.value % 2 == 0 and other.suit().value % 2 == 0
+    def __lt__(self, other: "Card") -> bool:
+        return RANKS[self].value < RANKS[other].value
 
 
-    def color(self) -> int:
-        return 5 if self.__suit.value % 2 == 0 else 4 
-    
+    def __gt__(self, other: "Card") -> bool:
+        return RANKS[self].value > RANKS[other].value
 
-    def __eq__(self, other: "Card") -> bool:
-        return self.__rank == other.__rank and self.__suit == other.__suit
 
+    def __repr__(self) -> str:
+        return f"Card({RANKS[self].name}, {SUITS[self].name})"
 
-    def __lt__(self, other: "Card") -> bool:
-        return self.__rank.value < other.__rank.value
 
+    def __reduce__(self) -> Tuple:
+        """
+        Pickles the card as its code, unpickled to the shared instance.
+        """
+        return (Card.from_code, (int(self),))
 
-    def __gt__(self, other: "Card") -> bool:
-        return self.__rank > other.__rank
+
+    def __copy__(self) -> "Card":
+        return self
+
+
+    def __deepcopy__(self, memo: dict) -> "Card":
+        return self
+
+
+CARDS: Tuple[Card, ...] = tuple(int.__new__(Card, c) for c in range(NUM_CARDS))
 
 
 class Deck(object):
     """
     Generic interface for deck of playing cards. Supports drawing and push 
-    operations from both bottom and top of the deck. 
+    operations from both bottom and top of the deck. A deck may hold several
+    decks of cards, as the shoe of a casino game.
+
+    The cards are stored as one byte per card code, top of the deck last,
+    and handed out as the shared Card instances.
 
     Attributes:
-        __cards (Deque[Card]): Double-ended queue for storing cards.
+        decks (int): Number of decks of cards in the deck.
+        rng (Optional[random.Random]): Source of randomness of the shuffles.
+            Default: the random module.
+        __cards (bytearray): Code of each card, from the bottom to the top.
     """ 
-    __cards: Deque[Card]
+    decks: int
+    rng: Optional[random.Random]
+    __cards: bytearray
 
     def __init__(
         self, 
         jokers: Optional[int] = 0,
-        shuffle: Optional[bool] = False
+        shuffle: Optional[bool] = False,
+        decks: Optional[int] = 1,
+        rng: Optional[random.Random] = None,
     ) -> None:
         """
         Initializes in sorted state, unless optional shuffle parameter is set 
         to true in the constructor. By default the card desk initializes without 
         jokers, unless the 'jokers' param is set to true.
+
+        Args:
+            jokers (Optional[int]): Number of jokers in each deck of cards.
+            shuffle (Optional[bool]): Whether to shuffle the cards.
+            decks (Optional[int]): Number of decks of cards, e.g. 6 for a shoe.
+            rng (Optional[random.Random]): Source of randomness of the shuffles.
+        Raises:
+            ValueError: If the number of decks is not positive.
         """
-        self.__cards = deque(self.generate_deck(jokers))
+        if decks < 1:
+            raise ValueError(f"Invalid number of decks: {decks}")
+        self.decks = decks
+        self.rng = rng
+        self.__cards = self.generate_deck(jokers, decks)
         if shuffle:
             self.shuffle()
         
-    def generate_deck(self, jokers: int) -> Deque[Card]:
+    def generate_deck(self, jokers: int, decks: int = 1) -> bytearray:
         """
-        Generates a fresh deck of cards.
+        Generates fresh decks of cards, in sorted order.
 
         Args:
-            jokers (bool): Whether to include jokers in the deck.
+            jokers (int): Number of jokers in each deck.
+            decks (int): Number of decks of cards.
         Returns:
-            Deque[Card]: The generated deck of cards as double-ended queue.
+            bytearray: The code of each card, from the bottom to the top.
         """
-        deck = []
-        for suit in Suit:
-            if suit != Suit.JOKER:                      # skip Joker
-                for rank in Rank:
-                    if rank != Rank.JOKER:              # skip Joker again
-                        deck.append(Card(rank, suit))
-
-        for i in range(jokers):
-            deck.append(Card(Rank.JOKER, Suit.JOKER))
-
-        return deque(deck)
+        return bytearray(bytes(range(JOKER)) + bytes([JOKER]) * jokers) * decks
 
 
     def shuffle(self) -> None:
         """
-        Shuffles the cards.
+        Shuffles the cards in place, with the Fisher-Yates shuffle of the
+        random number generator, allocating nothing.
         """
-        deck_list = list(self.__cards)      # convert deque to list for shuffling
-        random.shuffle(deck_list)           # shuffle the list
-        self.__cards = deque(deck_list)     # convert the list back to deque
+        (self.rng or random).shuffle(self.__cards)
 
 
     def draw_from_top(self) -> Optional[Card]:
@@ -183,7 +246,7 @@ class Deck(object):
         Returns:
             Optional[Card]: Card from top of the deck if deck is not empty, else None.
         """
-        return self.__cards.pop() if self.__cards else None
+        return CARDS[self.__cards.pop()] if self.__cards else None
     
     def draw_from_bottom(self) -> Optional[Card]:
         """
@@ -192,7 +255,7 @@ class Deck(object):
         Returns:
             Optional[Card]: The bottom card of the deck, returns None if empty.
         """
-        return self.__cards.popleft() if self.__cards else None
+        return CARDS[self.__cards.pop(0)] if self.__cards else None
 
     def push_to_top(self, card: Card) -> None:
         """
@@ -210,7 +273,7 @@ class Deck(object):
         Args:
             card (Card): The card to place in the bottom of the deck.
         """
-        self.__cards.appendleft(card)
+        self.__cards.insert(0, card)
 
     def is_empty(self) -> bool:
         """
@@ -223,7 +286,7 @@ class Deck(object):
 
     def peek_top(self) -> Card:
         if not self.is_empty():
-            return self.__cards[-1]
+            return CARDS[self.__cards[-1]]
     
     def size(self) -> int:
         """ 
@@ -232,7 +295,7 @@ class Deck(object):
         return len(self.__cards)
 
     def __iter__(self) -> Iterator[Card]:
-        return iter(self.__cards)
+        return map(CARDS.__getitem__, self.__cards)
     
 
 if __name__ == "__main__":
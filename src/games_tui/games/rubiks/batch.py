@@ -0,0 +1,125 @@
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+
+from . import facelets
+from .rubiks import RubiksCube
+
+
+# Gather permutation of every move as rows of one array, plus an identity
+# row, so a per-cube move vector can leave some cubes untouched.
+
+NO_MOVE = 18
+
+MOVE_ARRAY = np.array(list(facelets.MOVES) + [facelets.IDENTITY], dtype=np.intp)
+
+SOLVED_ARRAY = np.frombuffer(facelets.SOLVED, dtype=np.uint8)
+
+
+class BatchCube(object):
+    """
+    Many Rubik's cubes simulated at once. The states are one (N, 54) array
+    of facelet colors, laid out as in RubiksCube, and a move is applied to
+    all cubes with a single fancy indexing operation.
+
+    Attributes:
+        states (np.ndarray): Facelet colors of every cube, as uint8.
+    """
+
+    states: np.ndarray
+
+    def __init__(self, n: int = 0, states: Optional[np.ndarray] = None) -> None:
+        """
+        Initializes a batch of n solved cubes, or of the given states.
+
+        Args:
+            n (int): Number of solved cubes.
+            states (Optional[np.ndarray]): Facelet colors, shaped (N, 54).
+        """
+        if states is None:
+            states = np.tile(SOLVED_ARRAY, (n, 1))
+        self.states = np.array(states, dtype=np.uint8)
+        if self.states.ndim != 2 or self.states.shape[1] != facelets.NUM_FACELETS:
+            raise ValueError("States must be shaped (N, 54)")
+
+    def __len__(self) -> int:
+        return self.states.shape[0]
+
+    def apply(self, moves: Union[int, np.ndarray]) -> None:
+        """
+        Applies a move to every cube, or one move per cube.
+
+        Args:
+            moves (Union[int, np.ndarray]): A move index, or N move indices.
+                NO_MOVE leaves a cube as it is.
+        """
+        if np.ndim(moves) == 0:
+            self.states = self.states[:, MOVE_ARRAY[moves]]
+        else:
+            self.states = np.take_along_axis(self.states, MOVE_ARRAY[moves], axis=1)
+
+    def apply_sequence(self, moves: np.ndarray) -> None:
+        """
+        Applies a sequence of moves to every cube.
+
+        Args:
+            moves (np.ndarray): Move indices shaped (L,) for the same sequence on
+                every cube, or (N, L) for one sequence per cube, padded with NO_MOVE.
+        """
+        moves = np.asarray(moves)
+        for i in range(moves.shape[-1]):
+            self.apply(moves[..., i])
+
+    def scramble(self, length: int, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+        """
+        Applies random moves to every cube, never turning the same face
+        twice in a row.
+
+        Args:
+            length (int): Number of moves per cube.
+            rng (Optional[np.random.Generator]): Source of randomness.
+        Returns:
+            np.ndarray: The applied moves, shaped (N, length).
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        n = len(self)
+        moves = np.empty((n, length), dtype=np.intp)
+        faces = np.full(n, -1)
+        for i in range(length):
+            # draw among the 5 other faces, by skipping over the last one
+            face = rng.integers(0, facelets.NUM_FACES - (faces >= 0), size=n)
+            face += (faces >= 0) & (face >= faces)
+            faces = face
+            moves[:, i] = face * 3 + rng.integers(0, 3, size=n)
+            self.apply(moves[:, i])
+        return moves
+
+    def is_solved(self) -> np.ndarray:
+        """
+        Checks which cubes are solved.
+
+        Returns:
+            np.ndarray: One bool per cube.
+        """
+        return (self.states == SOLVED_ARRAY).all(axis=1)
+
+    @classmethod
+    def from_cubes(cls, cubes: Iterable[RubiksCube]) -> "BatchCube":
+        """
+        Creates a batch holding the states of the given cubes.
+
+        Args:
+            cubes (Iterable[RubiksCube]): The cubes.
+        Returns:
+            BatchCube: The batch.
+        """
+        data = b"".join(cube.facelets() for cube in cubes)
+        return cls(states=np.frombuffer(data, dtype=np.uint8).reshape(-1, facelets.NUM_FACELETS))
+
+    def to_cubes(self) -> List[RubiksCube]:
+        """
+        Converts the batch to one RubiksCube per row.
+        """
+        data = self.states.tobytes()
+        size = facelets.NUM_FACELETS
+        return [RubiksCube.from_facelets(data[i:i + size]) for i in range(0, len(data), size)]
@@ -0,0 +1,105 @@
+import os
+import time
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Any, Deque, Dict, Iterable, Iterator, Optional, Set
+
+from . import facelets, notation
+from .cubie import CubieCube
+from .solver import DEFAULT_MAX_LENGTH, DEFAULT_TIMEOUT, Solver
+from .tables import get_tables
+
+
+# Solver of each worker process, over the tables mapped once per process.
+
+_solver: Optional[Solver] = None
+
+
+def _init_worker(directory: Optional[str]) -> None:
+    global _solver
+    _solver = Solver(get_tables(directory))
+
+
+def solve_scramble(index: int, scramble: str, max_length: int, timeout: float) -> Dict[str, Any]:
+    """
+    Solves the state reached by a scramble, in a worker process.
+
+    Args:
+        index (int): Line number of the scramble in the input.
+        scramble (str): The scramble in Singmaster notation.
+        max_length (int): Solution length that is good enough.
+        timeout (float): Seconds to look for a short solution.
+    Returns:
+        Dict[str, Any]: The result, with the solution, its length and the solve
+            time in seconds, or an error message.
+    """
+    result: Dict[str, Any] = {"index": index, "scramble": scramble}
+    try:
+        state = notation.apply(facelets.SOLVED, scramble)
+    except ValueError as e:
+        result["error"] = str(e)
+        return result
+    start = time.perf_counter()
+    moves = _solver.solve(CubieCube.from_facelets(state), max_length, timeout)
+    result["solution"] = notation.format_moves(moves)
+    result["length"] = len(moves)
+    result["seconds"] = round(time.perf_counter() - start, 6)
+    return result
+
+
+def solve_all(
+    scrambles: Iterable[str],
+    processes: Optional[int] = None,
+    max_length: int = DEFAULT_MAX_LENGTH,
+    timeout: float = DEFAULT_TIMEOUT,
+    ordered: bool = True,
+    in_flight: Optional[int] = None,
+    directory: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Solves scrambles over a pool of processes, yielding each result as soon
+    as it is ready. At most in_flight scrambles are submitted and not yet
+    yielded, so input is only read as fast as results are consumed, and
+    memory stays bounded however long the input is.
+
+    Args:
+        scrambles (Iterable[str]): Scrambles in Singmaster notation, blank ones skipped.
+        processes (Optional[int]): Worker processes. Default: all cores.
+        max_length (int): Solution length that is good enough.
+        timeout (float): Seconds to look for a short solution, per scramble.
+        ordered (bool): Yield results in input order, else in completion order.
+        in_flight (Optional[int]): Bound on pending scrambles. Default: 4 per process.
+        directory (Optional[str]): Table directory. Default: TABLES_DIR.
+    Yields:
+        Dict[str, Any]: The result of each scramble, see solve_scramble().
+    """
+    get_tables(directory)                   # build missing tables once, up front
+    processes = processes if processes is not None else os.cpu_count() or 1
+    limit = in_flight or 4 * processes
+    with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(directory,)) as pool:
+        queue: Deque[Future] = deque()
+        pending: Set[Future] = set()
+        for index, line in enumerate(scrambles):
+            scramble = line.strip()
+            if not scramble:
+                continue
+            future = pool.submit(solve_scramble, index, scramble, max_length, timeout)
+            if ordered:
+                queue.append(future)
+                while len(queue) >= limit or (queue and queue[0].done()):
+                    yield queue.popleft().result()
+            else:
+                pending.add(future)
+                done = {f for f in pending if f.done()}
+                if len(pending) >= limit and not done:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                pending -= done
+                for f in done:
+                    yield f.result()
+        while queue:
+            yield queue.popleft().result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for f in done:
+                yield f.result()
@@ -0,0 +1,119 @@
+from array import array
+from math import factorial
+from typing import Callable, Tuple
+
+from . import facelets
+from .cubie import CubieCube, MOVE_CUBES, perm_from_index
+
+
+N_MOVE = 18
+N_TWIST = 2187              # 3^7 corner orientations
+N_FLIP = 2048               # 2^11 edge orientations
+N_SLICE = 495               # C(12, 4) UD slice edge locations
+N_SLICE_SORTED = 11880      # 12! / 8! UD slice edge locations and order
+N_PERM_4 = 24               # 4! orders of the UD slice edges in the slice
+N_CORNERS = 40320           # 8! corner permutations
+N_UD_EDGES = 40320          # 8! top and bottom layer edge permutations
+
+# Moves that keep a cube inside the subgroup <U, D, L2, R2, F2, B2>.
+
+PHASE2_MOVES: Tuple[int, ...] = tuple(
+    m for m in range(N_MOVE)
+    if m // 3 in (0, 1) or m % 3 == facelets.HALF_TURN
+)
+
+# Order in which repeated quarter turns reach the three move directions.
+
+_POWERS = (facelets.CLOCKWISE, facelets.HALF_TURN, facelets.COUNTER_CLOCKWISE)
+
+
+def build_move_table(
+    size: int,
+    setter: Callable[[CubieCube, int], None],
+    getter: Callable[[CubieCube], int],
+    multiply: Callable[[CubieCube, CubieCube], None],
+    moves: Tuple[int, ...] = tuple(range(N_MOVE)),
+) -> array:
+    """
+    Builds the move table of a coordinate, such that table[18 * c + m] is
+    the coordinate after applying move m to a cube with coordinate c.
+
+    Args:
+        size (int): Number of coordinate values.
+        setter (Callable[[CubieCube, int], None]): Sets the coordinate of a cube.
+        getter (Callable[[CubieCube], int]): Gets the coordinate of a cube.
+        multiply (Callable[[CubieCube, CubieCube], None]): Part of the cube the coordinate lives on.
+        moves (Tuple[int, ...]): Moves to fill in, the others are left 0.
+    Returns:
+        array: The move table as unsigned 16 bit integers.
+    """
+    table = array("H", bytes(2 * size * N_MOVE))
+    wanted = set(moves)
+    cube = CubieCube()
+    for c in range(size):
+        setter(cube, c)
+        for face in range(facelets.NUM_FACES):
+            basic = MOVE_CUBES[face * 3 + facelets.CLOCKWISE]
+            for power in _POWERS:
+                multiply(cube, basic)
+                m = face * 3 + power
+                if m in wanted:
+                    table[N_MOVE * c + m] = getter(cube)
+            multiply(cube, basic)       # fourth quarter turn restores the cube
+    return table
+
+
+def twist_move_table() -> array:
+    return build_move_table(
+        N_TWIST, CubieCube.set_twist, CubieCube.get_twist, CubieCube.corner_multiply
+    )
+
+
+def flip_move_table() -> array:
+    return build_move_table(
+        N_FLIP, CubieCube.set_flip, CubieCube.get_flip, CubieCube.edge_multiply
+    )
+
+
+def slice_sorted_move_table() -> array:
+    return build_move_table(
+        N_SLICE_SORTED,
+        CubieCube.set_slice_sorted,
+        CubieCube.get_slice_sorted,
+        CubieCube.edge_multiply,
+    )
+
+
+def build_perm_move_table(n: int, move_perms: Tuple[Tuple[int, ...], ...], moves: Tuple[int, ...]) -> array:
+    """
+    Builds the move table of a permutation coordinate over n pieces. Faster
+    than build_move_table(), as every permutation is ranked by dictionary
+    lookup instead of being re-encoded.
+
+    Args:
+        n (int): Number of pieces in the permutation.
+        move_perms (Tuple[Tuple[int, ...], ...]): Piece permutation of each move.
+        moves (Tuple[int, ...]): Moves to fill in, the others are left 0.
+    Returns:
+        array: The move table as unsigned 16 bit integers.
+    """
+    perms = [tuple(perm_from_index(i, n)) for i in range(factorial(n))]
+    rank = {p: i for i, p in enumerate(perms)}
+    table = array("H", bytes(2 * len(perms) * N_MOVE))
+    for c, p in enumerate(perms):
+        row = N_MOVE * c
+        for m in moves:
+            table[row + m] = rank[tuple([p[i] for i in move_perms[m]])]
+    return table
+
+
+def corners_move_table() -> array:
+    return build_perm_move_table(
+        8, tuple(tuple(mc.cp) for mc in MOVE_CUBES), tuple(range(N_MOVE))
+    )
+
+
+def ud_edges_move_table() -> array:
+    return build_perm_move_table(
+        8, tuple(tuple(mc.ep[:8]) for mc in MOVE_CUBES), PHASE2_MOVES
+    )
@@ -0,0 +1,394 @@
+from typing import List, Optional, Tuple
+
+from . import facelets
+
+
+# Corner and edge numbering follows Kociemba: corners URF, UFL, ULB, UBR,
+# DFR, DLF, DBL, DRB and edges UR, UF, UL, UB, DR, DF, DL, DB, FR, FL,
+# BL, BR. The four edges FR..BR make up the UD slice.
+
+NUM_CORNERS = 8
+NUM_EDGES = 12
+
+FR = 8
+BR = 11
+
+# Facelet indices of every corner, starting with the top or bottom sticker
+# and continuing clockwise around the corner.
+
+CORNER_FACELETS: Tuple[Tuple[int, int, int], ...] = (
+    (8, 27, 38), (6, 36, 20), (0, 18, 47), (2, 45, 29),
+    (11, 44, 33), (9, 26, 42), (15, 53, 24), (17, 35, 51),
+)
+
+# Facelet indices of every edge, starting with the top or bottom sticker,
+# or the front or back sticker for the UD slice edges.
+
+EDGE_FACELETS: Tuple[Tuple[int, int], ...] = (
+    (5, 28), (7, 37), (3, 19), (1, 46), (14, 34), (10, 43),
+    (12, 25), (16, 52), (41, 30), (39, 23), (50, 21), (48, 32),
+)
+
+CORNER_COLORS = tuple(tuple(i // 9 for i in c) for c in CORNER_FACELETS)
+EDGE_COLORS = tuple(tuple(i // 9 for i in e) for e in EDGE_FACELETS)
+
+
+def c_nk(n: int, k: int) -> int:
+    """
+    Binomial coefficient, 0 when k > n.
+    """
+    if n < k:
+        return 0
+    if k > n // 2:
+        k = n - k
+    s, i, j = 1, n, 1
+    while i != n - k:
+        s *= i
+        s //= j
+        i -= 1
+        j += 1
+    return s
+
+
+def _rotate_left(arr: List[int], left: int, right: int) -> None:
+    temp = arr[left]
+    for i in range(left, right):
+        arr[i] = arr[i + 1]
+    arr[right] = temp
+
+
+def _rotate_right(arr: List[int], left: int, right: int) -> None:
+    temp = arr[right]
+    for i in range(right, left, -1):
+        arr[i] = arr[i - 1]
+    arr[left] = temp
+
+
+def perm_index(perm: List[int], n: int) -> int:
+    perm = perm[:n]
+    b = 0
+    for j in range(n - 1, 0, -1):
+        k = 0
+        while perm[j] != j:
+            _rotate_left(perm, 0, j)
+            k += 1
+        b = (j + 1) * b + k
+    return b
+
+
+def perm_from_index(idx: int, n: int) -> List[int]:
+    perm = list(range(n))
+    for j in range(n):
+        k = idx % (j + 1)
+        idx //= j + 1
+        while k > 0:
+            _rotate_right(perm, 0, j)
+            k -= 1
+    return perm
+
+
+class CubieCube(object):
+    """
+    Cube state on the cubie level: the permutation and orientation of the
+    8 corners and 12 edges. Position i holds the piece cp[i] (or ep[i])
+    twisted by co[i] (or flipped by eo[i]).
+
+    Attributes:
+        cp (List[int]): Corner permutation.
+        co (List[int]): Corner orientations, 0 to 2.
+        ep (List[int]): Edge permutation.
+        eo (List[int]): Edge orientations, 0 or 1.
+    """
+
+    cp: List[int]
+    co: List[int]
+    ep: List[int]
+    eo: List[int]
+
+    def __init__(
+        self,
+        cp: Optional[List[int]] = None,
+        co: Optional[List[int]] = None,
+        ep: Optional[List[int]] = None,
+        eo: Optional[List[int]] = None,
+    ) -> None:
+        """
+        Initializes a cubie cube, solved unless given the pieces.
+        """
+        self.cp = list(cp) if cp is not None else list(range(NUM_CORNERS))
+        self.co = list(co) if co is not None else [0] * NUM_CORNERS
+        self.ep = list(ep) if ep is not None else list(range(NUM_EDGES))
+        self.eo = list(eo) if eo is not None else [0] * NUM_EDGES
+
+    def __eq__(self, other: "CubieCube") -> bool:
+        return (
+            self.cp == other.cp and self.co == other.co
+            and self.ep == other.ep and self.eo == other.eo
+        )
+
+    def __repr__(self) -> str:
+        return f"CubieCube(cp={self.cp}, co={self.co}, ep={self.ep}, eo={self.eo})"
+
+    def copy(self) -> "CubieCube":
+        return CubieCube(self.cp, self.co, self.ep, self.eo)
+
+    @classmethod
+    def from_facelets(cls, state: bytes) -> "CubieCube":
+        """
+        Builds the cubie cube of a facelet state.
+
+        Args:
+            state (bytes): The 54 facelet colors.
+        Returns:
+            CubieCube: The equivalent cubie cube.
+        Raises:
+            ValueError: If a corner or edge does not exist on a cube.
+        """
+        cc = cls()
+        for i, fs in enumerate(CORNER_FACELETS):
+            cols = [state[f] for f in fs]
+            for ori in range(3):
+                if cols[ori] <= 1:          # top or bottom color
+                    break
+            else:
+                raise ValueError(f"Invalid corner at position {i}")
+            c1, c2 = cols[(ori + 1) % 3], cols[(ori + 2) % 3]
+            for j, (_, j1, j2) in enumerate(CORNER_COLORS):
+                if (c1, c2) == (j1, j2):
+                    cc.cp[i] = j
+                    cc.co[i] = ori
+                    break
+            else:
+                raise ValueError(f"Invalid corner at position {i}")
+
+        for i, (f1, f2) in enumerate(EDGE_FACELETS):
+            cols = (state[f1], state[f2])
+            for j, ec in enumerate(EDGE_COLORS):
+                if cols == ec:
+                    cc.ep[i] = j
+                    cc.eo[i] = 0
+                    break
+                if cols == ec[::-1]:
+                    cc.ep[i] = j
+                    cc.eo[i] = 1
+                    break
+            else:
+                raise ValueError(f"Invalid edge at position {i}")
+        return cc
+
+    def to_facelets(self) -> bytes:
+        """
+        Gets the facelet state of the cubie cube.
+
+        Returns:
+            bytes: The 54 facelet colors.
+        """
+        state = bytearray(facelets.SOLVED)
+        for i, fs in enumerate(CORNER_FACELETS):
+            j, ori = self.cp[i], self.co[i]
+            for k in range(3):
+                state[fs[(k + ori) % 3]] = CORNER_COLORS[j][k]
+        for i, fs in enumerate(EDGE_FACELETS):
+            j, ori = self.ep[i], self.eo[i]
+            for k in range(2):
+                state[fs[(k + ori) % 2]] = EDGE_COLORS[j][k]
+        return bytes(state)
+
+    # ==================================================================================
+    # ------------------------------- Group operations ---------------------------------
+    # ==================================================================================
+
+    def corner_multiply(self, b: "CubieCube") -> None:
+        """
+        Applies the corners of cube b after this cube's corners.
+        """
+        cp, co = self.cp, self.co
+        self.cp = [cp[p] for p in b.cp]
+        self.co = [(co[p] + o) % 3 for p, o in zip(b.cp, b.co)]
+
+    def edge_multiply(self, b: "CubieCube") -> None:
+        """
+        Applies the edges of cube b after this cube's edges.
+        """
+        ep, eo = self.ep, self.eo
+        self.ep = [ep[p] for p in b.ep]
+        self.eo = [(eo[p] + o) % 2 for p, o in zip(b.ep, b.eo)]
+
+    def multiply(self, b: "CubieCube") -> None:
+        """
+        Applies cube b after this cube, as if b's moves followed.
+        """
+        self.corner_multiply(b)
+        self.edge_multiply(b)
+
+    def move(self, move: int) -> None:
+        """
+        Applies a face turn by its move index.
+        """
+        self.multiply(MOVE_CUBES[move])
+
+    def inverse(self) -> "CubieCube":
+        """
+        Gets the inverse cube, which undoes this cube's moves.
+        """
+        inv = CubieCube()
+        for i, p in enumerate(self.cp):
+            inv.cp[p] = i
+        for i, p in enumerate(inv.cp):
+            inv.co[i] = (3 - self.co[p]) % 3
+        for i, p in enumerate(self.ep):
+            inv.ep[p] = i
+        for i, p in enumerate(inv.ep):
+            inv.eo[i] = self.eo[p]
+        return inv
+
+    def corner_parity(self) -> int:
+        s = 0
+        for i in range(NUM_CORNERS - 1, 0, -1):
+            for j in range(i - 1, -1, -1):
+                if self.cp[j] > self.cp[i]:
+                    s += 1
+        return s % 2
+
+    def edge_parity(self) -> int:
+        s = 0
+        for i in range(NUM_EDGES - 1, 0, -1):
+            for j in range(i - 1, -1, -1):
+                if self.ep[j] > self.ep[i]:
+                    s += 1
+        return s % 2
+
+    def is_solvable(self) -> bool:
+        """
+        Checks that the cube can be reached by face turns from the solved state.
+        """
+        return (
+            sorted(self.cp) == list(range(NUM_CORNERS))
+            and sorted(self.ep) == list(range(NUM_EDGES))
+            and sum(self.co) % 3 == 0
+            and sum(self.eo) % 2 == 0
+            and self.corner_parity() == self.edge_parity()
+        )
+
+    # ==================================================================================
+    # ---------------------------------- Coordinates -----------------------------------
+    # ==================================================================================
+
+    def get_twist(self) -> int:
+        """
+        Corner orientation coordinate, 0 <= twist < 3^7.
+        """
+        ret = 0
+        for i in range(NUM_CORNERS - 1):
+            ret = 3 * ret + self.co[i]
+        return ret
+
+    def set_twist(self, twist: int) -> None:
+        parity = 0
+        for i in range(NUM_CORNERS - 2, -1, -1):
+            self.co[i] = twist % 3
+            parity += self.co[i]
+            twist //= 3
+        self.co[NUM_CORNERS - 1] = (3 - parity % 3) % 3
+
+    def get_flip(self) -> int:
+        """
+        Edge orientation coordinate, 0 <= flip < 2^11.
+        """
+        ret = 0
+        for i in range(NUM_EDGES - 1):
+            ret = 2 * ret + self.eo[i]
+        return ret
+
+    def set_flip(self, flip: int) -> None:
+        parity = 0
+        for i in range(NUM_EDGES - 2, -1, -1):
+            self.eo[i] = flip % 2
+            parity += self.eo[i]
+            flip //= 2
+        self.eo[NUM_EDGES - 1] = parity % 2
+
+    def get_slice(self) -> int:
+        """
+        Location of the four UD slice edges, ignoring their order,
+        0 <= slice < C(12, 4). The slice edges are home when it is 0.
+        """
+        a, x = 0, 0
+        for j in range(NUM_EDGES - 1, -1, -1):
+            if FR <= self.ep[j] <= BR:
+                a += c_nk(11 - j, x + 1)
+                x += 1
+        return a
+
+    def get_slice_sorted(self) -> int:
+        """
+        Location and order of the four UD slice edges, 0 <= slice_sorted < 11880.
+        Less than 24 when the slice edges are in the UD slice.
+        """
+        a, x = 0, 0
+        edge4 = [0] * 4
+        for j in range(NUM_EDGES - 1, -1, -1):
+            if FR <= self.ep[j] <= BR:
+                a += c_nk(11 - j, x + 1)
+                edge4[3 - x] = self.ep[j]
+                x += 1
+        b = 0
+        for j in range(3, 0, -1):
+            k = 0
+            while edge4[j] != j + FR:
+                _rotate_left(edge4, 0, j)
+                k += 1
+            b = (j + 1) * b + k
+        return 24 * a + b
+
+    def set_slice_sorted(self, idx: int) -> None:
+        slice_edge = [FR + i for i in range(4)]
+        other_edge = [i for i in range(FR)]
+        b, a = idx % 24, idx // 24
+        self.ep = [-1] * NUM_EDGES
+        for j in range(1, 4):
+            k = b % (j + 1)
+            b //= j + 1
+            while k > 0:
+                _rotate_right(slice_edge, 0, j)
+                k -= 1
+        x = 4
+        for j in range(NUM_EDGES):
+            if a - c_nk(11 - j, x) >= 0:
+                self.ep[j] = slice_edge[4 - x]
+                a -= c_nk(11 - j, x)
+                x -= 1
+        x = 0
+        for j in range(NUM_EDGES):
+            if self.ep[j] == -1:
+                self.ep[j] = other_edge[x]
+                x += 1
+
+    def get_corners(self) -> int:
+        """
+        Corner permutation coordinate, 0 <= corners < 8!.
+        """
+        return perm_index(self.cp, NUM_CORNERS)
+
+    def set_corners(self, idx: int) -> None:
+        self.cp = perm_from_index(idx, NUM_CORNERS)
+
+    def get_ud_edges(self) -> int:
+        """
+        Permutation coordinate of the eight top and bottom layer edges,
+        0 <= ud_edges < 8!. Only defined while those edges stay out of
+        the UD slice.
+        """
+        return perm_index(self.ep, FR)
+
+    def set_ud_edges(self, idx: int) -> None:
+        self.ep = perm_from_index(idx, FR) + self.ep[FR:]
+
+
+def _build_move_cubes() -> List[CubieCube]:
+    return [CubieCube.from_facelets(facelets.apply(facelets.SOLVED, m)) for m in range(len(facelets.MOVES))]
+
+
+# Cubie cubes of all 18 face turns, indexed like facelets.MOVES.
+
+MOVE_CUBES: List[CubieCube] = _build_move_cubes()
@@ -0,0 +1,169 @@
+from operator import itemgetter
+from typing import Callable, Iterable, List, Sequence, Tuple
+
+
+Permutation = Tuple[int, ...]
+
+# Facelet index of the sticker in a given face, row and column is
+# face * 9 + row * 3 + col, with faces ordered top, bottom, left, right,
+# front, back. A solved cube holds the face index in every sticker.
+
+NUM_FACES = 6
+NUM_FACELETS = 54
+
+CLOCKWISE = 0
+COUNTER_CLOCKWISE = 1
+HALF_TURN = 2
+
+SOLVED: bytes = bytes(i // 9 for i in range(NUM_FACELETS))
+
+# Sticker cycles of a clockwise quarter turn of each face, seen from
+# outside the cube. The sticker at each index moves to the next index
+# of its cycle.
+
+CLOCKWISE_CYCLES: Tuple[Tuple[Tuple[int, ...], ...], ...] = (
+    ((0, 2, 8, 6), (1, 5, 7, 3), (18, 45, 27, 36), (19, 46, 28, 37), (20, 47, 29, 38)),
+    ((9, 11, 17, 15), (10, 14, 16, 12), (24, 42, 33, 51), (25, 43, 34, 52), (26, 44, 35, 53)),
+    ((18, 20, 26, 24), (19, 23, 25, 21), (0, 36, 9, 53), (3, 39, 12, 50), (6, 42, 15, 47)),
+    ((27, 29, 35, 33), (28, 32, 34, 30), (2, 51, 11, 38), (5, 48, 14, 41), (8, 45, 17, 44)),
+    ((36, 38, 44, 42), (37, 41, 43, 39), (6, 27, 11, 26), (7, 30, 10, 23), (8, 33, 9, 20)),
+    ((45, 47, 53, 51), (46, 50, 52, 48), (0, 24, 17, 29), (1, 21, 16, 32), (2, 18, 15, 35)),
+)
+
+IDENTITY: Permutation = tuple(range(NUM_FACELETS))
+
+
+def from_cycles(cycles: Iterable[Sequence[int]]) -> Permutation:
+    """
+    Builds a gather permutation from sticker cycles, such that the new
+    state is `[state[p] for p in perm]`.
+
+    Args:
+        cycles (Iterable[Sequence[int]]): Cycles of sticker movements.
+    Returns:
+        Permutation: The gather permutation of the cycles.
+    """
+    perm = list(IDENTITY)
+    for cycle in cycles:
+        for src, dst in zip(cycle, cycle[1:] + cycle[:1]):
+            perm[dst] = src
+    return tuple(perm)
+
+
+def compose(a: Sequence[int], b: Sequence[int]) -> Permutation:
+    """
+    Composes two gather permutations into one.
+
+    Args:
+        a (Sequence[int]): Permutation applied first.
+        b (Sequence[int]): Permutation applied second.
+    Returns:
+        Permutation: Permutation equal to applying a, then b.
+    """
+    return tuple(a[i] for i in b)
+
+
+def invert(perm: Sequence[int]) -> Permutation:
+    """
+    Inverts a gather permutation.
+
+    Args:
+        perm (Sequence[int]): The permutation to invert.
+    Returns:
+        Permutation: The inverse permutation.
+    """
+    inverse = [0] * len(perm)
+    for i, p in enumerate(perm):
+        inverse[p] = i
+    return tuple(inverse)
+
+
+def move_index(face: int, direction: int) -> int:
+    """
+    Gets the index of a face turn in the move tables.
+
+    Args:
+        face (int): Index of the face to turn.
+        direction (int): 0: clockwise, 1: counter clockwise, 2: half turn.
+    Returns:
+        int: The move index, face * 3 + direction.
+    """
+    return face * 3 + direction
+
+
+def inverse_move(move: int) -> int:
+    """
+    Gets the move index which undoes the given move.
+    """
+    face, direction = divmod(move, 3)
+    return face * 3 + (HALF_TURN if direction == HALF_TURN else 1 - direction)
+
+
+def _build_moves() -> List[Permutation]:
+    moves: List[Permutation] = []
+    for cycles in CLOCKWISE_CYCLES:
+        cw = from_cycles(cycles)
+        half = compose(cw, cw)
+        moves.extend((cw, invert(cw), half))
+    return moves
+
+
+# Gather permutations of all 18 face turns, indexed by move_index().
+
+MOVES: List[Permutation] = _build_moves()
+
+GATHERS: List[Callable[[bytes], Tuple[int, ...]]] = [itemgetter(*p) for p in MOVES]
+
+
+def apply(state: bytes, move: int) -> bytes:
+    """
+    Applies a single face turn to a facelet state.
+
+    Args:
+        state (bytes): The 54 facelet colors.
+        move (int): The move index.
+    Returns:
+        bytes: The new facelet state.
+    """
+    return bytes(GATHERS[move](state))
+
+
+# Centers never move, so a packed state only holds the other 48 stickers.
+# Each color takes 3 bits, written as one octal digit, which lets int()
+# and format() do the packing at C speed.
+
+PACKED_STICKERS: Tuple[int, ...] = tuple(i for i in range(NUM_FACELETS) if i % 9 != 4)
+
+_pack_gather = itemgetter(*PACKED_STICKERS)
+_unpack_gather = itemgetter(*[
+    PACKED_STICKERS.index(i) if i % 9 != 4 else len(PACKED_STICKERS) + i // 9
+    for i in range(NUM_FACELETS)
+])
+_TO_OCTAL = bytes.maketrans(bytes(range(8)), b"01234567")
+_FROM_OCTAL = bytes.maketrans(b"01234567", bytes(range(8)))
+_CENTERS = bytes(range(NUM_FACES))
+
+
+def pack(state: bytes) -> int:
+    """
+    Packs a facelet state into an integer of 3 bits per moving sticker.
+
+    Args:
+        state (bytes): The 54 facelet colors.
+    Returns:
+        int: The packed state, below 2^144.
+    """
+    return int(bytes(_pack_gather(state)).translate(_TO_OCTAL), 8)
+
+
+def unpack(key: int) -> bytes:
+    """
+    Unpacks an integer made by pack() into a facelet state.
+
+    Args:
+        key (int): The packed state.
+    Returns:
+        bytes: The 54 facelet colors.
+    """
+    stickers = format(key, "048o").encode().translate(_FROM_OCTAL)
+    return bytes(_unpack_gather(stickers + _CENTERS))
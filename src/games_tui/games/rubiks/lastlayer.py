@@ -0,0 +1,255 @@
+import random
+
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from . import facelets, notation
+from .cubie import CORNER_FACELETS, EDGE_FACELETS
+
+
+# The last layer is the top face. An OLL signature has one bit per last
+# layer sticker showing the top color; a PLL signature holds the color of
+# the 12 side stickers of the last layer, 3 bits each.
+
+LL_STICKERS: Tuple[int, ...] = (0, 1, 2, 3, 5, 6, 7, 8, 18, 19, 20, 27, 28, 29, 36, 37, 38, 45, 46, 47)
+LL_SIDE_STICKERS: Tuple[int, ...] = LL_STICKERS[8:]
+
+OLL_SOLVED = 0xFF                           # only the top face stickers show the top color
+
+# Bottom cross edges, and the corner and edge of each first two layers slot.
+
+CROSS_EDGES = (4, 5, 6, 7)
+F2L_SLOTS = ((4, 8), (5, 9), (6, 10), (7, 11))
+
+AUF = ("", "U", "U2", "U'")
+
+# Algorithm of every OLL case, named with its standard number, 1 to 57.
+# The algorithms are the usual ones, with wide and slice moves.
+
+OLL_CASES: List[Tuple[str, str]] = [
+    ("1", "R U2 R2 F R F' U2 R' F R F'"),
+    ("2", "r U r' U2 r U2 R' U2 R U' r'"),
+    ("3", "r' R2 U R' U r U2 r' U M'"),
+    ("4", "M U' r U2 r' U' R U' R' M'"),
+    ("5", "r' U2 R U R' U r"),
+    ("6", "r U2 R' U' R U' r'"),
+    ("7", "r U R' U R U2 r'"),
+    ("8", "l' U' L U' L' U2 l"),
+    ("9", "R U R' U' R' F R2 U R' U' F'"),
+    ("10", "R U R' U R' F R F' R U2 R'"),
+    ("11", "r U R' U R' F R F' R U2 r'"),
+    ("12", "M' R' U' R U' R' U2 R U' R r'"),
+    ("13", "F U R U' R2 F' R U R U' R'"),
+    ("14", "R' F R U R' F' R F U' F'"),
+    ("15", "r' U' r R' U' R U r' U r"),
+    ("16", "r U r' R U R' U' r U' r'"),
+    ("17", "F R' F' R2 r' U R U' R' U' M'"),
+    ("18", "r U R' U R U2 r2 U' R U' R' U2 r"),
+    ("19", "r' R U R U R' U' M' R' F R F'"),
+    ("20", "r U R' U' M2 U R U' R' U' M'"),
+    ("21", "R U2 R' U' R U R' U' R U' R'"),
+    ("22", "R U2 R2 U' R2 U' R2 U2 R"),
+    ("23", "R2 D' R U2 R' D R U2 R"),
+    ("24", "r U R' U' r' F R F'"),
+    ("25", "F' r U R' U' r' F R"),
+    ("26", "R U2 R' U' R U' R'"),
+    ("27", "R U R' U R U2 R'"),
+    ("28", "r U R' U' r' R U R U' R'"),
+    ("29", "R U R' U' R U' R' F' U' F R U R'"),
+    ("30", "F R' F R2 U' R' U' R U R' F2"),
+    ("31", "R' U' F U R U' R' F' R"),
+    ("32", "L U F' U' L' U L F L'"),
+    ("33", "R U R' U' R' F R F'"),
+    ("34", "R U R2 U' R' F R U R U' F'"),
+    ("35", "R U2 R2 F R F' R U2 R'"),
+    ("36", "L' U' L U' L' U L U L F' L' F"),
+    ("37", "F R' F' R U R U' R'"),
+    ("38", "R U R' U R U' R' U' R' F R F'"),
+    ("39", "L F' L' U' L U F U' L'"),
+    ("40", "R' F R U R' U' F' U R"),
+    ("41", "R U R' U R U2 R' F R U R' U' F'"),
+    ("42", "R' U' R U' R' U2 R F R U R' U' F'"),
+    ("43", "F' U' L' U L F"),
+    ("44", "F U R U' R' F'"),
+    ("45", "F R U R' U' F'"),
+    ("46", "R' U' R' F R F' U R"),
+    ("47", "R' U' R' F R F' R' F R F' U R"),
+    ("48", "F R U R' U' R U R' U' F'"),
+    ("49", "r U' r2 U r2 U r2 U' r"),
+    ("50", "r' U r2 U' r2 U' r2 U r'"),
+    ("51", "F U R U' R' U R U' R' F'"),
+    ("52", "R U R' U R U' B U' B' R'"),
+    ("53", "l' U2 L U L' U' L U L' U l"),
+    ("54", "r U2 R' U' R U R' U' R U' r'"),
+    ("55", "R' F R U R U' R2 F' R2 U' R' U R U R'"),
+    ("56", "r' U' r U' R' U R U' R' U R r' U r"),
+    ("57", "R U R' U' M' U R U' r'"),
+]
+
+# Algorithm of every PLL case, and of the solved last layer, which may
+# still need an adjustment of the top face.
+
+PLL_CASES: List[Tuple[str, str]] = [
+    ("Aa", "R' F R' B2 R F' R' B2 R2"),
+    ("Ab", "R2 B2 R F R' B2 R F' R"),
+    ("E", "R B' R' F R B R' F' R B R' F R B' R' F'"),
+    ("F", "R' U' F' R U R' U' R' F R2 U' R' U' R U R' U R"),
+    ("Ga", "R2 U R' U R' U' R U' R2 D U' R' U R D'"),
+    ("Gb", "R' U' R U D' R2 U R' U R U' R U' R2 D"),
+    ("Gc", "R2 U' R U' R U R' U R2 U D' R U' R' D"),
+    ("Gd", "R U R' U' D R2 U' R U' R' U R' U R2 D'"),
+    ("H", "R2 U2 R U2 R2 U2 R2 U2 R U2 R2"),
+    ("Ja", "L' U' L F L' U' L U L F' L2 U L"),
+    ("Jb", "R U R' F' R U R' U' R' F R2 U' R'"),
+    ("Na", "R U R' U R U R' F' R U R' U' R' F R2 U' R' U2 R U' R'"),
+    ("Nb", "R' U R U' R' F' U' F R U R' F R' F' R U' R"),
+    ("Ra", "R U' R' U' R U R D R' U' R D' R' U2 R'"),
+    ("Rb", "R2 F R U R U' R' F' R U2 R' U2 R"),
+    ("T", "R U R' U' R' F R2 U' R' U' R U R' F'"),
+    ("Ua", "R U' R U R U R U' R' U' R2"),
+    ("Ub", "R2 U R U R' U' R' U' R' U R'"),
+    ("V", "R' U R' U' B' R' B2 U' B' U B' R B R"),
+    ("Y", "F R U' R' U' R U R' F' R U R' U' R' F R F'"),
+    ("Z", "R' U' R U' R U R U' R' U R U R2 U' R'"),
+    ("AUF", ""),
+]
+
+
+class Case(NamedTuple):
+    """
+    A recognized solving stage and case.
+
+    Attributes:
+        stage (str): "F2L", "OLL", "PLL" or "Solved".
+        name (str): Name of the case.
+        algorithm (str): Moves solving the case from the exact state, top face
+            adjustments included; empty in the first two layers.
+    """
+
+    stage: str
+    name: str
+    algorithm: str
+
+
+def oll_signature(state: bytes) -> int:
+    """
+    Packs the orientation of the last layer: one bit per last layer sticker
+    showing the top color.
+    """
+    top = state[4]
+    key = 0
+    for i, p in enumerate(LL_STICKERS):
+        if state[p] == top:
+            key |= 1 << i
+    return key
+
+
+def pll_signature(state: bytes) -> int:
+    """
+    Packs the permutation of an oriented last layer: the colors of its 12
+    side stickers, 3 bits each.
+    """
+    key = 0
+    for p in LL_SIDE_STICKERS:
+        key = key << 3 | state[p]
+    return key
+
+
+def _solved(state: bytes, stickers: Iterable[int]) -> bool:
+    return all(state[p] == state[p - p % 9 + 4] for p in stickers)
+
+
+def cross_solved(state: bytes) -> bool:
+    """
+    Checks that the edges of the bottom cross are solved.
+    """
+    return _solved(state, (p for e in CROSS_EDGES for p in EDGE_FACELETS[e]))
+
+
+def f2l_pairs(state: bytes) -> int:
+    """
+    Counts the first two layers slots whose corner and edge are solved.
+    """
+    return sum(
+        _solved(state, CORNER_FACELETS[c] + EDGE_FACELETS[e]) for c, e in F2L_SLOTS
+    )
+
+
+def _join(*parts: str) -> str:
+    return " ".join(p for p in parts if p)
+
+
+def _build_index(
+    cases: List[Tuple[str, str]], signature, post_auf: bool
+) -> Dict[int, Tuple[str, str]]:
+    """
+    Maps the signature of every top face adjustment of every case to the
+    case name and the algorithm solving that exact state: the adjustment
+    before the algorithm, and for PLL the one after it. The algorithm with
+    the fewest moves is kept, a wide or slice move counting as one.
+    """
+    index: Dict[int, Tuple[str, str]] = {}
+    for name, algorithm in cases:
+        setup = notation.invert(algorithm)
+        for b in range(4):
+            for a in range(4 if post_auf else 1):
+                state = notation.apply(facelets.SOLVED, _join(AUF[a], setup, AUF[b]))
+                solution = _join(AUF[-b], algorithm, AUF[-a])
+                key = signature(state)
+                if key not in index or len(solution.split()) < len(index[key][1].split()):
+                    index[key] = (name, solution)
+    return index
+
+
+OLL_INDEX: Dict[int, Tuple[str, str]] = _build_index(OLL_CASES, oll_signature, False)
+PLL_INDEX: Dict[int, Tuple[str, str]] = _build_index(PLL_CASES, pll_signature, True)
+
+
+def recognize(state: bytes) -> Case:
+    """
+    Recognizes the stage and case of a cube solved layer by layer, with
+    dictionary lookups of the last layer signatures.
+
+    Args:
+        state (bytes): The 54 facelet colors.
+    Returns:
+        Case: The case, with the algorithm solving it.
+    """
+    if state == facelets.SOLVED:
+        return Case("Solved", "", "")
+    if not cross_solved(state):
+        return Case("F2L", "Cross", "")
+    pairs = f2l_pairs(state)
+    if pairs < len(F2L_SLOTS):
+        return Case("F2L", f"{pairs}/{len(F2L_SLOTS)} pairs", "")
+    key = oll_signature(state)
+    if key != OLL_SOLVED:
+        name, algorithm = OLL_INDEX[key]
+        return Case("OLL", name, algorithm)
+    name, algorithm = PLL_INDEX[pll_signature(state)]
+    return Case("PLL", name, algorithm)
+
+
+def drill(names: List[str], rng: Optional[random.Random] = None) -> str:
+    """
+    Generates a setup scramble for one of the given cases, seen from a
+    random side.
+
+    Args:
+        names (List[str]): Names of the cases to drill.
+        rng (Optional[random.Random]): Source of randomness.
+    Returns:
+        str: Moves from the solved cube to the case, in Singmaster notation.
+    Raises:
+        ValueError: If no case has one of the names.
+    """
+    rng = rng if rng is not None else random.Random()
+    wanted = set(names)
+    solutions = [
+        solution
+        for index in (OLL_INDEX, PLL_INDEX)
+        for name, solution in index.values()
+        if name in wanted
+    ]
+    if not solutions:
+        raise ValueError("No such case")
+    return notation.invert(rng.choice(solutions))
@@ -0,0 +1,139 @@
+from typing import Callable, List, Optional
+
+from . import facelets
+
+
+CHECKPOINT_INTERVAL = 64
+
+
+class MoveLog(object):
+    """
+    Unbounded log of the moves of a game, one byte per move, with undo and
+    redo. Undone moves are kept for redo until a new move is pushed. The
+    packed state is saved every CHECKPOINT_INTERVAL moves, so the state at
+    any move is found by replaying at most that many moves. States are the
+    54 facelets of the Rubik's cube, unless the functions to apply a move
+    and pack a state are given, e.g. for cubes of other sizes.
+
+    Attributes:
+        interval (int): Number of moves between two checkpoints.
+    """
+
+    interval: int
+
+    def __init__(
+        self,
+        start: bytes = facelets.SOLVED,
+        interval: int = CHECKPOINT_INTERVAL,
+        apply: Callable[[bytes, int], bytes] = facelets.apply,
+        pack: Callable[[bytes], object] = facelets.pack,
+        unpack: Callable[[object], bytes] = facelets.unpack,
+    ) -> None:
+        """
+        Initializes an empty log.
+
+        Args:
+            start (bytes): Facelet state before the first move.
+            interval (int): Number of moves between two checkpoints.
+            apply (Callable[[bytes, int], bytes]): Gets the state after a move.
+            pack (Callable[[bytes], object]): Packs a state into a checkpoint.
+            unpack (Callable[[object], bytes]): Unpacks a checkpoint into a state.
+        """
+        self.interval = interval
+        self.__apply = apply
+        self.__pack = pack
+        self.__unpack = unpack
+        self.__moves = bytearray()
+        self.__position = 0
+        self.__checkpoints: List[object] = [pack(start)]
+
+    def __len__(self) -> int:
+        return len(self.__moves)
+
+    def position(self) -> int:
+        """
+        Gets the number of moves played and not undone.
+        """
+        return self.__position
+
+    def moves(self) -> bytes:
+        """
+        Gets the moves played and not undone.
+        """
+        return bytes(self.__moves[:self.__position])
+
+    def push(self, move: int, state: bytes) -> None:
+        """
+        Logs a move, dropping the moves that were undone.
+
+        Args:
+            move (int): The move index, face * 3 + direction.
+            state (bytes): Facelet state after the move.
+        """
+        self.extend(bytes((move,)), state)
+
+    def extend(self, moves: bytes, state: bytes) -> None:
+        """
+        Logs several moves at once, dropping the moves that were undone.
+        Checkpoints passed before the last move are rebuilt by replaying
+        from the previous one.
+
+        Args:
+            moves (bytes): The move indices.
+            state (bytes): Facelet state after the last move.
+        """
+        del self.__moves[self.__position:]
+        del self.__checkpoints[self.__position // self.interval + 1:]
+        self.__moves.extend(moves)
+        self.__position += len(moves)
+        for k in range(len(self.__checkpoints), self.__position // self.interval + 1):
+            if k * self.interval == self.__position:
+                self.__checkpoints.append(self.__pack(state))
+            else:
+                checkpoint = self.__unpack(self.__checkpoints[k - 1])
+                for move in self.__moves[(k - 1) * self.interval:k * self.interval]:
+                    checkpoint = self.__apply(checkpoint, move)
+                self.__checkpoints.append(self.__pack(checkpoint))
+
+    def undo(self) -> Optional[int]:
+        """
+        Steps back one move.
+
+        Returns:
+            Optional[int]: The move to undo, or None at the start of the log.
+        """
+        if self.__position == 0:
+            return None
+        self.__position -= 1
+        return self.__moves[self.__position]
+
+    def redo(self) -> Optional[int]:
+        """
+        Steps forward one undone move.
+
+        Returns:
+            Optional[int]: The move to redo, or None if no move was undone.
+        """
+        if self.__position == len(self.__moves):
+            return None
+        self.__position += 1
+        return self.__moves[self.__position - 1]
+
+    def seek(self, index: int) -> bytes:
+        """
+        Moves to the state after a given number of moves, which is rebuilt
+        from the closest checkpoint before it.
+
+        Args:
+            index (int): Number of moves from the start, 0 to len().
+        Returns:
+            bytes: Facelet state after that many moves.
+        """
+        if not 0 <= index <= len(self.__moves):
+            raise IndexError("Move index out of range")
+        base = index // self.interval
+        state = self.__unpack(self.__checkpoints[base])
+        for move in self.__moves[base * self.interval:index]:
+            state = self.__apply(state, move)
+        self.__position = index
+        return state
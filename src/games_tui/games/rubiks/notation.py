@@ -0,0 +1,150 @@
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Iterable, Tuple
+
+from . import facelets
+
+
+# Singmaster face letters, in the face order of the cube, and the suffix
+# of each move direction.
+
+FACE_LETTERS = "UDLRFB"
+DIRECTION_SUFFIXES = ("", "'", "2")
+
+_SUFFIXES = {"": facelets.CLOCKWISE, "'": facelets.COUNTER_CLOCKWISE, "2": facelets.HALF_TURN, "2'": facelets.HALF_TURN}
+
+# Quarter turns of each direction, and back.
+
+_QUARTERS = {facelets.CLOCKWISE: 1, facelets.HALF_TURN: 2, facelets.COUNTER_CLOCKWISE: 3}
+_DIRECTIONS = {q: d for d, q in _QUARTERS.items()}
+
+# Face letters seen at each face after a quarter turn of the whole cube
+# along the x (as R), y (as U) and z (as F) axes: after x, the face seen
+# as U is the one that was seen as F.
+
+_ROTATIONS = {
+    "x": {"U": "F", "F": "D", "D": "B", "B": "U", "L": "L", "R": "R"},
+    "y": {"F": "R", "R": "B", "B": "L", "L": "F", "U": "U", "D": "D"},
+    "z": {"U": "L", "L": "D", "D": "R", "R": "U", "F": "F", "B": "B"},
+}
+
+# Wide and slice moves as face turns and a rotation of the whole cube, each
+# with its number of turns per turn of the move: r is L and x, M is R, L'
+# and x'. The centers of the cube never move, so rotations only change the
+# faces later moves turn.
+
+_COMPOUND_MOVES = {
+    "r": ((("L", 1),), ("x", 1)),
+    "l": ((("R", 1),), ("x", -1)),
+    "u": ((("D", 1),), ("y", 1)),
+    "d": ((("U", 1),), ("y", -1)),
+    "f": ((("B", 1),), ("z", 1)),
+    "b": ((("F", 1),), ("z", -1)),
+    "M": ((("R", 1), ("L", -1)), ("x", -1)),
+    "E": ((("U", 1), ("D", -1)), ("y", -1)),
+    "S": ((("F", -1), ("B", 1)), ("z", 1)),
+    "x": ((), ("x", 1)),
+    "y": ((), ("y", 1)),
+    "z": ((), ("z", 1)),
+}
+
+
+@lru_cache(maxsize=1024)
+def parse(text: str) -> Tuple[int, ...]:
+    """
+    Parses a sequence of moves in Singmaster notation, such as "R U R' U2".
+    Wide moves (r l u d f b), slice moves (M E S) and rotations (x y z) are
+    parsed into the face turns they amount to.
+
+    Args:
+        text (str): Moves separated by whitespace.
+    Returns:
+        Tuple[int, ...]: Move indices (face * 3 + direction).
+    Raises:
+        ValueError: If a move is not valid notation.
+    """
+    moves = []
+    seen = {f: f for f in FACE_LETTERS}         # face turned by each letter
+    for token in text.split():
+        direction = _SUFFIXES.get(token[1:])
+        if direction is None or (token[0] not in FACE_LETTERS and token[0] not in _COMPOUND_MOVES):
+            raise ValueError(f"Invalid move: {token}")
+        quarters = _QUARTERS[direction]
+        turns, rotation = (((token[0], 1),), None) if token[0] in FACE_LETTERS else _COMPOUND_MOVES[token[0]]
+        for letter, sign in turns:
+            face = FACE_LETTERS.index(seen[letter])
+            moves.append(facelets.move_index(face, _DIRECTIONS[sign * quarters % 4]))
+        if rotation is not None:
+            axis, sign = rotation
+            for _ in range(sign * quarters % 4):
+                seen = {f: seen[_ROTATIONS[axis][f]] for f in FACE_LETTERS}
+    return tuple(moves)
+
+
+def format_moves(moves: Iterable[int]) -> str:
+    """
+    Writes move indices in Singmaster notation.
+
+    Args:
+        moves (Iterable[int]): Move indices (face * 3 + direction).
+    Returns:
+        str: The moves, separated by spaces.
+    """
+    return " ".join(FACE_LETTERS[m // 3] + DIRECTION_SUFFIXES[m % 3] for m in moves)
+
+
+def invert(text: str) -> str:
+    """
+    Gets the sequence of moves undoing a sequence in Singmaster notation.
+
+    Args:
+        text (str): Moves separated by whitespace.
+    Returns:
+        str: The inverse moves, in reverse order.
+    """
+    return format_moves(facelets.inverse_move(m) for m in reversed(parse(text)))
+
+
+@lru_cache(maxsize=1024)
+def compile_moves(moves: Tuple[int, ...]) -> facelets.Permutation:
+    """
+    Composes a sequence of moves into a single gather permutation.
+
+    Args:
+        moves (Tuple[int, ...]): Move indices (face * 3 + direction).
+    Returns:
+        facelets.Permutation: Permutation equal to applying the moves in order.
+    """
+    perm = facelets.IDENTITY
+    for move in moves:
+        perm = facelets.compose(perm, facelets.MOVES[move])
+    return perm
+
+
+@lru_cache(maxsize=1024)
+def compile_algorithm(text: str) -> Callable[[bytes], Tuple[int, ...]]:
+    """
+    Compiles a sequence of moves in Singmaster notation into one gather,
+    so that applying it costs the same as a single move.
+
+    Args:
+        text (str): Moves separated by whitespace.
+    Returns:
+        Callable[[bytes], Tuple[int, ...]]: Gathers the new state from a state.
+    Raises:
+        ValueError: If a move is not valid notation.
+    """
+    return itemgetter(*compile_moves(parse(text)))
+
+
+def apply(state: bytes, text: str) -> bytes:
+    """
+    Applies a sequence of moves in Singmaster notation to a facelet state.
+
+    Args:
+        state (bytes): The 54 facelet colors.
+        text (str): Moves separated by whitespace.
+    Returns:
+        bytes: The new facelet state.
+    """
+    return bytes(compile_algorithm(text)(state))
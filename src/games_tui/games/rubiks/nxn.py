@@ -0,0 +1,336 @@
+import functools
+import random
+import re
+
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from . import facelets
+from .movelog import MoveLog
+from .notation import DIRECTION_SUFFIXES, FACE_LETTERS
+from .rubiks import RubiksGame
+
+
+MIN_SIZE = 2
+MAX_SIZE = 7
+
+# Face opposite to each face.
+
+OPPOSITE = (1, 0, 3, 2, 5, 4)
+
+# The four strips of stickers next to each face, in the order a clockwise
+# turn moves them: the stickers of each strip go to the next one. A strip
+# is a row (axis 0) or column (axis 1) of a face, counted from the first
+# (outer False) or last (outer True) row or column for deeper layers, and
+# read backwards when reversed, so that the four strips line up. These are
+# the sticker cycles of facelets.CLOCKWISE_CYCLES, for any size.
+
+Strip = Tuple[int, int, bool, bool]
+
+STRIPS: Tuple[Tuple[Strip, Strip, Strip, Strip], ...] = (
+    ((2, 0, False, False), (5, 0, False, False), (3, 0, False, False), (4, 0, False, False)),
+    ((2, 0, True, False), (4, 0, True, False), (3, 0, True, False), (5, 0, True, False)),
+    ((0, 1, False, False), (4, 1, False, False), (1, 1, False, False), (5, 1, True, True)),
+    ((0, 1, True, False), (5, 1, False, True), (1, 1, True, False), (4, 1, True, False)),
+    ((0, 0, True, False), (3, 1, False, False), (1, 0, False, True), (2, 1, True, True)),
+    ((0, 0, False, False), (2, 1, False, True), (1, 0, True, True), (3, 1, True, False)),
+)
+
+# Quarter turns of np.rot90 for each move direction, as seen from outside.
+
+_ROT90 = (-1, 1, 2)
+
+# Number of strips each direction moves the stickers along.
+
+_SHIFTS = (1, 3, 2)
+
+_TOKEN = re.compile(r"(\d*)([UDLRFB])(2'|2|'|)")
+
+_SUFFIXES = {"": facelets.CLOCKWISE, "'": facelets.COUNTER_CLOCKWISE, "2": facelets.HALF_TURN, "2'": facelets.HALF_TURN}
+
+
+def move_index(face: int, layer: int, direction: int) -> int:
+    """
+    Gets the index of a layer turn. Outer layer turns have the indices of
+    the Rubik's cube moves, so facelets.inverse_move() inverts any turn.
+
+    Args:
+        face (int): Index of the face the layer is counted from.
+        layer (int): Depth of the layer, 0 for the face itself.
+        direction (int): 0: clockwise, 1: counter clockwise, 2: half turn,
+            as seen from the face.
+    Returns:
+        int: The move index, (layer * 6 + face) * 3 + direction.
+    """
+    return (layer * facelets.NUM_FACES + face) * 3 + direction
+
+
+def split_move(move: int) -> Tuple[int, int, int]:
+    """
+    Gets the face, layer and direction of a move index.
+    """
+    rest, direction = divmod(move, 3)
+    layer, face = divmod(rest, facelets.NUM_FACES)
+    return face, layer, direction
+
+
+def parse(text: str, size: int) -> Tuple[int, ...]:
+    """
+    Parses a sequence of moves in SiGN notation, where a number before the
+    face letter picks an inner layer, such as "R 2R' 3U2".
+
+    Args:
+        text (str): Moves separated by whitespace.
+        size (int): Number of layers of the cube.
+    Returns:
+        Tuple[int, ...]: Move indices.
+    Raises:
+        ValueError: If a move is not valid notation, or has no such layer.
+    """
+    moves = []
+    for token in text.split():
+        match = _TOKEN.fullmatch(token)
+        layer = int(match.group(1) or 1) - 1 if match else -1
+        if not 0 <= layer < size:
+            raise ValueError(f"Invalid move: {token}")
+        face = FACE_LETTERS.index(match.group(2))
+        moves.append(move_index(face, layer, _SUFFIXES[match.group(3)]))
+    return tuple(moves)
+
+
+def format_moves(moves: Iterable[int]) -> str:
+    """
+    Writes move indices in SiGN notation.
+    """
+    tokens = []
+    for move in moves:
+        face, layer, direction = split_move(move)
+        prefix = str(layer + 1) if layer else ""
+        tokens.append(prefix + FACE_LETTERS[face] + DIRECTION_SUFFIXES[direction])
+    return " ".join(tokens)
+
+
+def apply(size: int, state: bytes, move: int) -> bytes:
+    """
+    Applies a layer turn to a facelet state.
+
+    Args:
+        size (int): Number of layers of the cube.
+        state (bytes): The 6 * size * size facelet colors.
+        move (int): The move index.
+    Returns:
+        bytes: The new facelet state.
+    """
+    cube = NxNCube.from_facelets(size, state)
+    cube.apply(move)
+    return cube.facelets()
+
+
+def random_scramble(size: int, length: int, rng: Optional[random.Random] = None) -> List[int]:
+    """
+    Generates a scramble of random layer turns, never turning the same
+    axis twice in a row, so no two turns merge or commute.
+
+    Args:
+        size (int): Number of layers of the cube.
+        length (int): Number of turns.
+        rng (Optional[random.Random]): Source of randomness.
+    Returns:
+        List[int]: Move indices of the scramble.
+    """
+    rng = rng if rng is not None else random.Random()
+    moves: List[int] = []
+    axis = -1
+    while len(moves) < length:
+        face = rng.randrange(facelets.NUM_FACES)
+        if face // 2 == axis:
+            continue
+        axis = face // 2
+        layer = rng.randrange((size + 1) // 2)
+        moves.append(move_index(face, layer, rng.randrange(3)))
+    return moves
+
+
+def scramble_length(size: int) -> int:
+    """
+    Gets the usual scramble length for a cube size: 20 turns per layer
+    beyond the second, and 11 for the pocket cube.
+    """
+    return 11 if size == 2 else 20 * (size - 2)
+
+
+class NxNCube(object):
+    """
+    Cube of any size from MIN_SIZE to MAX_SIZE. Each face is a size by
+    size array of color indices, as seen from outside the cube, and every
+    layer turn is one np.rot90 of the turned face, when it is an outer
+    layer, plus four strip assignments, whatever the size.
+
+    Attributes:
+        size (int): Number of layers along each axis.
+        faces (np.ndarray): Color index of each sticker, by face, row and column.
+    """
+
+    size: int
+    faces: np.ndarray
+
+    def __init__(self, size: int = 3) -> None:
+        """
+        Initializes a solved cube.
+
+        Args:
+            size (int): Number of layers along each axis.
+        Raises:
+            ValueError: If the size is not supported.
+        """
+        if not MIN_SIZE <= size <= MAX_SIZE:
+            raise ValueError(f"Unsupported cube size: {size}")
+        self.size = size
+        self.faces = np.repeat(np.arange(facelets.NUM_FACES, dtype=np.uint8), size * size)
+        self.faces = self.faces.reshape(facelets.NUM_FACES, size, size)
+
+    def __strip(self, strip: Strip, layer: int) -> np.ndarray:
+        face, axis, outer, reverse = strip
+        i = self.size - 1 - layer if outer else layer
+        view = self.faces[face, i, :] if axis == 0 else self.faces[face, :, i]
+        return view[::-1] if reverse else view
+
+    def turn(self, face: int, layer: int, direction: int) -> None:
+        """
+        Turns a layer of the cube.
+
+        Args:
+            face (int): Index of the face the layer is counted from.
+            layer (int): Depth of the layer, 0 for the face itself.
+            direction (int): 0: clockwise, 1: counter clockwise, 2: half turn,
+                as seen from the face.
+        """
+        if not 0 <= layer < self.size:
+            raise ValueError(f"Invalid layer: {layer}")
+        strips = [self.__strip(s, layer) for s in STRIPS[face]]
+        moved = [s.copy() for s in strips]
+        shift = _SHIFTS[direction]
+        for k in range(4):
+            strips[(k + shift) % 4][...] = moved[k]
+        if layer == 0:
+            self.faces[face] = np.rot90(self.faces[face], _ROT90[direction])
+        if layer == self.size - 1:
+            opposite = OPPOSITE[face]
+            self.faces[opposite] = np.rot90(self.faces[opposite], -_ROT90[direction])
+
+    def apply(self, move: int) -> None:
+        """
+        Applies a turn by its move index, see move_index().
+        """
+        self.turn(*split_move(move))
+
+    def apply_algorithm(self, algorithm: str) -> None:
+        """
+        Applies a sequence of moves in SiGN notation, see parse().
+        """
+        for move in parse(algorithm, self.size):
+            self.apply(move)
+
+    def is_valid(self) -> bool:
+        """
+        Checks whether the cube is solved: every face shows a single color.
+        Even cubes have no fixed centers, so the colors are not compared to
+        the face index.
+        """
+        return bool((self.faces == self.faces[:, :1, :1]).all())
+
+    def copy(self) -> "NxNCube":
+        cube = NxNCube.__new__(NxNCube)
+        cube.size = self.size
+        cube.faces = self.faces.copy()
+        return cube
+
+    def facelets(self) -> bytes:
+        """
+        Gets the color index of every sticker, face by face and row by row.
+        """
+        return self.faces.tobytes()
+
+    @classmethod
+    def from_facelets(cls, size: int, state: bytes) -> "NxNCube":
+        """
+        Creates a cube from the color index of every sticker.
+
+        Args:
+            size (int): Number of layers along each axis.
+            state (bytes): The 6 * size * size facelet colors.
+        Returns:
+            NxNCube: Cube with the given state.
+        """
+        cube = cls(size)
+        cube.faces[...] = np.frombuffer(state, dtype=np.uint8).reshape(cube.faces.shape)
+        return cube
+
+    def view(self) -> np.ndarray:
+        """
+        Gets a read-only view of the sticker array, indexed by face, row and
+        column, without copying it. Turns write into the array, so the view
+        follows the cube.
+        """
+        view = self.faces.view()
+        view.flags.writeable = False
+        return view
+
+    def snapshot(self) -> bytes:
+        """
+        Gets an immutable copy of the state, the facelet colors face by face
+        and row by row.
+        """
+        return self.faces.tobytes()
+
+    def get(self) -> List[List[List[int]]]:
+        """
+        Gets the cube state as nested lists of color indices, indexed by
+        face, row and column.
+        """
+        return self.faces.tolist()
+
+
+class NxNGame(RubiksGame):
+    """
+    A game on a cube of any size, see RubiksGame. Its moves are layer
+    turns, see move_index(), in SiGN notation.
+
+    Attributes:
+        size (int): Number of layers of the cube.
+    """
+
+    cube_type = NxNCube
+    cube: NxNCube
+    size: int
+
+    def __init__(self, size: int = 3) -> None:
+        """
+        Initializes a game on a solved cube of a given size.
+        """
+        self.size = size
+        super().__init__()
+
+    def new_cube(self, state: Optional[bytes] = None) -> NxNCube:
+        return NxNCube(self.size) if state is None else NxNCube.from_facelets(self.size, state)
+
+    def new_log(self) -> MoveLog:
+        """
+        Creates an empty move log, with checkpoints of unpacked states.
+        """
+        return MoveLog(self.cube.facelets(), apply=functools.partial(apply, self.size), pack=bytes, unpack=bytes)
+
+    def parse(self, algorithm: str) -> Tuple[int, ...]:
+        return parse(algorithm, self.size)
+
+    def layers(self) -> int:
+        """
+        Gets the number of layers that can be turned from each face. The
+        deeper ones are turned from the opposite face.
+        """
+        return (self.size + 1) // 2
+
+    def move_index(self, face: int, direction: int, layer: int = 0) -> int:
+        self._check_layer(layer)
+        return move_index(face, layer, direction)
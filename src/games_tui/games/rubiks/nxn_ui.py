@@ -0,0 +1,167 @@
+import curses
+import os
+
+from typing import Tuple
+
+from audio.player import Player, Sound
+from games import seeds
+from games.rubiks import nxn, replay
+from games.rubiks.nxn import NxNGame
+from games.rubiks.rubiks_ui import RubiksUI
+
+
+# Rows of the windows: the net of the largest cube, from the second row,
+# and the size line below it.
+
+NXN_HEIGHT = 3 * nxn.MAX_SIZE + 5
+
+DEFAULT_SIZE = 4
+
+# Width of the center window, see RubiksUI.make_wins().
+
+CENTER_WIDTH = 37
+
+
+class NoHints(object):
+    """
+    Stands in for SolverWorker, as the solvers only know the Rubik's cube
+    and the pocket cube.
+    """
+
+    def pending(self) -> bool:
+        return False
+
+    def cancel(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class NxNUI(RubiksUI):
+    """
+    Cubes of 2x2x2 up to 7x7x7, in the layout and with the keys of the
+    Rubik's cube, and with + and - to change the size. The net is drawn one
+    column per sticker, so that the largest cube fits in the center window.
+
+    Attributes:
+        size (int): Number of layers of the cube.
+    """
+
+    game_type = NxNGame
+    drills = False
+    has_hints = False
+    size: int
+
+    def __init__(self, stdscr, height: int, width: int, size: int = DEFAULT_SIZE) -> None:
+        """
+        Initializes the UI on a cube of a given size.
+        """
+        self.size = size
+        super().__init__(stdscr, max(height, NXN_HEIGHT), width)
+
+    @property
+    def solves_path(self) -> str:
+        """
+        Solves are recorded in one file per cube size.
+        """
+        return os.path.join(os.path.dirname(replay.SOLVES_PATH), f"cube{self.size}_solves.bin")
+
+    @property
+    def cube_size(self) -> int:
+        return self.size
+
+    def new_game(self) -> NxNGame:
+        return NxNGame(self.size)
+
+    def open_helpers(self) -> None:
+        self.hints = NoHints()
+
+    def close_helpers(self) -> None:
+        pass
+
+    def shuffle_cube(self) -> None:
+        """
+        Shuffles the cube with random layer turns.
+        """
+        Player.play(Sound.RUBIKS_SHUFFLE)
+        seed = seeds.SERVICE.game_seed(f"cube{self.size}")
+        rng = seeds.stream(seed)
+        self.game.scramble(nxn.random_scramble(self.size, nxn.scramble_length(self.size), rng), seed)
+        self.render_cube()
+
+    def face_origin(self, face: int) -> Tuple[int, int]:
+        """
+        Gets the window row and column of the top left sticker of a face,
+        in a net centered in the window.
+        """
+        step = self.size + 1
+        row = {0: 0, 1: 2}.get(face, 1)
+        col = {0: 1, 1: 1, 2: 0, 3: 2, 4: 1, 5: 3}[face]
+        left = (CENTER_WIDTH - (4 * step - 1)) // 2
+        return 1 + row * step, left + col * step
+
+    def render_cube(self) -> None:
+        """
+        Renders the net of the cube, one column per sticker.
+        """
+        for face, rows in enumerate(self.game.get_cube()):
+            y, x = self.face_origin(face)
+            for r, row in enumerate(rows):
+                for c, color in enumerate(row):
+                    self.win_c.addstr(y + r, x + c, "", curses.color_pair(color + 1))
+        self.render_case()
+        self.win_c.refresh()
+
+    def render_arw(self) -> None:
+        """
+        Renders arrows on both sides of the selected face.
+        """
+        hinted = self.hint is not None and self.hint // 3 == self.idx
+        color = curses.color_pair(12 if hinted else 10)
+        for face in range(len(self.opts)):
+            y, x = self.face_origin(face)
+            y += self.size // 2
+            a, b = ("", "") if face == self.idx else (" ", " ")
+            self.win_c.addstr(y, x - 1, a, color)
+            self.win_c.addstr(y, x + self.size, b, color)
+        self.win_c.refresh()
+
+    def render_case(self) -> None:
+        """
+        Renders the cube size and the keys to change it, below the net.
+        """
+        text = f"{self.size}x{self.size}x{self.size}   SIZE : + -"
+        self.win_c.addstr(NXN_HEIGHT - 2, 1, text.center(CENTER_WIDTH - 2), curses.color_pair(9))
+
+    def request_solution(self) -> None:
+        """
+        Solutions, and so the distance to solved, are for the Rubik's cube
+        and the pocket cube only.
+        """
+
+    def handle_key(self, key: int) -> None:
+        """
+        Changes the cube size with + and -.
+        """
+        if key in [ord("+"), ord("=")]:
+            self.change_size(1)
+        elif key == ord("-"):
+            self.change_size(-1)
+
+    def change_size(self, step: int) -> None:
+        """
+        Starts a new game on a cube one size larger or smaller.
+        """
+        size = min(max(self.size + step, nxn.MIN_SIZE), nxn.MAX_SIZE)
+        if size == self.size:
+            return
+        self.stop_timer()
+        self.size = size
+        self.layer = 0
+        self.load_stats()
+        self.game = self.new_game()
+        self.stdscr.clear()
+        self.stdscr.refresh()
+        self.make_wins()
+        self.reset()
@@ -0,0 +1,88 @@
+from typing import Iterable
+
+from . import facelets
+
+
+# Quarter turns of each move direction, clockwise, and the direction of
+# each number of quarter turns (0 means the turns cancel out).
+
+_QUARTERS = (1, 3, 2)
+_DIRECTIONS = (None, facelets.CLOCKWISE, facelets.HALF_TURN, facelets.COUNTER_CLOCKWISE)
+
+
+class MoveOptimizer(object):
+    """
+    Reduces a move sequence to canonical form as moves are appended, in
+    constant time per move. Consecutive turns of the same face are merged
+    mod 4, and dropped when they cancel out. Turns of opposite faces
+    commute, so such a pair is merged through, and kept in face order.
+    The result never has two turns of the same face next to each other,
+    nor more than two turns of the same axis.
+    """
+
+    def __init__(self, moves: Iterable[int] = ()) -> None:
+        """
+        Initializes the optimizer with an optional starting sequence.
+
+        Args:
+            moves (Iterable[int]): Move indices (face * 3 + direction).
+        """
+        self.__moves = bytearray()
+        self.extend(moves)
+
+    def __len__(self) -> int:
+        return len(self.__moves)
+
+    def moves(self) -> bytes:
+        """
+        Gets the reduced move sequence.
+        """
+        return bytes(self.__moves)
+
+    def push(self, move: int) -> None:
+        """
+        Appends a move, merging it into the sequence.
+
+        Args:
+            move (int): The move index, face * 3 + direction.
+        """
+        seq = self.__moves
+        face = move // 3
+        i = len(seq) - 1
+        if i >= 0 and seq[i] // 3 != face and seq[i] // 6 == face // 2:
+            # the last move turns the opposite face, and commutes with this one
+            if i >= 1 and seq[i - 1] // 3 == face:
+                i -= 1
+            elif face < seq[i] // 3:
+                seq.insert(i, move)
+                return
+            else:
+                seq.append(move)
+                return
+        if i < 0 or seq[i] // 3 != face:
+            seq.append(move)
+            return
+        direction = _DIRECTIONS[(_QUARTERS[seq[i] % 3] + _QUARTERS[move % 3]) % 4]
+        if direction is None:
+            del seq[i]
+        else:
+            seq[i] = face * 3 + direction
+
+    def extend(self, moves: Iterable[int]) -> None:
+        """
+        Appends several moves, see push().
+        """
+        for move in moves:
+            self.push(move)
+
+
+def optimize(moves: Iterable[int]) -> bytes:
+    """
+    Reduces a move sequence to canonical form, see MoveOptimizer.
+
+    Args:
+        moves (Iterable[int]): Move indices (face * 3 + direction).
+    Returns:
+        bytes: The reduced move indices.
+    """
+    return MoveOptimizer(moves).moves()
@@ -0,0 +1,431 @@
+import mmap
+import multiprocessing
+import os
+import random
+import time
+
+from array import array
+from operator import itemgetter
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .. import seeds
+from . import facelets
+from .cubie import CORNER_FACELETS, CubieCube, MOVE_CUBES, perm_from_index, perm_index
+from .replay import SOLVES_PATH as CUBE_SOLVES_PATH
+from .rubiks import RubiksCube, RubiksGame
+from .scramble import MIN_LENGTH
+from .tables import TABLES_DIR, UNVISITED, _complete, lock_tables, map_table, write_table
+from .worker import Solution
+
+
+# The pocket cube is the corners of a Rubik's cube: its 24 stickers are the
+# corner stickers of a 54 sticker state, which every face turn moves just
+# like on the 3x3 (see facelets.py). The rest of the state is ignored.
+
+STICKERS: Tuple[int, ...] = tuple(
+    f * 9 + r * 3 + c for f in range(facelets.NUM_FACES) for r in (0, 2) for c in (0, 2)
+)
+
+SOLVES_PATH = os.path.join(os.path.dirname(CUBE_SOLVES_PATH), "pocket_solves.bin")
+
+# Without centers, a turn of the bottom, left or back face is a turn of the
+# opposite face followed by a whole cube rotation. Keeping the DBL corner in
+# place, the other 7 corners take 7! permutations and 3^6 orientations, the
+# last one following from the others, and U, R and F turns reach them all.
+
+DBL = 6
+N_PERM = 5040
+N_TWIST = 729
+N_STATES = N_PERM * N_TWIST
+MOVES: Tuple[int, ...] = tuple(face * 3 + d for face in (0, 3, 4) for d in range(3))
+
+# Name, typecode and number of entries of each table, in build order.
+
+TABLES: Tuple[Tuple[str, str, int], ...] = (
+    ("perm_move", "H", N_PERM * len(MOVES)),
+    ("twist_move", "H", N_TWIST * len(MOVES)),
+    ("distances", "B", N_STATES),
+)
+
+_corners = itemgetter(*STICKERS)
+_dbl_stickers = itemgetter(*CORNER_FACELETS[DBL])
+_dbl_colors = tuple(p // 9 for p in CORNER_FACELETS[DBL])
+
+
+def _build_rotations() -> List[facelets.Permutation]:
+    """
+    Generates the 24 whole cube rotations, as far as corners are concerned,
+    from quarter turns of opposite faces in opposite directions.
+    """
+    x = facelets.compose(facelets.MOVES[9], facelets.MOVES[7])       # R L'
+    y = facelets.compose(facelets.MOVES[0], facelets.MOVES[4])       # U D'
+    rotations = [facelets.IDENTITY]
+    for rotation in rotations:
+        for turn in (x, y):
+            r = facelets.compose(rotation, turn)
+            if all(_corners(r) != _corners(q) for q in rotations):
+                rotations.append(r)
+    return rotations
+
+
+ROTATIONS: List[facelets.Permutation] = _build_rotations()
+_ROTATION_GATHERS = [itemgetter(*r) for r in ROTATIONS]
+
+
+def corners(state: bytes) -> bytes:
+    """
+    Gets the 24 stickers of the pocket cube, face by face and row by row.
+    """
+    return bytes(_corners(state))
+
+
+def orient(state: bytes) -> Tuple[bytes, int]:
+    """
+    Rotates the cube so that the DBL corner is home, which fixes the color
+    of every face.
+
+    Args:
+        state (bytes): The 54 facelet colors.
+    Returns:
+        Tuple[bytes, int]: The rotated state, and the index of the rotation in ROTATIONS.
+    Raises:
+        ValueError: If no corner has the DBL colors.
+    """
+    for i, gather in enumerate(_ROTATION_GATHERS):
+        rotated = gather(state)
+        if _dbl_stickers(rotated) == _dbl_colors:
+            return bytes(rotated), i
+    raise ValueError("Invalid pocket cube")
+
+
+def _index(cp: List[int], co: List[int]) -> int:
+    perm = [c - (c > DBL) for i, c in enumerate(cp) if i != DBL]
+    twist = 0
+    for o in co[:6]:
+        twist = 3 * twist + o
+    return perm_index(perm, 7) * N_TWIST + twist
+
+
+def _cubie(index: int) -> CubieCube:
+    p, t = divmod(index, N_TWIST)
+    perm = [c + (c >= DBL) for c in perm_from_index(p, 7)]
+    co = [0] * 8
+    for i in range(5, -1, -1):
+        t, co[i] = divmod(t, 3)
+    co[7] = -sum(co) % 3
+    return CubieCube(cp=perm[:DBL] + [DBL] + perm[DBL:], co=co)
+
+
+def index(state: bytes) -> int:
+    """
+    Gets the index of a pocket cube state among the N_STATES, as the
+    permutation and twist of the corners other than DBL.
+
+    Args:
+        state (bytes): The 54 facelet colors, of which only the corners count.
+    Returns:
+        int: The state index, 0 when solved.
+    Raises:
+        ValueError: If the corners do not make up a cube.
+    """
+    oriented, _ = orient(state)
+    full = bytearray(facelets.SOLVED)
+    for p in STICKERS:
+        full[p] = oriented[p]
+    cc = CubieCube.from_facelets(bytes(full))
+    return _index(cc.cp, cc.co)
+
+
+def build_move_table(size: int, stride: int) -> array:
+    """
+    Builds the move table of the permutation (stride N_TWIST) or twist
+    (stride 1) coordinate, such that table[9 * c + k] is the coordinate
+    after move MOVES[k]. Corner twists move independently of where the
+    corners go, and the other way around, so each coordinate has a table
+    of its own.
+    """
+    table = array("H", bytes(2 * size * len(MOVES)))
+    for c in range(size):
+        for k, m in enumerate(MOVES):
+            cc = _cubie(c * stride)
+            cc.corner_multiply(MOVE_CUBES[m])
+            table[len(MOVES) * c + k] = _index(cc.cp, cc.co) // stride % size
+    return table
+
+
+def distance_table(perm_move: memoryview, twist_move: memoryview) -> np.ndarray:
+    """
+    Computes the number of moves to solve every state, by breadth-first
+    search from the solved state, a whole layer at a time.
+
+    Returns:
+        np.ndarray: One byte per state index.
+    """
+    n = len(MOVES)
+    pm = np.frombuffer(perm_move, dtype=np.uint16).reshape(N_PERM, n).astype(np.int64)
+    tm = np.frombuffer(twist_move, dtype=np.uint16).reshape(N_TWIST, n).astype(np.int64)
+    table = np.full(N_STATES, UNVISITED, dtype=np.uint8)
+    table[0] = 0
+    depth = 0
+    while True:
+        frontier = np.flatnonzero(table == depth)
+        if len(frontier) == 0:
+            return table
+        p, t = np.divmod(frontier, N_TWIST)
+        for k in range(n):
+            neighbours = pm[p, k] * N_TWIST + tm[t, k]
+            table[neighbours[table[neighbours] == UNVISITED]] = depth + 1
+        depth += 1
+
+
+class PocketSolver(object):
+    """
+    Optimal solver of the pocket cube. The distance to solved of every
+    state, 3.5 MB at a byte each, is computed once and memory mapped from
+    the table directory along with the move tables, so an optimal solution
+    is a walk down the table, one lookup per move.
+
+    Attributes:
+        directory (str): The directory holding the table files.
+        perm_move (memoryview): Corner permutation move table.
+        twist_move (memoryview): Corner twist move table.
+        distances (memoryview): Moves to solve each state index.
+    """
+
+    directory: str
+    perm_move: memoryview
+    twist_move: memoryview
+    distances: memoryview
+
+    __maps: List[mmap.mmap]
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        log: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """
+        Maps every table from the directory, generating missing ones first,
+        under the lock of the directory, see tables.lock_tables().
+
+        Args:
+            directory (Optional[str]): Table directory. Default: TABLES_DIR.
+            log (Optional[Callable[[str], None]]): Receives a line per table generated.
+        """
+        self.directory = directory if directory is not None else TABLES_DIR
+        self.__maps = []
+        builds = {
+            "perm_move": lambda: build_move_table(N_PERM, N_TWIST),
+            "twist_move": lambda: build_move_table(N_TWIST, 1),
+            "distances": lambda: distance_table(self.perm_move, self.twist_move),
+        }
+        if missing_tables(self.directory):
+            with lock_tables(self.directory, log):
+                for name, typecode, size in TABLES:
+                    path = os.path.join(self.directory, f"pocket_{name}.bin")
+                    if not _complete(path, typecode, size):
+                        start = time.time()
+                        write_table(path, builds[name]())
+                        if log is not None:
+                            log(f"pocket_{name}: {time.time() - start:.1f}s")
+                    self.__map(name, typecode)
+        else:
+            for name, typecode, _ in TABLES:
+                self.__map(name, typecode)
+
+    def __map(self, name: str, typecode: str) -> None:
+        mm, view = map_table(os.path.join(self.directory, f"pocket_{name}.bin"), typecode)
+        self.__maps.append(mm)
+        setattr(self, name, view)
+
+    def distance(self, state: bytes) -> int:
+        """
+        Gets the number of moves of an optimal solution.
+
+        Args:
+            state (bytes): The 54 facelet colors, of which only the corners count.
+        """
+        return self.distances[index(state)]
+
+    def solve_index(self, idx: int) -> List[int]:
+        """
+        Solves a state index optimally, with U, R and F turns only.
+        """
+        n = len(MOVES)
+        moves: List[int] = []
+        depth = self.distances[idx]
+        while depth > 0:
+            p, t = divmod(idx, N_TWIST)
+            for k, m in enumerate(MOVES):
+                nxt = self.perm_move[n * p + k] * N_TWIST + self.twist_move[n * t + k]
+                if self.distances[nxt] == depth - 1:
+                    moves.append(m)
+                    idx, depth = nxt, depth - 1
+                    break
+        return moves
+
+    def solve(self, state: bytes) -> List[int]:
+        """
+        Solves a state optimally, with the faces named as the cube is held.
+
+        Args:
+            state (bytes): The 54 facelet colors, of which only the corners count.
+        Returns:
+            List[int]: Move indices of an optimal solution.
+        """
+        oriented, r = orient(state)
+        moves = self.solve_index(index(oriented))
+        rotation = ROTATIONS[r]
+        # Face f of the rotated cube is the face its stickers were taken from.
+        faces = [rotation[f * 9] // 9 for f in range(facelets.NUM_FACES)]
+        return [faces[m // 3] * 3 + m % 3 for m in moves]
+
+    def scramble(self, rng: Optional[random.Random] = None) -> List[int]:
+        """
+        Generates a scramble for a uniformly random state: the inverse of
+        its optimal solution.
+
+        Args:
+            rng (Optional[random.Random]): Source of randomness.
+        Returns:
+            List[int]: Move indices of the scramble.
+        """
+        rng = rng if rng is not None else random.Random()
+        while True:
+            idx = rng.randrange(N_STATES)
+            if self.distances[idx] >= MIN_LENGTH:
+                return [facelets.inverse_move(m) for m in reversed(self.solve_index(idx))]
+
+
+def missing_tables(directory: Optional[str] = None) -> List[str]:
+    """
+    Gets the names of the tables still to be generated.
+
+    Args:
+        directory (Optional[str]): Table directory. Default: TABLES_DIR.
+    Returns:
+        List[str]: Names of the missing tables, none once all are built.
+    """
+    directory = directory if directory is not None else TABLES_DIR
+    return [
+        name for name, typecode, size in TABLES
+        if not _complete(os.path.join(directory, f"pocket_{name}.bin"), typecode, size)
+    ]
+
+
+def _build(directory: Optional[str]) -> None:
+    PocketSolver(directory)
+
+
+def start_build(directory: Optional[str] = None) -> multiprocessing.Process:
+    """
+    Starts building the missing tables in a background process, see
+    tables.start_build().
+
+    Args:
+        directory (Optional[str]): Table directory. Default: TABLES_DIR.
+    Returns:
+        multiprocessing.Process: The started process, done once the tables are.
+    """
+    process = multiprocessing.get_context("spawn").Process(target=_build, args=(directory,))
+    process.start()
+    return process
+
+
+_solvers: Dict[str, PocketSolver] = {}
+
+
+def get_solver(directory: Optional[str] = None) -> PocketSolver:
+    """
+    Gets the solver of a table directory, mapping its tables only once per
+    process.
+
+    Args:
+        directory (Optional[str]): Table directory. Default: TABLES_DIR.
+    Returns:
+        PocketSolver: The solver.
+    """
+    key = directory if directory is not None else TABLES_DIR
+    if key not in _solvers:
+        _solvers[key] = PocketSolver(key)
+    return _solvers[key]
+
+
+class PocketCube(RubiksCube):
+    """
+    The 2x2x2 pocket cube, held as the corners of a Rubik's cube. Having
+    no centers, it is solved whenever every face shows a single color,
+    however the cube is held.
+    """
+
+    def is_valid(self) -> bool:
+        stickers = _corners(self.facelets())
+        return all(stickers[i] == stickers[i - i % 4] for i in range(len(STICKERS)))
+
+    def get(self) -> List[List[List[int]]]:
+        """
+        Gets the cube state as nested lists of color indices, indexed by
+        face, row and column.
+        """
+        s = _corners(self.facelets())
+        return [[list(s[i:i + 2]) for i in range(f, f + 4, 2)] for f in range(0, len(s), 4)]
+
+
+class PocketGame(RubiksGame):
+    """
+    A game on the pocket cube, see RubiksGame.
+    """
+
+    cube_type = PocketCube
+
+
+class LookupWorker(object):
+    """
+    Stands in for SolverWorker with table lookups, which are fast enough
+    to answer every request on submission.
+    """
+
+    def __init__(self, solver: PocketSolver) -> None:
+        self.__solver = solver
+        self.__generation = 0
+        self.__result: Optional[Tuple[int, bytes, Optional[Solution]]] = None
+
+    def submit(self, state: bytes) -> int:
+        self.__generation += 1
+        try:
+            solution = Solution(self.__solver.solve(state), True)
+        except ValueError:
+            solution = None
+        self.__result = (self.__generation, state, solution)
+        return self.__generation
+
+    def cancel(self) -> None:
+        self.__result = None
+
+    def pending(self) -> bool:
+        return self.__result is not None
+
+    def poll(self) -> Optional[Tuple[int, bytes, Optional[Solution]]]:
+        result, self.__result = self.__result, None
+        return result
+
+    def close(self) -> None:
+        pass
+
+
+class LookupScrambles(object):
+    """
+    Stands in for ScramblePool, with scrambles generated on demand.
+    """
+
+    def __init__(self, solver: PocketSolver) -> None:
+        self.__solver = solver
+
+    def take(self) -> Tuple[int, List[int]]:
+        seed = seeds.SERVICE.game_seed("pocket")
+        return seed, self.__solver.scramble(seeds.stream(seed))
+
+    def close(self) -> None:
+        pass
@@ -0,0 +1,47 @@
+import curses
+
+from games.rubiks import pocket
+from games.rubiks.pocket import LookupScrambles, LookupWorker, PocketGame, PocketSolver
+from games.rubiks.rubiks_ui import CASE_WIDTH, RubiksUI
+
+
+class PocketUI(RubiksUI):
+    """
+    The 2x2x2 pocket cube, in the layout and with the keys of the Rubik's
+    cube. Hints, scrambles and the distance to solved are lookups in the
+    pocket cube distance table, so no background process is needed.
+
+    Attributes:
+        solver (PocketSolver): Optimal solver over the distance table.
+    """
+
+    game_type = PocketGame
+    solves_path = pocket.SOLVES_PATH
+    cube_size = 2
+    drills = False
+    solver: PocketSolver
+
+    def open_helpers(self) -> None:
+        """
+        Maps the distance table, generating it on first use behind a message.
+        """
+        if pocket.missing_tables():
+            self.wait_for(pocket.start_build(), "Building solver tables")
+        self.solver = pocket.get_solver()
+        self.hints = LookupWorker(self.solver)
+        self.scrambles = LookupScrambles(self.solver)
+
+    def pos_x(self, face_idx: int) -> int:
+        """
+        Centers the two columns of a face where the Rubik's cube has three.
+        """
+        return super().pos_x(face_idx) + 1
+
+    def render_case(self) -> None:
+        """
+        Renders the number of moves of an optimal solution below the cube.
+        """
+        text = f"Optimal: {self.solver.distance(self.game.cube.facelets())} moves"
+        self.win_c.addstr(
+            13, 1, text.ljust(CASE_WIDTH), curses.color_pair(11) | curses.A_BOLD
+        )
@@ -0,0 +1,236 @@
+import os
+
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple
+
+import platformdirs
+
+
+SOLVES_PATH = os.path.join(platformdirs.user_data_dir("games-tui"), "rubiks", "solves.bin")
+
+# A solves file starts with the magic bytes, the format version and the
+# number of layers of the cube solved (since version 3, older files are of
+# the Rubik's cube), and is followed by one record per solve, appended as
+# solves complete:
+#
+#   varint  start time, milliseconds since the epoch
+#   varint  seed of the scramble plus one, 0 if unknown (since version 2)
+#   varint  scramble length, then one byte per scramble move
+#   varint  number of moves, then per move one byte for the move and a
+#           varint of the milliseconds since the previous move
+#
+# Varints are unsigned LEB128: 7 bits per byte, low bits first, with the
+# high bit set on every byte but the last.
+
+MAGIC = b"GTRS"
+VERSION = 3
+VERSIONS = (1, 2, 3)
+CUBE_SIZE = 3
+
+
+class Solve(NamedTuple):
+    """
+    A recorded solve.
+
+    Attributes:
+        started (int): Start time, in milliseconds since the epoch.
+        scramble (bytes): Move indices of the scramble.
+        moves (bytes): Move indices played, in order, undone moves included.
+        deltas (List[int]): Milliseconds before each move, since the previous one.
+        seed (Optional[int]): Seed the scramble was generated from, see seeds.py.
+    """
+
+    started: int
+    scramble: bytes
+    moves: bytes
+    deltas: List[int]
+    seed: Optional[int] = None
+
+    def duration(self) -> int:
+        """
+        Gets the solve time in milliseconds.
+        """
+        return sum(self.deltas)
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    """
+    Appends an unsigned integer as a varint.
+
+    Args:
+        out (bytearray): The buffer to append to.
+        value (int): The integer, at least 0.
+    """
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(f: BinaryIO) -> Optional[int]:
+    """
+    Reads a varint from a file.
+
+    Args:
+        f (BinaryIO): The file, opened for binary reading.
+    Returns:
+        Optional[int]: The integer, or None at the end of the file.
+    """
+    value, shift = 0, 0
+    while True:
+        b = f.read(1)
+        if not b:
+            return None
+        value |= (b[0] & 0x7F) << shift
+        if b[0] < 0x80:
+            return value
+        shift += 7
+
+
+def encode_solve(solve: Solve) -> bytes:
+    """
+    Encodes a solve as a record of the solves file.
+
+    Args:
+        solve (Solve): The solve.
+    Returns:
+        bytes: The record.
+    """
+    out = bytearray()
+    write_varint(out, solve.started)
+    write_varint(out, 0 if solve.seed is None else solve.seed + 1)
+    write_varint(out, len(solve.scramble))
+    out.extend(solve.scramble)
+    write_varint(out, len(solve.moves))
+    for move, delta in zip(solve.moves, solve.deltas):
+        out.append(move)
+        write_varint(out, delta)
+    return bytes(out)
+
+
+def append_solve(solve: Solve, path: str = SOLVES_PATH, size: int = CUBE_SIZE) -> None:
+    """
+    Appends a solve to a solves file, creating the file if needed. The
+    record is written with a single write, so a crash can at worst leave
+    a truncated last record, which readers skip.
+
+    Args:
+        solve (Solve): The solve.
+        path (str): The solves file.
+        size (int): Number of layers of the cube solved, recorded in a new file.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    upgrade(path, size)
+    with open(path, "ab") as f:
+        if f.tell() == 0:
+            f.write(MAGIC + bytes([VERSION, size]))
+        f.write(encode_solve(solve))
+
+
+def upgrade(path: str = SOLVES_PATH, size: int = CUBE_SIZE) -> None:
+    """
+    Rewrites a solves file of an older version in the current version,
+    replacing it atomically. Solves of older versions have no seed.
+
+    Args:
+        path (str): The solves file.
+        size (int): Number of layers of the cube solved, which older versions
+            do not record.
+    Raises:
+        ValueError: If the file is not a solves file of a known version.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        header = f.read(len(MAGIC) + 1)
+    if len(header) <= len(MAGIC) or header[len(MAGIC)] == VERSION:
+        return
+    data = bytearray(MAGIC + bytes([VERSION, size]))
+    for solve in read_solves(path):
+        data += encode_solve(solve)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _read_solve(f: BinaryIO, version: int) -> Optional[Solve]:
+    started = read_varint(f)
+    if started is None:
+        return None
+    seed = read_varint(f) if version >= 2 else 0
+    if seed is None:
+        return None
+    n = read_varint(f)
+    scramble = f.read(n) if n is not None else b""
+    if n is None or len(scramble) < n:
+        return None
+    n = read_varint(f)
+    if n is None:
+        return None
+    moves, deltas = bytearray(), []
+    for _ in range(n):
+        move = f.read(1)
+        delta = read_varint(f)
+        if not move or delta is None:
+            return None
+        moves += move
+        deltas.append(delta)
+    return Solve(started, scramble, bytes(moves), deltas, seed - 1 if seed else None)
+
+
+def _read_header(f: BinaryIO) -> Optional[Tuple[int, int]]:
+    header = f.read(len(MAGIC) + 1)
+    if not header:
+        return None
+    if header[:len(MAGIC)] != MAGIC or len(header) <= len(MAGIC):
+        raise ValueError("Not a solves file")
+    version = header[len(MAGIC)]
+    if version not in VERSIONS:
+        raise ValueError(f"Unsupported solves file version: {version}")
+    size = f.read(1) if version >= 3 else bytes([CUBE_SIZE])
+    if not size:
+        raise ValueError("Not a solves file")
+    return version, size[0]
+
+
+def cube_size(path: str = SOLVES_PATH) -> int:
+    """
+    Gets the number of layers of the cube solved in a solves file.
+
+    Args:
+        path (str): The solves file.
+    Returns:
+        int: The cube size, CUBE_SIZE for files of older versions or empty ones.
+    Raises:
+        ValueError: If the file is not a solves file of a known version.
+    """
+    if not os.path.exists(path):
+        return CUBE_SIZE
+    with open(path, "rb") as f:
+        header = _read_header(f)
+    return header[1] if header is not None else CUBE_SIZE
+
+
+def read_solves(path: str = SOLVES_PATH) -> Iterator[Solve]:
+    """
+    Streams the solves of a solves file, one record at a time.
+
+    Args:
+        path (str): The solves file.
+    Yields:
+        Solve: Every complete recorded solve, oldest first.
+    Raises:
+        ValueError: If the file is not a solves file of a known version.
+    """
+    if not os.path.exists(path):
+        return
+    with open(path, "rb") as f:
+        header = _read_header(f)
+        if header is None:
+            return
+        version, _ = header
+        while True:
+            solve = _read_solve(f, version)
+            if solve is None:
+                return
+            yield solve
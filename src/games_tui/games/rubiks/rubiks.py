@@ -1,7 +1,12 @@
 import time
 
-from typing import List, Tuple, Deque 
-from collections import deque
+from typing import Iterable, List, Optional, Tuple, Union
+
+from . import facelets, notation, symmetry
+from .cubie import CubieCube
+from .movelog import MoveLog
+from .optimizer import MoveOptimizer
+from .replay import Solve
 
 
 class RubiksCube(object):
@@ -9,214 +14,182 @@ class RubiksCube(object):
     Object representation of the Rubik's cube. Maintains the state of
     the faces, and performs the different rotations on the cube.
 
+    The 54 stickers are stored as one flat, immutable string of color
+    indices, and every face turn is a precomputed gather permutation
+    over it (see facelets.py).
+
     Attributes:
-        __cube: (List[List[List[int]]]): 3 dimensional list for storing color indices
+        __facelets (bytes): Color index of each sticker, face by face and row by row.
     """
 
-    __cube: List[List[List[int]]]
+    __facelets: bytes
 
     def __init__(self):
         """
         Initializes a new instance of a Rubik's cube in a solved state.
         """
-        self.__cube = [[[i for _ in range(3)] for _ in range(3)] for i in range(6)]
-    
+        self.__facelets = facelets.SOLVED
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, RubiksCube):
+            return NotImplemented
+        return self.__facelets == other.__facelets
+
+    def __hash__(self) -> int:
+        """
+        Hashes the current state. The hash of the immutable facelet string is
+        cached by Python, so hashing a state again is O(1). A cube is hashed
+        by value, so it must not be turned while used as a dictionary key;
+        use pack() for keys that outlive the cube.
+        """
+        return hash(self.__facelets)
+
+    def copy(self) -> "RubiksCube":
+        """
+        Copies the cube. The facelets are immutable, so they are shared
+        instead of copied.
+        """
+        cube = type(self).__new__(type(self))
+        cube.__facelets = self.__facelets
+        return cube
+
+    def pack(self) -> int:
+        """
+        Packs the state into a single integer of 3 bits per moving sticker,
+        see facelets.pack().
+        """
+        return facelets.pack(self.__facelets)
+
+    def canonical_pack(self) -> int:
+        """
+        Packs the state shared by the cube and its symmetric states, see
+        symmetry.canonical_pack().
+        """
+        return symmetry.canonical_pack(self.__facelets)
+
+    @classmethod
+    def unpack(cls, key: int) -> "RubiksCube":
+        """
+        Creates a cube from a state packed by pack().
+
+        Args:
+            key (int): The packed state.
+        Returns:
+            RubiksCube: Cube with the packed state.
+        """
+        cube = cls()
+        cube.__facelets = facelets.unpack(key)
+        return cube
+
     def is_valid(self) -> bool:
-        for i in range(6):
-            color = self.__cube[i][0][0]
-            for row in self.__cube[i]:
-                if any(cell != color for cell in row):
-                    return False
-        return True
+        """
+        Checks whether the cube is solved. Face turns never move the center
+        stickers, so the cube is solved exactly when its facelets equal the
+        solved state, which is a single string comparison instead of a scan
+        over every face.
+        """
+        return self.__facelets == facelets.SOLVED
 
-    def __rotate_top(self, direction: int) -> None:
+    def apply(self, move: int) -> None:
         """
-        Rotates top (white) face of the cube.
+        Applies a face turn by its index in the move tables.
 
         Args:
-            direction (int): Binary representation of the direction of rotation.
-        """
-        if direction == 0:
-            self.__cube[0] = [list(row) for row in zip(*self.__cube[0][::-1])]
-            temp = self.__cube[4][0][:]
-            for j in range(3):
-                self.__cube[4][0][j] = self.__cube[3][0][j]
-                self.__cube[3][0][j] = self.__cube[5][0][j]
-                self.__cube[5][0][j] = self.__cube[2][0][j]
-                self.__cube[2][0][j] = temp[j]
-        elif direction == 1:
-            self.__cube[0] = [list(row) for row in zip(*self.__cube[0])][::-1]
-            temp = self.__cube[4][0][:]
-            for j in range(3):
-                self.__cube[4][0][j] = self.__cube[2][0][j]
-                self.__cube[2][0][j] = self.__cube[5][0][j]
-                self.__cube[5][0][j] = self.__cube[3][0][j]
-                self.__cube[3][0][j] = temp[j]
-        else:
-            return
-
-    def __rotate_bottom(self, direction: int) -> None:
-        """
-
-        """
-        if direction == 0:
-            self.__cube[1] = [list(row) for row in zip(*self.__cube[1][::-1])]
-            temp = self.__cube[4][2][:]
-            for j in range(3):
-                self.__cube[4][2][j] = self.__cube[2][2][j]
-                self.__cube[2][2][j] = self.__cube[5][2][j]
-                self.__cube[5][2][j] = self.__cube[3][2][j]
-                self.__cube[3][2][j] = temp[j]
-        elif direction == 1:
-            self.__cube[1] = [list(row) for row in zip(*self.__cube[1])][::-1]
-            temp = self.__cube[4][2][:]
-            for j in range(3):
-                self.__cube[4][2][j] = self.__cube[3][2][j]
-                self.__cube[3][2][j] = self.__cube[5][2][j]
-                self.__cube[5][2][j] = self.__cube[2][2][j]
-                self.__cube[2][2][j] = temp[j]
-        else:
-            return
-
-    def __rotate_left(self, direction: int) -> None:
-        """
-
-        """
-        if direction == 0:
-            self.__cube[2] = [list(row) for row in zip(*self.__cube[2][::-1])]
-            temp = [self.__cube[0][r][0] for r in range(3)]
-            for r in range(3):
-                self.__cube[0][r][0] = self.__cube[4][r][0]
-            for r in range(3):
-                self.__cube[4][r][0] = self.__cube[1][r][0]
-            for r in range(3):
-                self.__cube[1][r][0] = self.__cube[5][2 - r][2]
-            for r in range(3):
-                self.__cube[5][r][2] = temp[2 - r]
-        elif direction == 1:
-            self.__cube[2] = [list(row) for row in zip(*self.__cube[2])][::-1]
-            temp = [self.__cube[0][r][0] for r in range(3)]
-            for r in range(3):
-                self.__cube[0][r][0] = self.__cube[5][r][2]
-            for r in range(3):
-                self.__cube[5][r][2] = self.__cube[1][2 - r][0]
-            for r in range(3):
-                self.__cube[1][r][0] = self.__cube[4][r][0]
-            for r in range(3):
-                self.__cube[4][r][0] = temp[r]
-        else:
-            return
-
-    def __rotate_right(self, direction: int) -> None:
-        """
-
-        """
-        if direction == 0:
-            self.__cube[3] = [list(row) for row in zip(*self.__cube[3][::-1])]
-            temp = [self.__cube[0][r][2] for r in range(3)]
-            for r in range(3):
-                self.__cube[0][r][2] = self.__cube[4][r][2]
-            for r in range(3):
-                self.__cube[4][r][2] = self.__cube[1][r][2]
-            for r in range(3):
-                self.__cube[1][r][2] = self.__cube[5][2 - r][0]
-            for r in range(3):
-                self.__cube[5][r][0] = temp[2 - r]
-
-        elif direction == 1:
-            self.__cube[3] = [list(row) for row in zip(*self.__cube[3])][::-1]
-            temp = [self.__cube[0][r][2] for r in range(3)]
-            for r in range(3):
-                self.__cube[0][r][2] = self.__cube[5][r][0]
-            for r in range(3):
-                self.__cube[5][r][0] = self.__cube[1][2 - r][2]
-            for r in range(3):
-                self.__cube[1][r][2] = self.__cube[4][r][2]
-            for r in range(3):
-                self.__cube[4][r][2] = temp[r]
-        else:
-            return
-
-    def __rotate_front(self, direction: int) -> None:
-        """
-
-        """
-        if direction == 0:
-            self.__cube[4] = [list(row) for row in zip(*self.__cube[4][::-1])]
-            temp = [self.__cube[0][2][i] for i in range(3)]
-            for i in range(3):
-                self.__cube[0][2][i] = self.__cube[2][2 - i][2]
-                self.__cube[2][2 - i][2] = self.__cube[1][0][2 - i]
-                self.__cube[1][0][2 - i] = self.__cube[3][i][0]
-                self.__cube[3][i][0] = temp[i]
-        elif direction == 1:
-            self.__cube[4] = [list(row) for row in zip(*self.__cube[4])][::-1]
-            temp = [self.__cube[0][2][i] for i in range(3)]
-            for i in range(3):
-                self.__cube[0][2][i] = self.__cube[3][i][0]
-                self.__cube[3][i][0] = self.__cube[1][0][2 - i]
-                self.__cube[1][0][2 - i] = self.__cube[2][2 - i][2]
-                self.__cube[2][2 - i][2] = temp[i]
-        else:
-            return
-
-    def __rotate_back(self, direction: int) -> None:
-        """
-
-        """
-        if direction == 0:
-            self.__cube[5] = [list(row) for row in zip(*self.__cube[5][::-1])]
-            temp = [self.__cube[0][0][i] for i in range(3)]
-            for i in range(3):
-                self.__cube[0][0][i] = self.__cube[3][i][2]
-                self.__cube[3][i][2] = self.__cube[1][2][2 - i]
-                self.__cube[1][2][2 - i] = self.__cube[2][2 - i][0]
-                self.__cube[2][2 - i][0] = temp[i]
-        elif direction == 1:
-            self.__cube[5] = [list(row) for row in zip(*self.__cube[5])][::-1]
-            temp = [self.__cube[0][0][i] for i in range(3)]
-            for i in range(3):
-                self.__cube[0][0][i] = self.__cube[2][2 - i][0]
-                self.__cube[2][2 - i][0] = self.__cube[1][2][2 - i]
-                self.__cube[1][2][2 - i] = self.__cube[3][i][2]
-                self.__cube[3][i][2] = temp[i]
-        else:
-            return
+            move (int): The move index, face * 3 + direction.
+        """
+        self.__facelets = bytes(facelets.GATHERS[move](self.__facelets))
+
+    def apply_algorithm(self, algorithm: str) -> None:
+        """
+        Applies a sequence of moves in Singmaster notation, as a single
+        compiled permutation (see notation.py).
+
+        Args:
+            algorithm (str): Moves separated by whitespace, e.g. "R U R' U'".
+        """
+        self.__facelets = notation.apply(self.__facelets, algorithm)
 
     def rotate(self, face: int, direction: int) -> bool:
         """
         Main rotate function for performing moves on the cube instance.
         Takes face index, and number representation of the derection of
-        which the specified face must rotate (0: clock, 1: counter clock).
-        This matches the face index with the correct rotation function.
+        which the specified face must rotate (0: clock, 1: counter clock,
+        2: half turn).
 
         Args:
            face (int): The index of the cube face to be rotated.
-           direction (int): The binary value for direction of rotation.
-        """
-        match face:
-            case 0:
-                self.__rotate_top(direction)
-            case 1:
-                self.__rotate_bottom(direction)
-            case 2:
-                self.__rotate_left(direction)
-            case 3:
-                self.__rotate_right(direction)
-            case 4:
-                self.__rotate_front(direction)
-            case 5:
-                self.__rotate_back(direction)
-            case _:
-                raise Exception("Invalid face index")
+           direction (int): The value for direction of rotation.
+        Returns:
+            bool: True if the cube is solved after the rotation.
+        """
+        if not 0 <= face < facelets.NUM_FACES:
+            raise Exception("Invalid face index")
+        if 0 <= direction <= facelets.HALF_TURN:
+            self.apply(face * 3 + direction)
         return self.is_valid()
 
+    def facelets(self) -> bytes:
+        """
+        Gets the color index of every sticker, face by face and row by row.
+        """
+        return self.__facelets
 
-    def get(self) -> List[List[List[int]]]:
+    def to_cubie(self) -> CubieCube:
+        """
+        Converts the cube to its corner and edge representation.
         """
+        return CubieCube.from_facelets(self.__facelets)
 
+    @classmethod
+    def from_facelets(cls, state: bytes) -> "RubiksCube":
         """
-        return self.__cube
+        Creates a cube from the color index of every sticker.
+
+        Args:
+            state (bytes): The 54 facelet colors.
+        Returns:
+            RubiksCube: Cube with the given state.
+        """
+        cube = cls()
+        cube.__facelets = bytes(state)
+        return cube
+
+    @classmethod
+    def from_cubie(cls, cc: CubieCube) -> "RubiksCube":
+        """
+        Creates a cube from its corner and edge representation.
+
+        Args:
+            cc (CubieCube): The cubie level state.
+        Returns:
+            RubiksCube: Cube with the same state.
+        """
+        cube = cls()
+        cube.__facelets = cc.to_facelets()
+        return cube
+
+    def view(self) -> memoryview:
+        """
+        Gets a read-only view of the sticker storage, indexed by face, row
+        and column, e.g. view[face, row, col], without copying it. Turns
+        replace the storage instead of writing into it, so the view keeps
+        showing the state at the time of the call.
+        """
+        return memoryview(self.__facelets).cast("B", (facelets.NUM_FACES, 3, 3))
+
+    def snapshot(self) -> bytes:
+        """
+        Gets an immutable copy of the state, the 54 facelet colors. The
+        storage is immutable already, so this copies nothing.
+        """
+        return self.__facelets
+
+    def get(self) -> List[List[List[int]]]:
+        """
+        Gets the cube state as nested lists of color indices, indexed by
+        face, row and column. The lists are a copy of the cube state.
+        """
+        return self.view().tolist()
 
 
 class RubiksGame(object):
@@ -226,48 +199,206 @@ class RubiksGame(object):
 
     Attributes:
         num_moves (int): Number of moves used for the current game.
-        history: (Deque[Tuple[int, int]]): Double ended queue for storing previous moves.
+        history: (MoveLog): Log of the moves played, for undo and redo.
+        solution: (MoveOptimizer): The moves played, reduced to canonical form.
+        scrambled (bytes): Move indices of the scramble.
+        seed (Optional[int]): Seed the scramble was generated from, if known.
+        turns (bytearray): Every turn of the cube since the scramble, undo included.
+        deltas (List[int]): Milliseconds before each turn, since the previous turn.
+        cube_type (type): Class of the cube played on.
     """
+    cube_type = RubiksCube
     cube: RubiksCube 
     num_moves: int
-    history: Deque[Tuple[int, int]]
+    history: MoveLog
+    solution: MoveOptimizer
+    scrambled: bytes
+    seed: Optional[int]
+    turns: bytearray
+    deltas: List[int]
     __time: float
+    __last_turn: Optional[float]
 
     def __init__(self) -> None:
         """
         Initializes an instance of a Rubik's game, with an initial move count
-        of 0, and an empty history queue.
+        of 0, and an empty move log.
         """
-        self.cube = RubiksCube()
+        self.cube = self.new_cube()
         self.num_moves = 0
-        self.history = deque()
+        self.history = self.new_log()
+        self.solution = MoveOptimizer()
+        self.scrambled = b""
+        self.seed = None
+        self.turns = bytearray()
+        self.deltas = []
         self.__time = time.time()
+        self.__last_turn = None
+
+    def new_cube(self, state: Optional[bytes] = None) -> RubiksCube:
+        """
+        Creates a cube of the game, solved or in a given state.
+
+        Args:
+            state (Optional[bytes]): The facelet colors. Default: solved.
+        """
+        return self.cube_type() if state is None else self.cube_type.from_facelets(state)
+
+    def new_log(self) -> MoveLog:
+        """
+        Creates an empty move log, starting from the state of the cube.
+        """
+        return MoveLog(self.cube.facelets())
+
+    def parse(self, algorithm: str) -> Tuple[int, ...]:
+        """
+        Parses a sequence of moves in Singmaster notation into move indices.
+        """
+        return notation.parse(algorithm)
+
+    def move_index(self, face: int, direction: int, layer: int = 0) -> int:
+        """
+        Gets the index of a turn of a layer.
+
+        Raises:
+            ValueError: If the layer cannot be turned.
+        """
+        self._check_layer(layer)
+        return face * 3 + direction
+
+    def _check_layer(self, layer: int) -> None:
+        if not 0 <= layer < self.layers():
+            raise ValueError(f"Invalid layer: {layer}")
+
+    def scramble(self, moves: Union[str, Iterable[int]], seed: Optional[int] = None) -> None:
+        """
+        Applies a scramble to the cube, and starts the move log from the
+        scrambled state.
+
+        Args:
+            moves (Union[str, Iterable[int]]): The scramble in the notation of
+                parse(), or its move indices.
+            seed (Optional[int]): Seed the scramble was generated from, recorded
+                with the solve.
+        """
+        moves = bytes(self.parse(moves) if isinstance(moves, str) else moves)
+        for move in moves:
+            self.cube.apply(move)
+        self.history = self.new_log()
+        self.solution = MoveOptimizer()
+        self.seed = seed
+        self.scrambled = moves
+        self.turns = bytearray()
+        self.deltas = []
+        self.__last_turn = None
+
+    def __record(self, moves: Iterable[int]) -> None:
+        now = time.time()
+        last = self.__last_turn if self.__last_turn is not None else self.__time
+        delta = max(0, round((now - last) * 1000))
+        for move in moves:
+            self.turns.append(move)
+            self.deltas.append(delta)
+            delta = 0
+        self.__last_turn = now
+
+    def layers(self) -> int:
+        """
+        Gets the number of layers that can be turned from each face. The
+        cube keeps its centers in place (see facelets.py), so only outer
+        layers turn.
+        """
+        return 1
 
-    def add(self, face: int, direction: int) -> None:
+    def add(self, face: int, direction: int, layer: int = 0) -> None:
         """
-        Increments the number of moves used for the game, and adds the tuple
-        of the history queue
+        Increments the number of moves used for the game, and logs the move
+        played on the cube.
         """
+        move = self.move_index(face, direction, layer)
         self.num_moves += 1
-        self.history.append((face, direction))
-        if len(self.history) > 100:
-            self.history.popleft()
+        self.history.push(move, self.cube.facelets())
+        self.solution.push(move)
+        self.__record((move,))
 
     def revert_move(self) -> bool:
         """
         Reverts the last move on the cube.
         """
-        if self.history:
-            last_move = self.history.pop()
-            face, direction = last_move
-            reverse_direction = 1 if direction == 0 else 0
-            self.cube.rotate(face, reverse_direction)
-            self.num_moves += 1  
-            return True
-        return False
+        move = self.history.undo()
+        if move is None:
+            return False
+        self.cube.apply(facelets.inverse_move(move))
+        self.solution.push(facelets.inverse_move(move))
+        self.__record((facelets.inverse_move(move),))
+        self.num_moves += 1  
+        return True
+
+    def redo_move(self) -> bool:
+        """
+        Plays the last reverted move again.
+        """
+        move = self.history.redo()
+        if move is None:
+            return False
+        self.cube.apply(move)
+        self.solution.push(move)
+        self.__record((move,))
+        self.num_moves += 1
+        return True
+
+    def seek(self, index: int) -> None:
+        """
+        Brings the cube to its state after a given number of logged moves.
+
+        Args:
+            index (int): Number of moves from the start of the log.
+        """
+        self.cube = self.new_cube(self.history.seek(index))
+        self.solution = MoveOptimizer(self.history.moves())
     
-    def move(self, face: int, direction: int) -> bool:
-        return self.cube.rotate(face, direction)
+    def move(self, face: int, direction: int, layer: int = 0) -> bool:
+        """
+        Turns a layer of the cube.
+
+        Returns:
+            bool: True if the cube is solved after the turn.
+        """
+        self.cube.apply(self.move_index(face, direction, layer))
+        return self.cube.is_valid()
+
+    def play(self, algorithm: str) -> bool:
+        """
+        Plays a sequence of moves in the notation of parse() on the cube,
+        and logs them as separate moves.
+
+        Args:
+            algorithm (str): Moves separated by whitespace, e.g. "R U R' U'".
+        Returns:
+            bool: True if the cube is solved after the moves.
+        """
+        moves = self.parse(algorithm)
+        self.cube.apply_algorithm(algorithm)
+        self.num_moves += len(moves)
+        self.history.extend(bytes(moves), self.cube.facelets())
+        self.solution.extend(moves)
+        self.__record(moves)
+        return self.cube.is_valid()
+
+    def move_count(self) -> int:
+        """
+        Gets the number of moves of the solve so far, with cancelling and
+        repeated turns of a face merged, and undone moves dropped.
+        """
+        return len(self.solution)
+
+    def to_solve(self) -> Solve:
+        """
+        Gets the recording of the game, to be saved as a replay.
+        """
+        return Solve(
+            round(self.__time * 1000), self.scrambled, bytes(self.turns), list(self.deltas), self.seed
+        )
 
     def time(self):
         return self.__time
@@ -1,15 +1,49 @@
 import curses
-import random
 import threading
 import time
 from typing import Dict, Optional, Tuple
 
+from games import seeds
+from games.rubiks import facelets, lastlayer, replay
 from games.rubiks.rubiks import RubiksGame
+from games.rubiks.scramble import ScramblePool
+from games.rubiks.stats import SolveStats
+from games.rubiks.tables import missing_tables, start_build
+from games.rubiks.worker import Solution, SolutionCache, SolverWorker
 from ui.window import Window
 from utils import ui_utils
 from audio.player import Player, Sound
 
 
+# Milliseconds between polls for a solution while the solver is searching.
+
+HINT_POLL_MS = 100
+
+HINT_DIRECTIONS = ["CW", "CCW", "180"]
+
+# Algorithms played by the number keys, with the name shown in the key
+# legend, in Singmaster notation.
+
+ALGORITHMS: Dict[int, Tuple[str, str]] = {
+    ord("1"): ("SEXY", "R U R' U'"),                                # sexy move
+    ord("2"): ("SUNE", "R U R' U R U2 R'"),                         # sune
+    ord("3"): ("FLIP", "F R U R' U' F'"),                           # edge orientation
+    ord("4"): ("T PERM", "R U R' U' R' F R2 U' R' U' R U R' F'"),   # T permutation
+}
+
+# Rows of the windows, enough for the key legend and the algorithm keys.
+
+RUBIKS_HEIGHT = 20
+
+# Last layer cases set up by the drill key: every PLL.
+
+DRILL_CASES = [name for name, _ in lastlayer.PLL_CASES if name != "AUF"]
+
+# Width of the recognized case text, below the cube.
+
+CASE_WIDTH = 35
+
+
 class RubiksUI(Window):
     """
     RubiksGame UI contains three main curses windows: Command (moves), cube state, and
@@ -20,14 +54,41 @@ class RubiksUI(Window):
         win_c (curses.window): The center window for displaying the rubiks cube.
         win_l (curses.window): The left window for displaying options.
         win_r (curses.window): The right window for displaying game stats.
+        hints (SolverWorker): Background solver of the cube states reached.
+        hint (Optional[int]): The suggested move, as face * 3 + direction.
+        hint_requested (bool): Whether a hint was asked for the current state.
+        solution (Optional[Solution]): Solution of the current state, once known.
+        solutions (SolutionCache): Solutions of the states seen lately.
+        layer (int): The selected layer, counted from the selected face.
+        scrambles (ScramblePool): Ready-made scrambles of random cube states.
+        stats (SolveStats): Statistics of the recorded solves.
+        game_type (type): Class of the games played.
+        solves_path (str): File the solves are recorded in.
+        cube_size (int): Number of layers of the cube, recorded with the solves.
+        drills (bool): Whether the drill key sets up last layer cases.
+        has_hints (bool): Whether a solver gives hints and the distance to
+            solved.
     """
 
+    game_type = RubiksGame
+    solves_path = replay.SOLVES_PATH
+    cube_size = replay.CUBE_SIZE
+    drills = True
+    has_hints = True
     game: RubiksGame
     win_c: "curses.window"
     win_l: "curses.window"
     win_r: "curses.window"
     arw_xys: Dict[int, Tuple[int, int]]
     timer_thread: threading.Thread
+    hints: SolverWorker
+    hint: Optional[int]
+    hint_requested: bool
+    solution: Optional[Solution]
+    solutions: SolutionCache
+    layer: int
+    scrambles: ScramblePool
+    stats: SolveStats
 
     def __init__(self, stdscr, height: int, width: int) -> None:
         """
@@ -37,9 +98,10 @@ class RubiksUI(Window):
         Args:
             stdscr: The standard screen instance
         """
-        super().__init__(stdscr, height, width, 0)
+        super().__init__(stdscr, max(height, RUBIKS_HEIGHT), width, 0)
 
-        self.game = RubiksGame()
+        self.game = self.new_game()
+        self.layer = 0
         self.opts = [
             " TOP    ",
             " BOTTOM ",
@@ -65,11 +127,33 @@ class RubiksUI(Window):
         self.stop_timer_flag = threading.Event()
         self.timer_thread.daemon = True
 
+        self.open_helpers()
+        self.hint = None
+        self.hint_requested = False
+        self.solution = None
+        self.solutions = SolutionCache()
+        self.load_stats()
+
         self.make_wins()
         time.sleep(0.5)
         self.shuffle_cube()   # uncomment to actually start legit game.
         self.run()
 
+    def new_game(self) -> RubiksGame:
+        """
+        Creates a game on a solved cube.
+        """
+        return self.game_type()
+
+    def load_stats(self) -> None:
+        """
+        Reads the statistics of the recorded solves.
+        """
+        try:
+            self.stats = SolveStats.from_solves(replay.read_solves(self.solves_path))
+        except ValueError:                  # unreadable solves file
+            self.stats = SolveStats()
+
     def make_wins(self) -> None:
         """
         Creates initial windows in the standard screen.
@@ -152,6 +236,10 @@ class RubiksUI(Window):
 
     def game_over(self, state: bool) -> bool:
         """ """
+        if state:
+            solve = self.game.to_solve()
+            replay.append_solve(solve, self.solves_path, self.cube_size)
+            self.stats.add(solve.duration(), self.game.move_count())
         time.sleep(1)
         idx = 0
         self.make_gameover_win(idx)
@@ -186,7 +274,7 @@ class RubiksUI(Window):
 
     def increment_mv(self) -> None:
         """ """
-        self.win_r.addstr(3, 5, str(self.game.num_moves), curses.color_pair(9))
+        self.win_r.addstr(3, 5, str(self.game.move_count()).ljust(4), curses.color_pair(9))
 
         
     def stop_timer(self) -> None:
@@ -263,17 +351,19 @@ class RubiksUI(Window):
         a, b = "", ""
         if self.idx in [0, 1]:
             a, b = "", ""
+        hinted = self.hint is not None and self.hint // 3 == self.idx
+        color = curses.color_pair(12 if hinted else 10)
         for i in range(6):
             if i in [0, 1]:
                 y, x = self.arw_xys[i]
                 sa, sb = (a, b) if i == self.idx else (" ", " ")
-                self.win_c.addstr(y, x, sa, curses.color_pair(10))
-                self.win_c.addstr(y, x + 8, sb, curses.color_pair(10))
+                self.win_c.addstr(y, x, sa, color)
+                self.win_c.addstr(y, x + 8, sb, color)
             else:
                 y, x = self.arw_xys[i]
                 sa, sb = (a, b) if i == self.idx else (" ", " ")
-                self.win_c.addstr(y, x, sa, curses.color_pair(10))
-                self.win_c.addstr(y + 4, x, sb, curses.color_pair(10))
+                self.win_c.addstr(y, x, sa, color)
+                self.win_c.addstr(y + 4, x, sb, color)
         self.win_c.refresh()
 
     # =================================================================================
@@ -294,8 +384,24 @@ class RubiksUI(Window):
                         y + r, x + c, "", curses.color_pair(cb[s][r][c] + 1)
                     )
                     x += 1
+        self.render_case()
+        self.request_solution()
         self.win_c.refresh()
 
+    def render_case(self) -> None:
+        """
+        Renders the recognized stage and case of the cube below it, with
+        the algorithm that solves the case.
+        """
+        case = lastlayer.recognize(self.game.cube.facelets())
+        self.win_c.addstr(
+            13, 1, f"{case.stage} {case.name}"[:CASE_WIDTH].ljust(CASE_WIDTH),
+            curses.color_pair(11) | curses.A_BOLD,
+        )
+        self.win_c.addstr(
+            14, 1, case.algorithm[:CASE_WIDTH].ljust(CASE_WIDTH), curses.color_pair(9)
+        )
+
     def render_cmds(self) -> None:
         """ """
         y = 2
@@ -310,15 +416,48 @@ class RubiksUI(Window):
                         y + i, 2, f"   {self.opts[i]}    ", curses.color_pair(9)
                     )
             self.win_l.addstr(y + i, 4, "", curses.color_pair(i + 1))
+        self.render_layer()
+
+    def render_layer(self) -> None:
+        """
+        Renders the selected layer, below the faces.
+        """
+        text = f"LAYER : {self.layer + 1}/{self.game.layers()}"
+        self.win_l.addstr(8, 5, text.ljust(12), curses.color_pair(9))
 
     def render_key_cmd(self) -> None:
         """ """
-        keys = ["UNDO  : Z", "HINT  : ?", "PAUSE : 󱁐", "OPTS  : 󱊷"]
-        symbols = ["󰕌", "", "", "󱤳"]
+        keys = ["UNDO  : U", "REDO  : R", "HINT  : ?", "PAUSE : 󱁐", "OPTS  : 󱊷", "DRILL : D"]
+        symbols = ["󰕌", "󰑎", "", "", "󱤳", "󰑮"]
+        if not self.drills:
+            keys, symbols = keys[:-1], symbols[:-1]
+        if not self.has_hints:
+            keys, symbols = keys[:2] + keys[3:], symbols[:2] + symbols[3:]
         y = 9
         for i in range(len(keys)):
             self.win_l.addstr(y + i, 2, symbols[i], curses.color_pair(11))
             self.win_l.addstr(y + i, 5, keys[i], curses.color_pair(9))
+        y += len(keys) + 1
+        for i, (key, (name, _)) in enumerate(ALGORITHMS.items()):
+            self.win_l.addstr(y + i, 2, "", curses.color_pair(11))
+            self.win_l.addstr(y + i, 5, f"{name:<6}: {chr(key)}", curses.color_pair(9))
+        self.render_hint()
+
+    def render_hint(self) -> None:
+        """
+        Renders the state of the hint in the key commands: searching, or the
+        direction to turn the face pointed at by the highlighted arrows.
+        """
+        if not self.has_hints:
+            return
+        if self.hint_requested and self.hint is None and self.hints.pending():
+            text, color = "HINT  : ...", curses.color_pair(9)
+        elif self.hint is not None:
+            text = f"HINT  : {HINT_DIRECTIONS[self.hint % 3]}"
+            color = curses.color_pair(12) | curses.A_BOLD
+        else:
+            text, color = "HINT  : ?", curses.color_pair(9)
+        self.win_l.addstr(11, 5, text.ljust(12), color)
 
 
     def render_timer(self) -> None:
@@ -335,6 +474,24 @@ class RubiksUI(Window):
             2, 5, timestr, curses.color_pair(9)
         )
 
+    def render_distance(self) -> None:
+        """
+        Renders the number of moves left to solve the cube: the length of
+        the shortest solution the solver found in its time budget. Unless
+        the solver proved it optimal, it is only an upper bound of the
+        distance to solved, shown as such. Shows dots while the solver is
+        searching.
+        """
+        if not self.has_hints:
+            return
+        if self.solution is None:
+            text = "..."
+        else:
+            n = len(self.solution.moves)
+            text = f"{n} left" if self.solution.optimal else f"≤{n} left"
+        self.win_r.addstr(4, 2, "", curses.color_pair(11))
+        self.win_r.addstr(4, 5, text.ljust(12), curses.color_pair(9))
+
     def render_move_count(self) -> None:
         """
         Renders the number of moves performed in the current game.
@@ -344,19 +501,30 @@ class RubiksUI(Window):
         )
         
         self.win_r.addstr(
-            3, 5, str(self.game.num_moves), curses.color_pair(9)
+            3, 5, str(self.game.move_count()).ljust(4), curses.color_pair(9)
         )
 
 
     def render_pr(self) -> None:
-        """ """
+        """
+        Renders the best time and move count, the mean time, and the rolling
+        averages of the recorded solves.
+        """
+        stats = self.stats
         symbols = ["󰔛", "󱃴"]
-        ph = ["00:00:00", "000"]
+        best_moves = str(stats.best_moves) if stats.best_moves is not None else "---"
+        ph = [ui_utils.format_millis(stats.best_time), best_moves.ljust(8)]
         y = 8
         for i in range(len(symbols)):
             self.win_r.addstr(y + i, 2, symbols[i], curses.color_pair(11))
             self.win_r.addstr(y + i, 5, ph[i], curses.color_pair(9))
 
+        rows = [("mean", stats.mean())]
+        rows += [(f"ao{avg.size}", avg.current()) for avg in stats.averages]
+        for i, (label, value) in enumerate(rows):
+            self.win_r.addstr(y + 2 + i, 2, label, curses.color_pair(11))
+            self.win_r.addstr(y + 2 + i, 8, ui_utils.format_millis(value), curses.color_pair(9))
+
     def render(self) -> None:
         """ """
         self.render_cmds()
@@ -365,34 +533,182 @@ class RubiksUI(Window):
 
     # =================================================================================
 
-    def shuffle_cube(self, n: Optional[int] = 50) -> None:
+    def shuffle_cube(self) -> None:
         """
-        Shuffles the cube into a random state by performing n rotations,
-        
-        Args:
-            n (Optional[int]): Number of rotations to perform. Default: 50. 
+        Shuffles the cube into a uniformly random state, by applying a
+        ready-made scramble from the pool all at once.
         """
         Player.play(Sound.RUBIKS_SHUFFLE)
-        time.sleep(0.3)
-        for i in range(n):
-            face = random.randint(0, 5)
-            direction = random.randint(0, 1)
-            self.game.move(face, direction)
-            self.render_cube()
-            time.sleep(0.1)
+        seed, moves = self.scrambles.take()
+        self.game.scramble(moves, seed)
+        self.render_cube()
+
+    def drill(self) -> None:
+        """
+        Starts a new game on a random last layer case, to practice it.
+        """
+        self.stop_timer()
+        self.clear_hint()
+        self.game = self.new_game()
+        seed = seeds.SERVICE.game_seed("drill")
+        self.game.scramble(lastlayer.drill(DRILL_CASES, seeds.stream(seed)), seed)
+        self.render_cube()
+        self.render_move_count()
+        self.start_timer()
 
     def reset(self) -> None:
         """
 
         """
-        self.game = RubiksGame()
+        self.game = self.new_game()
         self.shuffle_cube()
+        self.start_timer()
+
+    def start_timer(self) -> None:
+        """
+        Starts a new timer thread, counting from now.
+        """
         self.timer_thread = threading.Thread(target=self.update_timer)
         self.stop_timer_flag = threading.Event()
         self.timer_thread.daemon = True
         self.game.set_time(time.time())
         self.timer_thread.start()
 
+    # =================================================================================
+    # ------------------------------------- Hints -------------------------------------
+    # =================================================================================
+
+    def wait_for(self, process, text: str) -> None:
+        """
+        Shows a message with the elapsed time until a background process,
+        such as a table build, is done.
+
+        Args:
+            process (multiprocessing.Process): The started process.
+            text (str): What the process does.
+        """
+        start = time.time()
+        while process.is_alive():
+            message = f"{text}... {int(time.time() - start)}s"
+            self.stdscr.addstr(
+                self.max_y // 2, max(0, (self.max_x - len(message)) // 2), message,
+                curses.color_pair(9),
+            )
+            self.stdscr.refresh()
+            process.join(0.25)
+        self.stdscr.clear()
+        self.stdscr.refresh()
+
+    def open_helpers(self) -> None:
+        """
+        Builds the solver tables on first use, behind a message, then starts
+        the background solver for hints and the scramble pool, which both
+        map the tables. A session run from a given root seed keeps its pool
+        in memory, so its scrambles are the ones its seed generates.
+        """
+        if missing_tables():
+            self.wait_for(start_build(), "Building solver tables")
+        self.hints = SolverWorker()
+        self.scrambles = ScramblePool(None) if seeds.SERVICE.fixed else ScramblePool()
+
+    def close_helpers(self) -> None:
+        """
+        Stops the background solver and saves the scramble pool. Key reads
+        block again, as a search may have been in flight.
+        """
+        self.stdscr.timeout(-1)
+        self.hints.close()
+        self.scrambles.close()
+
+    def request_solution(self) -> None:
+        """
+        Looks up the solution of the current cube state in the cache, or
+        else sends the state to the background solver, superseding the
+        search for the previous state. The main loop polls for the answer
+        instead of blocking on the next key press. A cached solution cancels
+        the search for the previous state.
+        """
+        self.solution = self.solutions.get(self.game.cube.pack())
+        if self.solution is None:
+            self.hints.submit(self.game.cube.facelets())
+            self.stdscr.timeout(HINT_POLL_MS)
+        else:
+            self.hints.cancel()
+            self.stdscr.timeout(-1)
+        self.render_distance()
+
+    def request_hint(self) -> None:
+        """
+        Shows the first move of the solution of the current state, at once
+        if it is known, or else once the background solver has answered.
+        """
+        self.hint_requested = True
+        self.show_hint()
+
+    def show_hint(self) -> None:
+        """
+        Points the arrows at the first move of the known solution, if a hint
+        was asked for.
+        """
+        if self.hint_requested and self.solution and self.solution.moves:
+            self.hint = self.solution.moves[0]
+            self.idx = self.hint // 3
+            self.render_arw()
+        self.render_hint()
+
+    def check_hint(self) -> None:
+        """
+        Caches the answer of the background solver once it is ready, and
+        shows it if the cube is still in the state solved.
+        """
+        if not self.hints.pending():
+            return
+        result = self.hints.poll()
+        if result is None:
+            return
+        _, state, solution = result
+        self.stdscr.timeout(-1)
+        if solution is None:
+            return
+        self.solutions.put(facelets.pack(state), solution)
+        if state == self.game.cube.facelets():
+            self.solution = solution
+            self.render_distance()
+            self.show_hint()
+
+    def clear_hint(self) -> None:
+        """
+        Drops the shown hint, as the cube is about to change. A search still
+        in flight is superseded by the one for the next state.
+        """
+        self.hint_requested = False
+        if self.hint is not None:
+            self.hint = None
+            self.render_arw()
+        self.render_hint()
+
+    def handle_key(self, key: int) -> None:
+        """
+        Handles a key the main loop does not know, for game variants.
+        """
+
+    def finish(self) -> bool:
+        """
+        Ends the game once the cube is solved, by turns, undo or redo, and
+        starts a new one if the player asks for it.
+
+        Returns:
+            bool: True if a new game was started, False to leave the game.
+        """
+        self.stop_timer()
+        if not self.game_over(True):
+            return False
+        self.stdscr.clear()
+        self.stdscr.refresh()
+        self.make_wins()
+        self.reset()
+        return True
+
     def run(self) -> None:
         """
         Main loop for the game. handles key strokes, and re-rendering
@@ -405,6 +721,7 @@ class RubiksUI(Window):
         while True:
             key = self.stdscr.getch()
             self.adjust_maxyx()
+            self.check_hint()
 
             if key in [curses.KEY_UP, ord("k")]:
                 self.idx = (self.idx - 1) % len(self.opts)
@@ -415,45 +732,67 @@ class RubiksUI(Window):
                 self.render_arw()
 
             elif key in [curses.KEY_LEFT, ord("h")]:  # counter clockwise rotaion
+                self.clear_hint()
                 Player.play(Sound.RUBIKS)
-                is_valid = self.game.move(self.idx, 1)
+                is_valid = self.game.move(self.idx, 1, self.layer)
                 self.render_cube()
-                self.game.add(self.idx, 1)
+                self.game.add(self.idx, 1, self.layer)
                 self.increment_mv()
-                if is_valid:
-                    self.stop_timer()
-                    new = self.game_over(True)
-                    if new:
-                        self.stdscr.clear()
-                        self.stdscr.refresh()
-                        self.make_wins()
-                        self.reset()
-                    else:
-                        break
+                if is_valid and not self.finish():
+                    break
 
             elif key in [curses.KEY_RIGHT, ord("l")]:  # clockwise rotation
+                self.clear_hint()
                 Player.play(Sound.RUBIKS)
-                is_valid = self.game.move(self.idx, 0)
+                is_valid = self.game.move(self.idx, 0, self.layer)
                 self.render_cube()
-                self.game.add(self.idx, 0)
+                self.game.add(self.idx, 0, self.layer)
                 self.increment_mv()
-                if is_valid:
-                    self.stop_timer()
-                    new = self.game_over(True)
-                    if new:
-                        self.stdscr.clear()
-                        self.stdscr.refresh()
-                        self.make_wins()
-                        self.reset()
-                    else:
-                        break
+                if is_valid and not self.finish():
+                    break
 
             elif key == ord("u"):
                 if self.game.revert_move():
+                    self.clear_hint()
+                    self.render_cube()
+                    self.increment_mv()
+                    if self.game.cube.is_valid() and not self.finish():
+                        break
+
+            elif key == ord("r"):
+                if self.game.redo_move():
+                    self.clear_hint()
                     self.render_cube()
                     self.increment_mv()
+                    if self.game.cube.is_valid() and not self.finish():
+                        break
+
+            elif key in ALGORITHMS:
+                self.clear_hint()
+                Player.play(Sound.RUBIKS)
+                is_valid = self.game.play(ALGORITHMS[key][1])
+                self.render_cube()
+                self.increment_mv()
+                if is_valid and not self.finish():
+                    break
+
+            elif key == ord("?") and self.has_hints:
+                self.request_hint()
+
+            elif key == ord("d") and self.drills:
+                self.drill()
+
+            elif key in [ord("["), ord("]")]:
+                step = 1 if key == ord("]") else -1
+                self.layer = min(max(self.layer + step, 0), self.game.layers() - 1)
+                self.render_layer()
 
             elif key == ord("q"):
                 self.stop_timer()
                 break
+
+            else:
+                self.handle_key(key)
             self.render()
+
+        self.close_helpers()
@@ -0,0 +1,274 @@
+import multiprocessing
+import os
+import queue
+import random
+
+from typing import List, Optional, Tuple
+
+import platformdirs
+
+from .. import seeds
+from . import facelets
+from .cubie import CubieCube, NUM_CORNERS, NUM_EDGES
+
+
+POOL_PATH = os.path.join(platformdirs.user_data_dir("games-tui"), "rubiks", "scrambles.bin")
+POOL_SIZE = 20
+
+# A pool file starts with the magic bytes and the format version. Pool files
+# of another format are dropped, as the pool is only a cache.
+
+POOL_MAGIC = b"GTSP"
+POOL_VERSION = 1
+
+# Scrambles of a state solved in fewer moves than this are rejected, like
+# in competitions, as a nearly solved cube is no scramble at all.
+
+MIN_LENGTH = 2
+
+# Phase 1 nodes searched for a short solution of a random state, about
+# half a second. A node budget rather than a timeout, so that a seed gives
+# the same scramble on every machine.
+
+SCRAMBLE_NODES = 20000
+
+# Seconds between checks that the background process is still generating,
+# while waiting for a scramble.
+
+POLL_SECONDS = 0.5
+
+# Spawned rather than forked: the UI runs a timer thread, and forking a
+# threaded process is unsafe.
+
+_context = multiprocessing.get_context("spawn")
+
+
+def random_cubie(rng: random.Random) -> CubieCube:
+    """
+    Draws a cube state uniformly at random among all reachable states.
+    Pieces are permuted and oriented at random, and the solvability
+    constraints are then restored by fixing the last corner twist, the
+    last edge flip, and the permutation parity.
+
+    Args:
+        rng (random.Random): Source of randomness.
+    Returns:
+        CubieCube: The random state.
+    """
+    cp = list(range(NUM_CORNERS))
+    ep = list(range(NUM_EDGES))
+    rng.shuffle(cp)
+    rng.shuffle(ep)
+    cc = CubieCube(cp=cp, ep=ep)
+    cc.set_twist(rng.randrange(3 ** (NUM_CORNERS - 1)))
+    cc.set_flip(rng.randrange(2 ** (NUM_EDGES - 1)))
+    if cc.corner_parity() != cc.edge_parity():
+        cc.ep[0], cc.ep[1] = cc.ep[1], cc.ep[0]
+    return cc
+
+
+def generate_scramble(rng: Optional[random.Random] = None, solver=None) -> List[int]:
+    """
+    Generates a scramble for a uniformly random cube state: the inverse of
+    a solution of the state, which is short, and leads from the solved
+    cube to exactly that state. The search is bounded by SCRAMBLE_NODES
+    only, so the scramble depends on the random stream alone.
+
+    Args:
+        rng (Optional[random.Random]): Source of randomness.
+        solver (Optional[Solver]): Solver to use, over the default tables unless given.
+    Returns:
+        List[int]: Move indices (face * 3 + direction) of the scramble.
+    """
+    if solver is None:
+        from .solver import Solver
+        solver = Solver()
+    rng = rng if rng is not None else random.Random()
+    while True:
+        solution = solver.solve(random_cubie(rng), timeout=None, max_nodes=SCRAMBLE_NODES)
+        if len(solution) >= MIN_LENGTH:
+            return [facelets.inverse_move(m) for m in reversed(solution)]
+
+
+def _fill(results, scramble_seeds: List[int], directory: Optional[str]) -> None:
+    """
+    Worker process generating a scramble from the stream of each seed, in
+    order, into the results queue.
+    """
+    from .solver import Solver
+    from .tables import get_tables
+
+    solver = Solver(get_tables(directory))
+    for seed in scramble_seeds:
+        results.put((seed, generate_scramble(seeds.stream(seed), solver)))
+
+
+def read_pool(path: str) -> List[Tuple[int, List[int]]]:
+    """
+    Reads the scrambles saved in a pool file. Each scramble is stored as
+    its seed in 8 bytes, little endian, then its length in one byte,
+    followed by one byte per move.
+
+    Args:
+        path (str): The pool file.
+    Returns:
+        List[Tuple[int, List[int]]]: The seed and moves of each scramble, or
+            none if the file is missing or of another format.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return []
+    header = POOL_MAGIC + bytes([POOL_VERSION])
+    if not data.startswith(header):
+        return []
+    scrambles = []
+    i = len(header)
+    while i + 9 <= len(data):
+        seed = int.from_bytes(data[i:i + 8], "little")
+        n = data[i + 8]
+        scramble = list(data[i + 9:i + 9 + n])
+        if len(scramble) < n:               # truncated write, drop the tail
+            break
+        scrambles.append((seed, scramble))
+        i += 9 + n
+    return scrambles
+
+
+def write_pool(path: str, scrambles: List[Tuple[int, List[int]]]) -> None:
+    """
+    Writes scrambles to a pool file, replacing it atomically.
+
+    Args:
+        path (str): The pool file.
+        scrambles (List[Tuple[int, List[int]]]): The seed and moves of each scramble.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = bytearray(POOL_MAGIC + bytes([POOL_VERSION]))
+    for seed, scramble in scrambles:
+        data.extend(seed.to_bytes(8, "little"))
+        data.append(len(scramble))
+        data.extend(scramble)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class ScramblePool(object):
+    """
+    Pool of ready-made scrambles, saved between sessions. Taking a scramble
+    is instant, and a background process generates new ones to keep the
+    pool topped up. Scrambles are generated from the "rubiks" game seeds,
+    in the order they are handed out. A process that dies is restarted
+    with the seeds it still owed, so no seed is skipped.
+
+    Attributes:
+        path (Optional[str]): File the pool is saved in, or None to keep it in
+            memory only, e.g. to reproduce a session from its root seed.
+        size (int): Number of scrambles to keep ready.
+        directory (Optional[str]): Table directory of the solver.
+    """
+
+    path: Optional[str]
+    size: int
+    directory: Optional[str]
+
+    def __init__(
+        self, path: Optional[str] = POOL_PATH, size: int = POOL_SIZE, directory: Optional[str] = None
+    ) -> None:
+        """
+        Initializes the pool with the saved scrambles, and starts topping
+        it up if short.
+        """
+        self.path = path
+        self.size = size
+        self.directory = directory
+        self.__scrambles = read_pool(path) if path is not None else []
+        self.__process = None
+        self.__owed: List[int] = []
+        self.__results = _context.Queue()
+        self.refill()
+
+    def __len__(self) -> int:
+        self.__collect()
+        return len(self.__scrambles)
+
+    def __collect(self) -> None:
+        while True:
+            try:
+                self.__add(self.__results.get_nowait())
+            except queue.Empty:
+                return
+
+    def __add(self, scramble: Tuple[int, List[int]]) -> None:
+        seed = scramble[0]
+        if seed in self.__owed:
+            self.__owed.remove(seed)
+        if all(seed != s for s, _ in self.__scrambles):
+            self.__scrambles.append(scramble)
+
+    def refill(self) -> None:
+        """
+        Starts a background process generating the scrambles missing from
+        the pool, and those a dead process still owed, unless one is
+        already running.
+        """
+        if self.__alive():
+            return
+        missing = self.size - len(self) - len(self.__owed)
+        scramble_seeds = self.__owed + [seeds.SERVICE.game_seed("rubiks") for _ in range(missing)]
+        if scramble_seeds:
+            self.__start(scramble_seeds)
+
+    def __alive(self) -> bool:
+        return self.__process is not None and self.__process.is_alive()
+
+    def __start(self, scramble_seeds: List[int]) -> None:
+        self.__owed = list(scramble_seeds)
+        self.__process = _context.Process(
+            target=_fill, args=(self.__results, scramble_seeds, self.directory), daemon=True
+        )
+        self.__process.start()
+
+    def __wait(self) -> None:
+        while not self.__scrambles:
+            try:
+                self.__add(self.__results.get(timeout=POLL_SECONDS))
+            except queue.Empty:
+                if not self.__alive():
+                    self.__start(self.__owed or [seeds.SERVICE.game_seed("rubiks")])
+
+    def take(self) -> Tuple[int, List[int]]:
+        """
+        Takes a scramble from the pool. Should the pool have run dry, waits
+        for the background process to generate the next one.
+
+        Returns:
+            Tuple[int, List[int]]: Seed the scramble was generated from, and its
+                move indices (face * 3 + direction).
+        """
+        self.__collect()
+        if not self.__scrambles:
+            self.refill()
+            self.__wait()
+        scramble = self.__scrambles.pop(0)
+        self.__save()
+        self.refill()
+        return scramble
+
+    def close(self) -> None:
+        """
+        Saves the pool and stops the background process.
+        """
+        self.__collect()
+        if self.__process is not None:
+            self.__process.terminate()
+            self.__process.join()
+            self.__process = None
+        self.__save()
+
+    def __save(self) -> None:
+        if self.path is not None:
+            write_pool(self.path, self.__scrambles)
@@ -0,0 +1,296 @@
+import time
+
+from typing import Callable, List, Optional, Tuple, Union
+
+from . import coords, facelets
+from .coords import N_CORNERS, N_FLIP, N_MOVE, N_TWIST, N_UD_EDGES
+from .cubie import CubieCube, MOVE_CUBES
+from .rubiks import RubiksCube
+from .tables import Tables, get_tables
+
+
+DEFAULT_MAX_LENGTH = 22
+DEFAULT_TIMEOUT = 0.5
+
+# Solutions longer than this many times the lower bound are improved
+# upon until the timeout, even when no longer than max_length: the first
+# solution found of a nearly solved cube is often far from optimal.
+
+GOOD_ENOUGH_FACTOR = 3
+
+MAX_PHASE1_DEPTH = 12
+MAX_PHASE2_DEPTH = 18
+
+PHASE2_SET = frozenset(coords.PHASE2_MOVES)
+
+# Checking the clock on every node is expensive, so it, and the stop
+# callback, are only checked after this many phase 1 nodes.
+
+_CLOCK_INTERVAL = 1024
+
+
+def _allowed(move: int, last: int) -> bool:
+    """
+    Rejects turning the same face twice in a row, and fixes the order of
+    two consecutive turns of opposite faces, since those commute.
+    """
+    if last < 0:
+        return True
+    face, last_face = move // 3, last // 3
+    return face != last_face and not (face // 2 == last_face // 2 and face < last_face)
+
+
+# Moves allowed after each last move, indexed by last move + 1 (0: no move).
+
+PHASE1_NEXT = tuple(
+    tuple(m for m in range(coords.N_MOVE) if _allowed(m, last)) for last in range(-1, coords.N_MOVE)
+)
+PHASE2_NEXT = tuple(
+    tuple(m for m in coords.PHASE2_MOVES if _allowed(m, last)) for last in range(-1, coords.N_MOVE)
+)
+
+# First phase 2 moves after each last phase 1 move. Phase 1 ends with a
+# quarter turn of L, R, F or B, and phase 2 may start with the half turn of
+# the same face, tried first: the two merge into the opposite quarter turn,
+# which phase 1 cannot end with when it brings the cube nearer to solved.
+
+PHASE2_FIRST = tuple(
+    ((last // 3 * 3 + facelets.HALF_TURN,) if last >= 0 and last not in PHASE2_SET else ())
+    + PHASE2_NEXT[last + 1]
+    for last in range(-1, coords.N_MOVE)
+)
+
+
+class _Stop(Exception):
+    pass
+
+
+class Solver(object):
+    """
+    Two-phase (Kociemba) solver. Phase 1 brings the cube into the subgroup
+    <U, D, L2, R2, F2, B2>, phase 2 solves it inside that subgroup. Longer
+    phase 1 solutions are tried until a solution of the wanted length is
+    found, or the time runs out.
+
+    Attributes:
+        tables (Tables): The move and pruning tables.
+    """
+
+    tables: Tables
+
+    def __init__(self, tables: Optional[Tables] = None) -> None:
+        """
+        Initializes the solver. Tables are loaded from the user data
+        directory unless given.
+        """
+        self.tables = tables if tables is not None else get_tables()
+
+    def solve(
+        self,
+        cube: Union[RubiksCube, CubieCube],
+        max_length: int = DEFAULT_MAX_LENGTH,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        should_stop: Optional[Callable[[], bool]] = None,
+        max_nodes: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Solves a cube. Returns as soon as a solution of at most max_length
+        moves, and at most GOOD_ENOUGH_FACTOR times the lower bound, is
+        found; otherwise the shortest solution found once the timeout has
+        passed or the node budget is spent, or the first solution found
+        after that. A search bounded by nodes only gives the same solution
+        on every machine.
+
+        Args:
+            cube (Union[RubiksCube, CubieCube]): The cube to solve.
+            max_length (int): Solution length that is good enough.
+            timeout (Optional[float]): Seconds to look for a short solution,
+                None for no time limit.
+            should_stop (Optional[Callable[[], bool]]): Polled during the search,
+                which is abandoned once it returns True.
+            max_nodes (Optional[int]): Phase 1 nodes to look for a short solution,
+                None for no limit.
+        Returns:
+            List[int]: Move indices (face * 3 + direction) that solve the cube.
+        Raises:
+            ValueError: If the cube state cannot be solved.
+        """
+        cc = cube.to_cubie() if isinstance(cube, RubiksCube) else cube
+        if not cc.is_solvable():
+            raise ValueError("Cube state is not solvable")
+
+        self.__cube = cc
+        self.__max_length = max_length
+        self.__deadline = time.time() + timeout if timeout is not None else None
+        self.__max_nodes = max_nodes
+        self.__should_stop = should_stop
+        self.__nodes = 0
+        self.__best: Optional[List[int]] = None
+        self.__path1: List[int] = []
+
+        t = self.tables
+        twist, flip = cc.get_twist(), cc.get_flip()
+        slice_ = cc.get_slice()
+        h1 = max(
+            t.slice_twist_prune[slice_ * coords.N_TWIST + twist],
+            t.slice_flip_prune[slice_ * coords.N_FLIP + flip],
+        )
+        self.__good_enough = GOOD_ENOUGH_FACTOR * max(h1, 1)
+        try:
+            for depth in range(h1, MAX_PHASE1_DEPTH + 1):
+                if self.__best is not None and depth >= len(self.__best):
+                    break
+                self.__phase1(twist, flip, slice_, depth, -1)
+        except _Stop:
+            pass
+        return self.__best if self.__best is not None else []
+
+    def lower_bound(self, cube: Union[RubiksCube, CubieCube]) -> int:
+        """
+        Gets a lower bound of the number of moves solving a cube: its phase 1
+        pruning distance, as every solution passes through phase 1's goal.
+        A solution of this length is optimal.
+
+        Args:
+            cube (Union[RubiksCube, CubieCube]): The cube.
+        Returns:
+            int: No solution of the cube is shorter.
+        """
+        cc = cube.to_cubie() if isinstance(cube, RubiksCube) else cube
+        t = self.tables
+        slice_ = cc.get_slice()
+        return max(
+            t.slice_twist_prune[slice_ * coords.N_TWIST + cc.get_twist()],
+            t.slice_flip_prune[slice_ * coords.N_FLIP + cc.get_flip()],
+        )
+
+    def __spent(self) -> bool:
+        if self.__max_nodes is not None and self.__nodes >= self.__max_nodes:
+            return True
+        return self.__deadline is not None and time.time() > self.__deadline
+
+    # ==================================================================================
+    # ------------------------------------ Phase 1 -------------------------------------
+    # ==================================================================================
+
+    def __phase1(self, twist: int, flip: int, slice_: int, togo: int, last: int) -> None:
+        if togo == 0:
+            if twist == 0 and flip == 0 and slice_ == 0 and (last < 0 or last not in PHASE2_SET):
+                self.__start_phase2()
+            return
+
+        self.__nodes += 1
+        if self.__nodes % _CLOCK_INTERVAL == 0:
+            if self.__should_stop is not None and self.__should_stop():
+                raise _Stop()
+            if self.__best is not None and self.__spent():
+                raise _Stop()
+
+        t = self.tables
+        twist_move, flip_move, slice_move = t.twist_move, t.flip_move, t.slice_move
+        twist_prune, flip_prune = t.slice_twist_prune, t.slice_flip_prune
+        tr, fr, sr = N_MOVE * twist, N_MOVE * flip, N_MOVE * slice_
+        for m in PHASE1_NEXT[last + 1]:
+            sl = slice_move[sr + m]
+            tw = twist_move[tr + m]
+            if twist_prune[sl * N_TWIST + tw] >= togo:
+                continue
+            fl = flip_move[fr + m]
+            if flip_prune[sl * N_FLIP + fl] >= togo:
+                continue
+            self.__path1.append(m)
+            self.__phase1(tw, fl, sl, togo - 1, m)
+            self.__path1.pop()
+
+    # ==================================================================================
+    # ------------------------------------ Phase 2 -------------------------------------
+    # ==================================================================================
+
+    def __start_phase2(self) -> None:
+        t = self.tables
+        n_move = coords.N_MOVE
+        length1 = len(self.__path1)
+        last = self.__path1[-1] if self.__path1 else -1
+        # A first move merged with the last phase 1 move makes the solution
+        # one move shorter than the phase 2 depth.
+        merges = last >= 0 and last not in PHASE2_SET
+        limit = MAX_PHASE2_DEPTH
+        if self.__best is not None:
+            limit = min(limit, len(self.__best) - length1 - 1 + merges)
+        if limit < 0:
+            return
+
+        corners = self.__cube.get_corners()
+        slice_sorted = self.__cube.get_slice_sorted()
+        edges = self.__cube.copy()
+        for m in self.__path1:
+            corners = t.corners_move[n_move * corners + m]
+            slice_sorted = t.slice_sorted_move[n_move * slice_sorted + m]
+            edges.edge_multiply(MOVE_CUBES[m])
+        ud_edges = edges.get_ud_edges()
+
+        h2 = max(
+            t.perm4_corners_prune[slice_sorted * coords.N_CORNERS + corners],
+            t.perm4_ud_edges_prune[slice_sorted * coords.N_UD_EDGES + ud_edges],
+        )
+        path2: List[int] = []
+        for depth in range(h2, limit + 1):
+            if self.__phase2(corners, ud_edges, slice_sorted, depth, PHASE2_FIRST[last + 1], path2):
+                solution = self.__path1 + path2
+                if merges and path2 and path2[0] // 3 == last // 3:
+                    solution[length1 - 1 : length1 + 1] = [facelets.inverse_move(last)]
+                if self.__best is not None and len(solution) >= len(self.__best):
+                    return
+                self.__best = solution
+                if len(solution) <= self.__max_length and len(solution) <= self.__good_enough:
+                    raise _Stop()
+                if self.__spent():
+                    raise _Stop()
+                return
+
+    def __phase2(
+        self,
+        corners: int,
+        ud_edges: int,
+        perm4: int,
+        togo: int,
+        moves: Tuple[int, ...],
+        path: List[int],
+    ) -> bool:
+        if togo == 0:
+            return corners == 0 and ud_edges == 0 and perm4 == 0
+
+        t = self.tables
+        cr, er, pr = N_MOVE * corners, N_MOVE * ud_edges, N_MOVE * perm4
+        for m in moves:
+            p4 = t.perm4_move[pr + m]
+            co = t.corners_move[cr + m]
+            if t.perm4_corners_prune[p4 * N_CORNERS + co] >= togo:
+                continue
+            ed = t.ud_edges_move[er + m]
+            if t.perm4_ud_edges_prune[p4 * N_UD_EDGES + ed] >= togo:
+                continue
+            path.append(m)
+            if self.__phase2(co, ed, p4, togo - 1, PHASE2_NEXT[m + 1], path):
+                return True
+            path.pop()
+        return False
+
+
+_solver: Optional[Solver] = None
+
+
+def solve(
+    cube: Union[RubiksCube, CubieCube],
+    max_length: int = DEFAULT_MAX_LENGTH,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    should_stop: Optional[Callable[[], bool]] = None,
+    max_nodes: Optional[int] = None,
+) -> List[int]:
+    """
+    Solves a cube with a solver over the default tables, see Solver.solve().
+    """
+    global _solver
+    if _solver is None:
+        _solver = Solver()
+    return _solver.solve(cube, max_length, timeout, should_stop, max_nodes)
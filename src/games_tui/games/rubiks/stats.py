@@ -0,0 +1,137 @@
+import math
+
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Deque, Iterable, List, Optional
+
+from .optimizer import MoveOptimizer
+from .replay import Solve
+
+
+AVERAGE_SIZES = (5, 12, 100)
+
+
+class TrimmedAverage(object):
+    """
+    Average of the last n solve times, WCA style: the best and worst 5% of
+    the window (at least one each) are left out. The window is kept both
+    in arrival order and sorted, with a running sum, so a new time costs a
+    binary search, and the average sums only the trimmed ends. Neither
+    depends on the number of solves.
+
+    Attributes:
+        size (int): Number of times in the window.
+        trim (int): Number of times left out at each end.
+        best (Optional[float]): Best average seen so far.
+    """
+
+    size: int
+    trim: int
+    best: Optional[float]
+
+    def __init__(self, size: int) -> None:
+        """
+        Initializes an empty window of a given size.
+        """
+        self.size = size
+        self.trim = max(1, math.ceil(size * 0.05))
+        self.best = None
+        self.__window: Deque[int] = deque()
+        self.__sorted: List[int] = []
+        self.__total = 0
+
+    def add(self, value: int) -> None:
+        """
+        Adds a time, dropping the oldest one once the window is full.
+
+        Args:
+            value (int): The solve time.
+        """
+        if len(self.__window) == self.size:
+            old = self.__window.popleft()
+            del self.__sorted[bisect_left(self.__sorted, old)]
+            self.__total -= old
+        self.__window.append(value)
+        self.__total += value
+        insort(self.__sorted, value)
+        current = self.current()
+        if current is not None and (self.best is None or current < self.best):
+            self.best = current
+
+    def current(self) -> Optional[float]:
+        """
+        Gets the average of the window, or None until it is full.
+        """
+        if len(self.__sorted) < self.size:
+            return None
+        trimmed = sum(self.__sorted[:self.trim]) + sum(self.__sorted[-self.trim:])
+        return (self.__total - trimmed) / (self.size - 2 * self.trim)
+
+
+class SolveStats(object):
+    """
+    Statistics over all recorded solves, updated as each solve finishes:
+    best time, best move count, mean time, and the trimmed averages of
+    the last 5, 12 and 100 solves.
+
+    Attributes:
+        count (int): Number of solves.
+        best_time (Optional[int]): Fastest solve, in milliseconds.
+        best_moves (Optional[int]): Fewest moves of a solve.
+        averages (List[TrimmedAverage]): Rolling averages, see AVERAGE_SIZES.
+    """
+
+    count: int
+    best_time: Optional[int]
+    best_moves: Optional[int]
+    averages: List[TrimmedAverage]
+
+    def __init__(self) -> None:
+        """
+        Initializes the statistics without any solves.
+        """
+        self.count = 0
+        self.best_time = None
+        self.best_moves = None
+        self.averages = [TrimmedAverage(n) for n in AVERAGE_SIZES]
+        self.__total = 0
+
+    def add(self, duration: int, moves: int) -> None:
+        """
+        Adds a finished solve.
+
+        Args:
+            duration (int): Solve time in milliseconds.
+            moves (int): Number of moves of the solve.
+        """
+        self.count += 1
+        self.__total += duration
+        if self.best_time is None or duration < self.best_time:
+            self.best_time = duration
+        if self.best_moves is None or moves < self.best_moves:
+            self.best_moves = moves
+        for average in self.averages:
+            average.add(duration)
+
+    def add_solve(self, solve: Solve) -> None:
+        """
+        Adds a recorded solve, counting its moves with cancelling and
+        repeated turns merged, as the game displays them.
+        """
+        self.add(solve.duration(), len(MoveOptimizer(solve.moves)))
+
+    def mean(self) -> Optional[float]:
+        """
+        Gets the mean solve time in milliseconds, or None without solves.
+        """
+        return self.__total / self.count if self.count else None
+
+    @classmethod
+    def from_solves(cls, solves: Iterable[Solve]) -> "SolveStats":
+        """
+        Builds the statistics of recorded solves, oldest first.
+        """
+        stats = cls()
+        for solve in solves:
+            stats.add_solve(solve)
+        return stats
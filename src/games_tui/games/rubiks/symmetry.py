@@ -0,0 +1,111 @@
+from itertools import permutations, product
+from operator import itemgetter
+from typing import Callable, List, Tuple
+
+from . import facelets
+
+
+Vector = Tuple[int, int, int]
+
+# Outward normal of each face, with x to the right, y up and z to the front.
+
+NORMALS: Tuple[Vector, ...] = ((0, 1, 0), (0, -1, 0), (-1, 0, 0), (1, 0, 0), (0, 0, 1), (0, 0, -1))
+
+NUM_SYMMETRIES = 48
+
+
+def _position(index: int) -> Vector:
+    """
+    Position of a sticker, scaled to integers: 3 along the face normal, and
+    2 per row or column away from the center of the face. Rows and columns
+    are laid out as in the unfolded net the UI draws.
+    """
+    face, k = divmod(index, 9)
+    row, col = divmod(k, 3)
+    a, b = col - 1, row - 1
+    offset = (
+        (a, 0, b),          # top, back row first
+        (a, 0, -b),         # bottom, front row first
+        (0, -b, a),         # left, back column first
+        (0, -b, -a),        # right, front column first
+        (a, -b, 0),         # front
+        (-a, -b, 0),        # back, right column first
+    )[face]
+    return tuple(3 * n + 2 * o for n, o in zip(NORMALS[face], offset))
+
+
+def _transform(matrix: Tuple[Tuple[int, int], ...], v: Vector) -> Vector:
+    return tuple(sign * v[axis] for axis, sign in matrix)
+
+
+def _build_symmetries() -> List[Tuple[facelets.Permutation, bytes]]:
+    """
+    Builds the sticker gather and color map of the 48 symmetries of the
+    cube: the 24 rotations, and the 24 rotations combined with a mirror.
+    Every symmetry is a signed permutation of the axes.
+    """
+    positions = [_position(i) for i in range(facelets.NUM_FACELETS)]
+    index = {p: i for i, p in enumerate(positions)}
+    faces = {n: f for f, n in enumerate(NORMALS)}
+    symmetries = []
+    for axes in permutations(range(3)):
+        for signs in product((1, -1), repeat=3):
+            matrix = tuple(zip(axes, signs))
+            gather = [0] * facelets.NUM_FACELETS
+            for i, p in enumerate(positions):
+                gather[index[_transform(matrix, p)]] = i
+            colors = bytes(faces[_transform(matrix, n)] for n in NORMALS)
+            symmetries.append((tuple(gather), colors))
+    return symmetries
+
+
+# Sticker gather permutation and color map of each symmetry, the identity
+# first. A symmetry moves the whole cube, then relabels the colors so the
+# centers keep their colors, which conjugates the state by the symmetry.
+
+SYMMETRIES: List[Tuple[facelets.Permutation, bytes]] = _build_symmetries()
+
+_TABLES: List[Tuple[Callable[[bytes], Tuple[int, ...]], bytes]] = [
+    (itemgetter(*gather), bytes.maketrans(bytes(range(len(colors))), colors))
+    for gather, colors in SYMMETRIES
+]
+
+
+def conjugate(state: bytes, symmetry: int) -> bytes:
+    """
+    Applies a symmetry to a facelet state.
+
+    Args:
+        state (bytes): The 54 facelet colors.
+        symmetry (int): Index of the symmetry in SYMMETRIES.
+    Returns:
+        bytes: The symmetric state, which takes as many moves to solve.
+    """
+    gather, colors = _TABLES[symmetry]
+    return bytes(gather(state)).translate(colors)
+
+
+def canonical(state: bytes) -> bytes:
+    """
+    Gets the representative of a state among its up to 48 symmetric states:
+    the smallest of them.
+
+    Args:
+        state (bytes): The 54 facelet colors.
+    Returns:
+        bytes: The canonical facelet state.
+    """
+    return min(bytes(gather(state)).translate(colors) for gather, colors in _TABLES)
+
+
+def canonical_pack(state: bytes) -> int:
+    """
+    Packs the canonical state, see facelets.pack(). Symmetric states share
+    the key, so tables keyed by it are up to 48 times smaller.
+
+    Args:
+        state (bytes): The 54 facelet colors.
+    Returns:
+        int: The packed canonical state.
+    """
+    return facelets.pack(canonical(state))
@@ -0,0 +1,516 @@
+import json
+import mmap
+import multiprocessing
+import os
+import platformdirs
+import time
+
+from array import array
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from . import coords
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+# Tables live next to the sound files, in the same user data directory as
+# audio.player.Player.data_dir. They are raw native-endian arrays, so they
+# are only meant to be read back on the machine that wrote them.
+
+TABLES_DIR = os.path.join(platformdirs.user_data_dir("games-tui"), "rubiks", "tables")
+
+# Seconds between attempts to take the lock of a table directory held by
+# another process.
+
+LOCK_POLL_SECONDS = 0.1
+
+UNVISITED = 0xFF
+UNVISITED_BYTE = bytes((UNVISITED,))
+
+N_SLICE_TWIST = coords.N_SLICE * coords.N_TWIST
+N_SLICE_FLIP = coords.N_SLICE * coords.N_FLIP
+N_PERM4_CORNERS = coords.N_PERM_4 * coords.N_CORNERS
+N_PERM4_UD_EDGES = coords.N_PERM_4 * coords.N_UD_EDGES
+
+
+def slice_move_table(slice_sorted_move: Iterable[int]) -> array:
+    """
+    Derives the move table of the phase 1 slice coordinate, which is the
+    slice_sorted coordinate without the order of the slice edges.
+    """
+    move = array("H", bytes(2 * coords.N_SLICE * coords.N_MOVE))
+    for s in range(coords.N_SLICE):
+        row = coords.N_MOVE * coords.N_PERM_4 * s
+        for m in range(coords.N_MOVE):
+            move[coords.N_MOVE * s + m] = slice_sorted_move[row + m] // coords.N_PERM_4
+    return move
+
+
+def perm4_move_table(slice_sorted_move: Iterable[int]) -> array:
+    """
+    Derives the move table of the phase 2 slice coordinate, the order of
+    the slice edges while they are in the UD slice.
+    """
+    move = array("H", bytes(2 * coords.N_PERM_4 * coords.N_MOVE))
+    for s in range(coords.N_PERM_4):
+        for m in coords.PHASE2_MOVES:
+            move[coords.N_MOVE * s + m] = slice_sorted_move[coords.N_MOVE * s + m]
+    return move
+
+
+class PruneSpec(NamedTuple):
+    """
+    A pruning table over two coordinates, by the names of their move tables
+    in Tables. Entry b * size_a + a holds the number of moves needed to
+    bring both coordinates home.
+    """
+    move_a: str
+    size_a: int
+    move_b: str
+    size_b: int
+    moves: Tuple[int, ...]
+
+
+def map_table(path: str, typecode: str, writable: bool = False) -> Tuple[mmap.mmap, memoryview]:
+    """
+    Memory maps a table file. Writable maps are shared, so every process
+    mapping the same file sees the others' writes.
+
+    Args:
+        path (str): The table file.
+        typecode (str): Array type code of the entries.
+        writable (bool): Whether to map the file for writing.
+    Returns:
+        Tuple[mmap.mmap, memoryview]: The map and a typed view of it.
+    """
+    with open(path, "r+b" if writable else "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+    return mm, memoryview(mm).cast(typecode)
+
+
+_DERIVED = {"slice_move": slice_move_table, "perm4_move": perm4_move_table}
+
+
+class _Expander(object):
+    """
+    Expands breadth-first search layers of a pruning table mapped from disk.
+    Each pool worker holds one, built by _init_worker().
+    """
+
+    def __init__(self, directory: str, spec: PruneSpec, part: str) -> None:
+        self.spec = spec
+        self.table, view = map_table(part, "B", writable=True)
+        view.release()
+        self.maps = [self.table]
+        self.views = []
+        self.move_a = self.__move(directory, spec.move_a)
+        self.move_b = self.__move(directory, spec.move_b)
+
+    def __move(self, directory: str, name: str) -> Iterable[int]:
+        if name in _DERIVED:
+            return _DERIVED[name](self.__move(directory, "slice_sorted_move"))
+        mm, view = map_table(os.path.join(directory, f"{name}.bin"), "H")
+        self.maps.append(mm)
+        self.views.append(view)
+        return view
+
+    def expand(self, depth: int, lo: int, hi: int, backward: bool) -> int:
+        """
+        Expands layer depth within entries lo to hi.
+
+        Forward, every entry at depth writes depth + 1 into its unvisited
+        neighbours, which may lie in other workers' shards. Concurrent
+        workers can only ever write that same value, so the races are
+        harmless. Backward, every unvisited entry looks for a neighbour at
+        depth and only writes itself; this is faster once most of the table
+        is filled, and is valid because the move set holds every inverse.
+
+        Returns:
+            int: Number of entries written, possibly counting some twice.
+        """
+        table, move_a, move_b = self.table, self.move_a, self.move_b
+        size_a, moves = self.spec.size_a, self.spec.moves
+        n_move = coords.N_MOVE
+        nxt = depth + 1
+        added = 0
+        if backward:
+            j = table.find(UNVISITED_BYTE, lo, hi)
+            while j >= 0:
+                b, a = divmod(j, size_a)
+                ra, rb = n_move * a, n_move * b
+                for m in moves:
+                    if table[move_b[rb + m] * size_a + move_a[ra + m]] == depth:
+                        table[j] = nxt
+                        added += 1
+                        break
+                j = table.find(UNVISITED_BYTE, j + 1, hi)
+        else:
+            needle = bytes((depth,))
+            j = table.find(needle, lo, hi)
+            while j >= 0:
+                b, a = divmod(j, size_a)
+                ra, rb = n_move * a, n_move * b
+                for m in moves:
+                    k = move_b[rb + m] * size_a + move_a[ra + m]
+                    if table[k] == UNVISITED:
+                        table[k] = nxt
+                        added += 1
+                j = table.find(needle, j + 1, hi)
+        return added
+
+    def close(self) -> None:
+        for view in self.views:
+            view.release()
+        for mm in self.maps:
+            mm.close()
+
+
+_expander: Optional[_Expander] = None
+
+
+def _init_worker(directory: str, spec: PruneSpec, part: str) -> None:
+    global _expander
+    _expander = _Expander(directory, spec, part)
+
+
+def _expand_shard(task: Tuple[int, int, int, bool]) -> int:
+    return _expander.expand(*task)
+
+
+def _resume_checkpoint(path: str, part: str, size: int) -> Optional[int]:
+    """
+    Takes over the partial table of an interrupted build, renaming it to
+    part, and gets the next layer to expand, if the partial table is still
+    intact.
+    """
+    ckpt = f"{path}.ckpt"
+    try:
+        with open(ckpt, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("size") != size:
+        return None
+    previous = os.path.join(os.path.dirname(path), data.get("part", f"{os.path.basename(path)}.part"))
+    if not os.path.isfile(previous) or os.path.getsize(previous) != size:
+        return None
+    try:
+        os.replace(previous, part)
+    except FileNotFoundError:               # taken over by another process
+        return None
+    return data["depth"]
+
+
+def _write_checkpoint(ckpt: str, part: str, depth: int, size: int) -> None:
+    tmp = f"{ckpt}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"depth": depth, "size": size, "part": os.path.basename(part)}, f)
+    os.replace(tmp, ckpt)
+
+
+@contextmanager
+def lock_tables(directory: str, log: Optional[Callable[[str], None]] = None) -> Iterator[None]:
+    """
+    Holds the exclusive lock of a table directory, waiting for any other
+    process holding it, e.g. while it builds the tables.
+
+    Args:
+        directory (str): The table directory.
+        log (Optional[Callable[[str], None]]): Told when waiting for the lock.
+    """
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, ".lock"), "a+") as f:
+        if not _try_lock(f):
+            if log is not None:
+                log("waiting for another process building the tables")
+            while not _try_lock(f):
+                time.sleep(LOCK_POLL_SECONDS)
+        try:
+            yield
+        finally:
+            _unlock(f)
+
+
+def _try_lock(f) -> bool:
+    """
+    Takes the exclusive lock of an open file, unless another process holds
+    it: flock on POSIX systems, a lock of the first byte on Windows.
+    """
+    try:
+        if os.name == "nt":
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        return False
+    return True
+
+
+def _unlock(f) -> None:
+    if os.name == "nt":
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def default_processes() -> int:
+    """
+    Number of processes to generate tables with. Daemon processes, such as
+    background solvers, may not start a pool of their own.
+    """
+    if multiprocessing.current_process().daemon:
+        return 1
+    return os.cpu_count() or 1
+
+
+def build_pruning_table(
+    path: str,
+    directory: str,
+    spec: PruneSpec,
+    processes: Optional[int] = None,
+) -> None:
+    """
+    Builds a pruning table by breadth-first search from the solved state,
+    split over a pool of processes that each expand a shard of every layer
+    in a shared memory mapped file. Progress is checkpointed after every
+    layer, so an interrupted build resumes where it stopped. The partial
+    table has a name of its own per process, and the finished table
+    replaces path atomically; callers building tables that other processes
+    may build too hold lock_tables() around the build.
+
+    Entries take a byte each rather than a nibble: workers writing the two
+    halves of one byte would race on the read-modify-write, and whole bytes
+    keep the solver's lookups free of shifts.
+
+    Args:
+        path (str): Destination of the finished table.
+        directory (str): Directory holding the move tables.
+        spec (PruneSpec): The table to build.
+        processes (Optional[int]): Number of worker processes. Default: all cores.
+    """
+    size = spec.size_a * spec.size_b
+    part, ckpt = f"{path}.{os.getpid()}.part", f"{path}.ckpt"
+    depth = _resume_checkpoint(path, part, size)
+    if depth is None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(part, "wb") as f:
+            f.write(b"\x00" + UNVISITED_BYTE * (size - 1))
+        depth = 0
+
+    processes = processes if processes is not None else default_processes()
+    n_shards = max(1, processes * 4)
+    step = -(-size // n_shards)
+    shards = [(lo, min(lo + step, size)) for lo in range(0, size, step)]
+
+    mm, view = map_table(part, "B", writable=True)
+    view.release()
+    if processes > 1:
+        pool = multiprocessing.Pool(processes, _init_worker, (directory, spec, part))
+        expand = lambda tasks: pool.map(_expand_shard, tasks, chunksize=1)
+    else:
+        pool = None
+        local = _Expander(directory, spec, part)
+        expand = lambda tasks: [local.expand(*t) for t in tasks]
+    try:
+        while True:
+            backward = mm[:].count(UNVISITED_BYTE) < size // 2
+            added = sum(expand([(depth, lo, hi, backward) for lo, hi in shards]))
+            depth += 1
+            mm.flush()
+            _write_checkpoint(ckpt, part, depth, size)
+            if added == 0:
+                break
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+        else:
+            local.close()
+        mm.close()
+
+    os.replace(part, path)
+    try:
+        os.remove(ckpt)
+    except FileNotFoundError:
+        pass
+
+
+class Tables(object):
+    """
+    Move and pruning tables of the two-phase solver, memory mapped from the
+    user data directory. Missing tables are generated once and written to
+    disk, so later runs, and any number of processes, share the same pages.
+
+    Attributes:
+        directory (str): The directory holding the table files.
+        twist_move (memoryview): Corner orientation move table.
+        flip_move (memoryview): Edge orientation move table.
+        slice_sorted_move (memoryview): UD slice edge move table.
+        corners_move (memoryview): Corner permutation move table.
+        ud_edges_move (memoryview): Phase 2 edge permutation move table.
+        slice_twist_prune (memoryview): Phase 1 distances over slice and twist.
+        slice_flip_prune (memoryview): Phase 1 distances over slice and flip.
+        perm4_corners_prune (memoryview): Phase 2 distances over slice order and corners.
+        perm4_ud_edges_prune (memoryview): Phase 2 distances over slice order and edges.
+        slice_move (array): Phase 1 slice move table, derived on load.
+        perm4_move (array): Phase 2 slice order move table, derived on load.
+    """
+
+    directory: str
+    twist_move: memoryview
+    flip_move: memoryview
+    slice_sorted_move: memoryview
+    corners_move: memoryview
+    ud_edges_move: memoryview
+    slice_twist_prune: memoryview
+    slice_flip_prune: memoryview
+    perm4_corners_prune: memoryview
+    perm4_ud_edges_prune: memoryview
+    slice_move: array
+    perm4_move: array
+
+    __maps: List[mmap.mmap]
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        processes: Optional[int] = None,
+        log: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        """
+        Maps every table from the directory, generating missing ones first.
+        Builds hold the lock of the directory, so a process finding another
+        one building the tables waits for it, and maps the finished tables.
+
+        Args:
+            directory (Optional[str]): Table directory. Default: TABLES_DIR.
+            processes (Optional[int]): Processes to build pruning tables with. Default: all cores.
+            log (Optional[Callable[[str], None]]): Receives a line per table generated.
+        """
+        self.directory = directory if directory is not None else TABLES_DIR
+        self.__maps = []
+        if missing_tables(self.directory):
+            with lock_tables(self.directory, log):
+                for name, typecode, size, build in self.specs():
+                    path = self.path(name)
+                    if not _complete(path, typecode, size):
+                        start = time.time()
+                        if isinstance(build, PruneSpec):
+                            build_pruning_table(path, self.directory, build, processes)
+                        else:
+                            write_table(path, build())
+                        if log is not None:
+                            log(f"{name}: {time.time() - start:.1f}s")
+
+        for name, typecode, size, _ in self.specs():
+            mm, view = map_table(self.path(name), typecode)
+            self.__maps.append(mm)
+            setattr(self, name, view)
+            if name == "slice_sorted_move":
+                self.slice_move = slice_move_table(self.slice_sorted_move)
+                self.perm4_move = perm4_move_table(self.slice_sorted_move)
+
+    @staticmethod
+    def specs() -> List[Tuple[str, str, int, Union[Callable[[], array], PruneSpec]]]:
+        """
+        Gets name, array type code, number of entries and either the builder
+        or pruning table spec of every table, in the order they must be built.
+        """
+        n, p1, p2 = coords.N_MOVE, tuple(range(coords.N_MOVE)), coords.PHASE2_MOVES
+        return [
+            ("twist_move", "H", coords.N_TWIST * n, coords.twist_move_table),
+            ("flip_move", "H", coords.N_FLIP * n, coords.flip_move_table),
+            ("slice_sorted_move", "H", coords.N_SLICE_SORTED * n, coords.slice_sorted_move_table),
+            ("corners_move", "H", coords.N_CORNERS * n, coords.corners_move_table),
+            ("ud_edges_move", "H", coords.N_UD_EDGES * n, coords.ud_edges_move_table),
+            ("slice_twist_prune", "B", N_SLICE_TWIST, PruneSpec(
+                "twist_move", coords.N_TWIST, "slice_move", coords.N_SLICE, p1)),
+            ("slice_flip_prune", "B", N_SLICE_FLIP, PruneSpec(
+                "flip_move", coords.N_FLIP, "slice_move", coords.N_SLICE, p1)),
+            ("perm4_corners_prune", "B", N_PERM4_CORNERS, PruneSpec(
+                "corners_move", coords.N_CORNERS, "perm4_move", coords.N_PERM_4, p2)),
+            ("perm4_ud_edges_prune", "B", N_PERM4_UD_EDGES, PruneSpec(
+                "ud_edges_move", coords.N_UD_EDGES, "perm4_move", coords.N_PERM_4, p2)),
+        ]
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}.bin")
+
+
+def write_table(path: str, table: Iterable[int]) -> None:
+    """
+    Writes a table to disk atomically, so a crashed or concurrent build never
+    leaves a partial file behind.
+
+    Args:
+        path (str): Destination file.
+        table (Iterable[int]): An array or bytearray holding the table.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(memoryview(table).cast("B"))
+    os.replace(tmp, path)
+
+
+def _complete(path: str, typecode: str, size: int) -> bool:
+    return os.path.isfile(path) and os.path.getsize(path) == size * array(typecode).itemsize
+
+
+def missing_tables(directory: Optional[str] = None) -> List[str]:
+    """
+    Gets the names of the tables still to be generated.
+
+    Args:
+        directory (Optional[str]): Table directory. Default: TABLES_DIR.
+    Returns:
+        List[str]: Names of the missing tables, none once all are built.
+    """
+    directory = directory if directory is not None else TABLES_DIR
+    return [
+        name for name, typecode, size, _ in Tables.specs()
+        if not _complete(os.path.join(directory, f"{name}.bin"), typecode, size)
+    ]
+
+
+def _build(directory: Optional[str]) -> None:
+    Tables(directory)
+
+
+def start_build(directory: Optional[str] = None) -> multiprocessing.Process:
+    """
+    Starts building the missing tables in a background process, spawned
+    rather than forked, as the caller may run threads.
+
+    Args:
+        directory (Optional[str]): Table directory. Default: TABLES_DIR.
+    Returns:
+        multiprocessing.Process: The started process, done once the tables are.
+    """
+    process = multiprocessing.get_context("spawn").Process(target=_build, args=(directory,))
+    process.start()
+    return process
+
+
+_tables: Dict[str, Tables] = {}
+
+
+def get_tables(directory: Optional[str] = None) -> Tables:
+    """
+    Gets the tables of a directory, mapping them only once per process.
+
+    Args:
+        directory (Optional[str]): Table directory. Default: TABLES_DIR.
+    Returns:
+        Tables: The loaded tables.
+    """
+    key = directory if directory is not None else TABLES_DIR
+    if key not in _tables:
+        _tables[key] = Tables(key)
+    return _tables[key]
@@ -0,0 +1,128 @@
+import itertools
+import multiprocessing
+import time
+
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from . import facelets
+from .nxn import NxNCube
+from .replay import CUBE_SIZE, cube_size, read_solves
+
+
+DEFAULT_CHUNK_SIZE = 512
+
+# A work unit: the cube size of a file, and the solves of a chunk of it,
+# each as its index in the file, its scramble, and its moves.
+
+Chunk = Tuple[int, List[Tuple[int, bytes, bytes]]]
+
+
+class Report(NamedTuple):
+    """
+    Result of verifying a solves file.
+
+    Attributes:
+        path (str): The solves file.
+        total (int): Number of solves read.
+        failed (List[int]): Indices of the solves not ending solved.
+        seconds (float): Time spent on the file.
+    """
+
+    path: str
+    total: int
+    failed: List[int]
+    seconds: float
+
+    def throughput(self) -> float:
+        """
+        Gets the number of solves verified per second.
+        """
+        return self.total / self.seconds if self.seconds > 0 else 0.0
+
+
+def is_solved_by(scramble: bytes, moves: bytes, size: int = CUBE_SIZE) -> bool:
+    """
+    Checks that a scramble followed by moves ends in the solved state. Outer
+    layer turns of the Rubik's cube are replayed with the facelet gathers.
+    Other sizes, and 3x3 solves of the NxN mode with inner layer turns,
+    which also turn the centers, are replayed on an NxNCube, see
+    nxn.move_index().
+
+    Args:
+        scramble (bytes): Move indices of the scramble.
+        moves (bytes): Move indices of the solve.
+        size (int): Number of layers of the cube.
+    Returns:
+        bool: True if the moves solve the scrambled cube.
+    """
+    gathers = facelets.GATHERS
+    if size != CUBE_SIZE or max(scramble + moves, default=0) >= len(gathers):
+        cube = NxNCube(size)
+        try:
+            for move in itertools.chain(scramble, moves):
+                cube.apply(move)
+        except ValueError:                  # no such layer
+            return False
+        return cube.is_valid()
+    state = facelets.SOLVED
+    for move in itertools.chain(scramble, moves):
+        state = bytes(gathers[move](state))
+    return state == facelets.SOLVED
+
+
+def verify_chunk(chunk: Chunk) -> List[int]:
+    """
+    Verifies a chunk of solves.
+
+    Args:
+        chunk (Chunk): The solves.
+    Returns:
+        List[int]: Indices of the solves not ending solved.
+    """
+    size, solves = chunk
+    return [i for i, scramble, moves in solves if not is_solved_by(scramble, moves, size)]
+
+
+def chunks(path: str, size: int) -> Iterator[Chunk]:
+    """
+    Streams the solves of a file in chunks of a given size.
+    """
+    cube = cube_size(path)
+    solves = ((i, s.scramble, s.moves) for i, s in enumerate(read_solves(path)))
+    while True:
+        chunk = list(itertools.islice(solves, size))
+        if not chunk:
+            return
+        yield cube, chunk
+
+
+def verify_files(
+    paths: Iterable[str],
+    processes: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Report]:
+    """
+    Verifies that every recorded solve of the given files ends solved,
+    with chunks of solves spread over a pool of processes.
+
+    Args:
+        paths (Iterable[str]): The solves files.
+        processes (Optional[int]): Worker processes. Default: all cores.
+        chunk_size (int): Number of solves per work unit.
+    Yields:
+        Report: The result of each file, in order.
+    Raises:
+        ValueError: If a file is not a solves file.
+    """
+    with multiprocessing.Pool(processes) as pool:
+        for path in paths:
+            start = time.time()
+            total, failed = 0, []
+            for bad, size in pool.imap(_verify_sized, chunks(path, chunk_size)):
+                total += size
+                failed.extend(bad)
+            yield Report(path, total, failed, time.time() - start)
+
+
+def _verify_sized(chunk: Chunk) -> Tuple[List[int], int]:
+    return verify_chunk(chunk), len(chunk[1])
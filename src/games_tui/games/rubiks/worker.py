@@ -0,0 +1,208 @@
+import multiprocessing
+import queue
+
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Tuple
+
+from .cubie import CubieCube
+
+
+# Spawned rather than forked: the UI runs a timer thread, and forking a
+# threaded process is unsafe.
+
+_context = multiprocessing.get_context("spawn")
+
+# Solutions kept by a SolutionCache by default: a few hundred bytes each.
+
+CACHE_SIZE = 4096
+
+
+class Solution(NamedTuple):
+    """
+    A solution of a cube state.
+
+    Attributes:
+        moves (List[int]): Move indices (face * 3 + direction) solving the cube.
+        optimal (bool): Whether no shorter solution exists; otherwise the length
+            is only an upper bound of the distance to solved.
+    """
+
+    moves: List[int]
+    optimal: bool
+
+
+def _serve(requests, results, generation, directory: Optional[str]) -> None:
+    """
+    Worker process loop. Solves the latest requested state, and skips or
+    abandons requests that were superseded while waiting or searching.
+    Every search keeps shortening its solution until the solver's timeout,
+    rather than stopping at the first one of a good enough length.
+    """
+    from .solver import Solver
+    from .tables import get_tables
+
+    solver = Solver(get_tables(directory))
+    while True:
+        gen, state = requests.get()
+        while True:                         # skip straight to the newest request
+            try:
+                gen, state = requests.get_nowait()
+            except queue.Empty:
+                break
+        if gen != generation.value:
+            continue
+        cc = CubieCube.from_facelets(state)
+        try:
+            moves = solver.solve(cc, max_length=0, should_stop=lambda: generation.value != gen)
+            solution = Solution(moves, len(moves) <= solver.lower_bound(cc))
+        except ValueError:
+            solution = None
+        if gen == generation.value:
+            results.put((gen, state, solution))
+
+
+class SolverWorker(object):
+    """
+    Solves cube states in a background process, so the UI never blocks on
+    a search. Every submitted state supersedes the previous one, and a
+    search still running for an older state is cancelled.
+
+    Attributes:
+        directory (Optional[str]): Table directory of the solver.
+    """
+
+    directory: Optional[str]
+
+    def __init__(self, directory: Optional[str] = None) -> None:
+        """
+        Initializes the worker. The process is started on first use.
+        """
+        self.directory = directory
+        self.__process = None
+        self.__requests = _context.Queue()
+        self.__results = _context.Queue()
+        self.__generation = _context.Value("i", 0)
+        self.__pending: Optional[int] = None
+
+    def __start(self) -> None:
+        self.__process = _context.Process(
+            target=_serve,
+            args=(self.__requests, self.__results, self.__generation, self.directory),
+            daemon=True,
+        )
+        self.__process.start()
+
+    def submit(self, state: bytes) -> int:
+        """
+        Requests a solution of a facelet state.
+
+        Args:
+            state (bytes): The 54 facelet colors.
+        Returns:
+            int: Id of the request, matched by the result of poll().
+        """
+        if self.__process is None:
+            self.__start()
+        self.cancel()
+        self.__pending = self.__generation.value
+        self.__requests.put((self.__pending, state))
+        return self.__pending
+
+    def cancel(self) -> None:
+        """
+        Cancels the pending request, if any. A search running for it is
+        abandoned, and its result is never returned by poll().
+        """
+        with self.__generation.get_lock():
+            self.__generation.value += 1
+        self.__pending = None
+
+    def pending(self) -> bool:
+        """
+        Checks whether a request is still waiting for its result.
+        """
+        return self.__pending is not None
+
+    def poll(self) -> Optional[Tuple[int, bytes, Optional[Solution]]]:
+        """
+        Gets the result of the pending request without blocking.
+
+        Returns:
+            Optional[Tuple[int, bytes, Optional[Solution]]]: Request id, state and
+                solution (None if unsolvable), or None while no result is ready.
+        """
+        while self.__pending is not None:
+            try:
+                gen, state, solution = self.__results.get_nowait()
+            except queue.Empty:
+                return None
+            if gen == self.__pending:
+                self.__pending = None
+                return gen, state, solution
+        return None
+
+    def close(self) -> None:
+        """
+        Stops the worker process.
+        """
+        if self.__process is not None:
+            self.__process.terminate()
+            self.__process.join()
+            self.__process = None
+
+
+class SolutionCache(object):
+    """
+    Least recently used solutions of cube states, keyed by packed state, so
+    states seen again after an undo or a redo are answered at once.
+
+    Attributes:
+        size (int): Most solutions kept.
+    """
+
+    size: int
+
+    def __init__(self, size: int = CACHE_SIZE) -> None:
+        """
+        Initializes an empty cache.
+
+        Args:
+            size (int): Most solutions kept.
+        Raises:
+            ValueError: If the size is not positive.
+        """
+        if size < 1:
+            raise ValueError(f"Invalid cache size: {size}")
+        self.size = size
+        self.__solutions: "OrderedDict[int, Solution]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.__solutions)
+
+    def get(self, key: int) -> Optional[Solution]:
+        """
+        Gets the solution of a state, marking it as recently used.
+
+        Args:
+            key (int): The packed state.
+        Returns:
+            Optional[Solution]: The solution, or None if not cached.
+        """
+        solution = self.__solutions.get(key)
+        if solution is not None:
+            self.__solutions.move_to_end(key)
+        return solution
+
+    def put(self, key: int, solution: Solution) -> None:
+        """
+        Stores the solution of a state, evicting the least recently used
+        solution when full.
+
+        Args:
+            key (int): The packed state.
+            solution (Solution): The solution.
+        """
+        self.__solutions[key] = solution
+        self.__solutions.move_to_end(key)
+        if len(self.__solutions) > self.size:
+            self.__solutions.popitem(last=False)
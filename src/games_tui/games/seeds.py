@@ -0,0 +1,106 @@
+import hashlib
+import random
+import secrets
+import threading
+
+from typing import Dict, Optional
+
+
+# Seeds are unsigned 64 bit integers. Every stream is a random.Random of its
+# own, seeded with a hash of its parent seed and its key, so streams never
+# share state, and each one is reproduced from its seed alone.
+
+SEED_BITS = 64
+
+
+def derive(seed: int, *keys: object) -> int:
+    """
+    Derives the seed of an independent stream from a parent seed.
+
+    Args:
+        seed (int): The parent seed.
+        *keys (object): What the stream is for, e.g. a game name and a deal number.
+    Returns:
+        int: The derived seed.
+    """
+    text = ":".join(str(k) for k in (seed,) + keys).encode()
+    digest = hashlib.blake2b(text, digest_size=SEED_BITS // 8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def stream(seed: int) -> random.Random:
+    """
+    Creates the random number stream of a seed.
+
+    Args:
+        seed (int): The seed, e.g. a recorded game seed or a deal number.
+    Returns:
+        random.Random: The stream.
+    """
+    return random.Random(seed)
+
+
+class RandomService(object):
+    """
+    Hands out the seeds of the games and worker processes, all derived from
+    one root seed. A game records its seed, so its deal or scramble can be
+    played again with stream(seed); fixing the root seed reproduces every
+    game and worker of a session.
+
+    Attributes:
+        seed (int): The root seed.
+        fixed (bool): Whether the root seed was given rather than drawn at random.
+    """
+
+    seed: int
+    fixed: bool
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        """
+        Initializes the service.
+
+        Args:
+            seed (Optional[int]): The root seed. Default: a fresh random one.
+        """
+        self.seed = seed if seed is not None else secrets.randbits(SEED_BITS)
+        self.fixed = seed is not None
+        self.__counts: Dict[str, int] = {}
+        self.__lock = threading.Lock()
+
+    def __next(self, key: str) -> int:
+        with self.__lock:
+            n = self.__counts.get(key, 0)
+            self.__counts[key] = n + 1
+        return derive(self.seed, key, n)
+
+    def game_seed(self, game: str) -> int:
+        """
+        Gets the seed of the next game of a kind.
+
+        Args:
+            game (str): The kind of game, e.g. "solitaire".
+        Returns:
+            int: The seed, a new one on every call.
+        """
+        return self.__next(game)
+
+    def worker_seed(self) -> int:
+        """
+        Gets the seed of the next worker process, which derives the streams
+        it needs from it, independently of every other worker.
+        """
+        return self.__next("worker")
+
+
+SERVICE = RandomService()
+
+
+def reseed(seed: Optional[int] = None) -> None:
+    """
+    Restarts the shared service from a root seed.
+
+    Args:
+        seed (Optional[int]): The root seed. Default: a fresh random one.
+    """
+    global SERVICE
+    SERVICE = RandomService(seed)
@@ -2,7 +2,8 @@ import time
 
 from collections import deque 
 from typing import Deque, List, Optional
-from games.cards import Suit, Rank, Card, Deck
+from games import seeds
+from games.cards import COLORS, ORDERS, Suit, Rank, Card, Deck
 
 
 class SolitaireGame(object):
@@ -14,6 +15,9 @@ class SolitaireGame(object):
         waste_pile (Deque[Card]): The wastepile of the game.
         foundation_piles (List[Deque[Card]]): ...
         columns (List[Deck[Card]]): ...
+        hidden (List[int]): Number of face down cards at the bottom of each column.
+            The stockpile faces down, and the other piles face up.
+        seed (int): Seed of the deal; the same seed deals the same game.
     """
     __time: float
     num_moves: int
@@ -21,24 +25,31 @@ class SolitaireGame(object):
     waste_pile: Deque[Card]
     foundation_piles: List[Deque[Card]]
     columns: List[Deque[Card]]
+    hidden: List[int]
+    seed: int
 
-    def __init__(self) -> None:
+    def __init__(self, seed: Optional[int] = None) -> None:
         """
         Initializes a new solitaire game.
+
+        Args:
+            seed (Optional[int]): Seed of the deal, e.g. a deal number. Default:
+                the next solitaire seed of the random service.
         """
         self.__time = time.time()
         self.num_moves = 0
-        self.stockpile = Deck(shuffle=True)                  # start with shuffled deck
+        self.seed = seed if seed is not None else seeds.SERVICE.game_seed("solitaire")
+        self.stockpile = Deck(shuffle=True, rng=seeds.stream(self.seed))  # start with shuffled deck
         self.waste_pile = deque()                            # initialize empty wastepile
         self.foundation_piles = [deque() for _ in range(4)]  # initialize empty foundation piles
         self.columns = [deque() for _ in range(7)]           # initialize empty columns
+        self.hidden = list(range(7))                         # all but the top cards face down
         
         # deal cards to columns:
 
         for i in range(7):                                              
             for _ in range(i + 1):
                 self.columns[i].append(self.stockpile.draw_from_top())  
-            self.columns[i][-1].flip()                                  # flip top cards
 
 
     def is_solved(self) -> bool:
@@ -62,8 +73,7 @@ class SolitaireGame(object):
         """
         if not self.stockpile.is_empty():           # check stockpile
             card = self.stockpile.draw_from_top()   # draw card
-            card.flip()                             # card face up
-            self.waste_pile.append(card)            # add to wastepile
+            self.waste_pile.append(card)            # add to wastepile, face up
             self.num_moves += 1
             return True
         return False                                # stockpile is empty
@@ -75,8 +85,7 @@ class SolitaireGame(object):
         """
         while self.waste_pile:                      # while there is cardz
             card = self.waste_pile.pop()            # pop wastepile
-            card.flip()                             # do a kickflip!
-            self.stockpile.push_to_top(card)        # push to stockpile
+            self.stockpile.push_to_top(card)        # push to stockpile, face down
 
 
     def push_to_foundation_pile(self, card: Card) -> bool:
@@ -99,10 +108,21 @@ class SolitaireGame(object):
 
 
     def flip_last(self, clm) -> None:
-        if self.columns[clm]:
-            last = self.peek_column(clm)
-            if not last.face_up():
-                last.flip()
+        if self.columns[clm] and self.hidden[clm] == len(self.columns[clm]):
+            self.hidden[clm] -= 1
+
+
+    def is_face_up(self, clm: int, idx: int) -> bool:
+        """
+        Checks whether the card at an index of a column faces up.
+
+        Args:
+            clm (int): Index of the column.
+            idx (int): Index of the card in the column, from the bottom.
+        Returns:
+            bool: True if the card faces up, False otherwise.
+        """
+        return idx >= self.hidden[clm]
 
 
     def add_to_column(self, clm: int, cards: Deque[Card]) -> bool:
@@ -201,8 +221,7 @@ class SolitaireGame(object):
 
     def is_opposite_color(self, card_a: Card, card_b: Card) -> bool:
         """
-        Compares numeric representations of card suits, and returns the
-        negation of cards matching in color or suit. 
+        Compares the colors of the card suits, looked up by card code.
 
         Args:
             card_a (Card): ...
@@ -210,15 +229,13 @@ class SolitaireGame(object):
         Returns:
             bool: True if the cards have opposite colors, False otherwise.
         """
-        a = card_a.suit().value 
-        b = card_b.suit().value
-
-        return not ((a % 2 == 0 and b % 2 == 0) or a == b) 
+        return COLORS[card_a] != COLORS[card_b]
 
 
     def is_next(self, card_a: Card, card_b: Card, n: int) -> bool:
         """
-        Checks if the rank of card A is sequentially next to card B.
+        Checks if the rank of card A is sequentially next to card B, aces
+        low, looked up by card code.
 
         Args:
             card_a (Card): Card numero uno.
@@ -226,9 +243,7 @@ class SolitaireGame(object):
         Returns:
             bool: True if card_a is sequentially next, else false.
         """
-        if card_b.rank() == Rank.ACE:
-            return card_a.rank() == Rank.TWO
-        return card_a.rank().value == card_b.rank().value + n
+        return ORDERS[card_a] == ORDERS[card_b] + n
 
 
     def set_time(self, time: float) -> None:
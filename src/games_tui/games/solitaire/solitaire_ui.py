@@ -156,6 +156,7 @@ class SolitaireUI(Window):
                 card=self.game.stockpile.peek_top(),
                 is_hover=is_hover,
                 is_top=True,
+                face_up=False,
             )
         else:
             self.render_frame(self.sy_a, sx, is_hover=is_hover)
@@ -205,8 +206,9 @@ class SolitaireUI(Window):
                     card=cards[i],
                     is_top=(i == len(self.game.columns[idx]) - 1),
                     is_hover=selected,
+                    face_up=self.game.is_face_up(idx, i),
                 )
-                sy += 2 if cards[i].face_up() else 1
+                sy += 2 if self.game.is_face_up(idx, i) else 1
                 sy += 1 if selected else 0
 
 
@@ -233,8 +235,9 @@ class SolitaireUI(Window):
                     card=cards[i],
                     is_top=(i == len(self.game.columns[idx]) - 1),
                     is_hover=False,
+                    face_up=self.game.is_face_up(idx, i),
                 )
-                sy += 2 if cards[i].face_up() else 1
+                sy += 2 if self.game.is_face_up(idx, i) else 1
 
         # render the selected cards:
 
@@ -278,15 +281,16 @@ class SolitaireUI(Window):
         is_top: Optional[bool] = True,
         card: Optional[Card] = None,
         is_hover: Optional[bool] = False,
+        face_up: Optional[bool] = True,
     ) -> None:
         """ 
-        Renders a card frame. 
+        Renders a card frame, showing the card if it faces up, else its back.
         """
 
         if sy + 4 > self.height - 8:
             return
         c = 10 if is_hover else 14
-        sy += 1 if is_hover and card and self.r == 1 else 0
+        sy += 1 if is_hover and card is not None and self.r == 1 else 0
         self.win.attron(curses.color_pair(c))
         self.win.addstr(sy, sx, "╭───────╮")
         self.win.addstr(sy + 1, sx, "│       │")
@@ -296,8 +300,8 @@ class SolitaireUI(Window):
             for i in range(5):
                 self.win.addstr(sy + i, sx, "│       │")
             self.win.addstr(sy + 5, sx, "╰───────╯")
-        if card:
-            if card.face_up():
+        if card is not None:
+            if face_up:
                 color = card.color()
                 rank = card.rank()
                 center_piece = (
@@ -390,7 +394,7 @@ class SolitaireUI(Window):
         clm_size = self.game.column_size(self.c)
         if clm_size > 1:
             card = self.game.column_card_at_index(self.c, self.z + i)
-            if card and card.face_up():
+            if card is not None and self.game.is_face_up(self.c, self.z + i):
                 self.z = self.z + i
                 self.clear_column(self.c)
                 self.render_column(self.c)
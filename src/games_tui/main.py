@@ -1,10 +1,10 @@
 
 import curses
+import multiprocessing
 import sys
 import signal
-from config.settings import settings
-from ui.main_menu import MainMenu
-from config import size
+
+import cli
 
 
 def signal_handler(sig, frame):
@@ -14,11 +14,16 @@ def signal_handler(sig, frame):
 def main(stdscr):
     """
     Main entry point for the application. Sets up color pairs for curses,
-    and initializes the main menu loop.
+    and initializes the main menu loop. The settings and UI are imported
+    here, so headless commands run without them.
 
     Args:
         stdscr: curses standard screen.
     """
+    from config import size
+    from config.settings import settings
+    from ui.main_menu import MainMenu
+
     try:
         # Set window title
         sys.stdout.write("\33]0;Games-TUI\a")
@@ -44,8 +49,15 @@ def main(stdscr):
         curses.curs_set(1)
 
 
-signal.signal(signal.SIGINT, signal_handler)
+if __name__ == "__main__":
+    multiprocessing.freeze_support()     # worker processes of the frozen binary
+
+    code = cli.run(sys.argv[1:])
+    if code is not None:
+        sys.exit(code)
+
+    signal.signal(signal.SIGINT, signal_handler)
 
-# Start!
-curses.wrapper(main)
+    # Start!
+    curses.wrapper(main)
 
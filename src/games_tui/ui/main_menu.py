@@ -2,6 +2,8 @@ import curses
 from typing import List, Tuple
 
 from config import size
+from games.rubiks.nxn_ui import NxNUI
+from games.rubiks.pocket_ui import PocketUI
 from games.rubiks.rubiks_ui import RubiksUI
 from games.solitaire.solitaire_ui import SolitaireUI
 from ui.settings import SettingsUI
@@ -195,5 +197,11 @@ class MainMenu(Window):
                             case 0:
                                 RubiksUI(self.stdscr, size.GAME_HEIGHT, size.GAME_WIDHT)
                                 self.make_win()
+                            case 2:
+                                PocketUI(self.stdscr, size.GAME_HEIGHT, size.GAME_WIDHT)
+                                self.make_win()
+                            case 3:
+                                NxNUI(self.stdscr, size.GAME_HEIGHT, size.GAME_WIDHT)
+                                self.make_win()
                     
             self.render()
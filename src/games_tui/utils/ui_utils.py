@@ -22,6 +22,8 @@ MENU_OPTIONS: Dict[int, Tuple[str, str]] = {
     2: [
         ("", "Start Game        "),
         ("", "Highscore         "),
+        ("", "2x2x2 Game        "),
+        ("", "NxN Game          "),
     ],
     3: [
         ("", "Color scheme"),
@@ -61,3 +63,22 @@ def format_time(start_time) -> str:
     minutes = (elapsed_seconds % 3600) // 60
     seconds = elapsed_seconds % 60
     return f"{hours:02}:{minutes:02}:{seconds:02}"
+
+
+def format_millis(millis: Optional[float]) -> str:
+    """
+    Formats a duration in milliseconds into MM:SS.hh, or HH:MM:SS from an
+    hour on, keeping the width of 8 characters.
+
+    Args:
+        millis (Optional[float]): The duration, None if there is none yet.
+    Returns:
+        str: The formatted duration, dashes if there is none.
+    """
+    if millis is None:
+        return "--:--.--"
+    centis = int(millis) // 10
+    if centis >= 360000:
+        seconds = centis // 100
+        return f"{seconds // 3600:02}:{seconds // 60 % 60:02}:{seconds % 60:02}"
+    return f"{centis // 6000:02}:{centis // 100 % 60:02}.{centis % 100:02}"
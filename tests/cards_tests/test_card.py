@@ -0,0 +1,56 @@
+import copy
+import pickle
+import unittest
+
+from src.games_tui.games.cards import CARDS, COLORS, JOKER, ORDERS, Card, Deck, Rank, Suit
+
+
+class TestCard(unittest.TestCase):
+    """
+    Test class for Card.
+    """
+
+    def test_flyweight(self):
+        """
+        Tests that every rank and suit maps to one shared card, coded as a
+        small integer.
+        """
+        seen = set()
+        for suit in Suit:
+            for rank in Rank:
+                if (rank == Rank.JOKER) != (suit == Suit.JOKER):
+                    with self.assertRaises(ValueError):
+                        Card(rank, suit)
+                    continue
+                card = Card(rank, suit)
+                self.assertIs(card, CARDS[card])
+                self.assertEqual((card.rank(), card.suit()), (rank, suit))
+                seen.add(card)
+        self.assertEqual(seen, set(range(JOKER + 1)))
+        self.assertTrue(all(a is b for a, b in zip(Deck(), Deck())))
+
+
+    def test_tables(self):
+        """
+        Tests the color and aces low rank order lookups.
+        """
+        ace, two = Card(Rank.ACE, Suit.HEARTS), Card(Rank.TWO, Suit.SPADES)
+        self.assertEqual(ORDERS[two], ORDERS[ace] + 1)
+        self.assertNotEqual(COLORS[ace], COLORS[two])
+        self.assertEqual(COLORS[two], COLORS[Card(Rank.KING, Suit.CLUBS)])
+        self.assertEqual(ace.color(), COLORS[Card(Rank.TEN, Suit.DIAMONDS)])
+        self.assertLess(two, ace)
+
+
+    def test_copy(self):
+        """
+        Tests that copies and pickles of a card are the shared card.
+        """
+        for card in CARDS:
+            self.assertIs(copy.copy(card), card)
+            self.assertIs(copy.deepcopy(card), card)
+            self.assertIs(pickle.loads(pickle.dumps(card)), card)
+
+
+if __name__ == "__main__":
+    unittest.main()
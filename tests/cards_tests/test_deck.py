@@ -1,3 +1,4 @@
+import random
 import unittest
 import copy
 
@@ -64,5 +65,31 @@ class TestDeck(unittest.TestCase):
         self.assertNotEqual(init, list(self.deck), "Deck should not equal to its initial state.")
 
 
+    def test_shuffle_rng(self):
+        """
+        Tests that shuffles with equally seeded generators agree, and keep
+        the cards of the deck.
+        """
+        a = Deck(shuffle=True, rng=random.Random(7))
+        b = Deck(shuffle=True, rng=random.Random(7))
+        self.assertEqual(list(a), list(b))
+        self.assertEqual(sorted(map(int, a)), list(map(int, self.deck)))
+
+
+    def test_shoe(self):
+        """
+        Tests that a shoe holds every card once per deck.
+        """
+        shoe = Deck(jokers=1, decks=6, shuffle=True)
+        self.assertEqual(shoe.size(), 6 * 53)
+        counts = {}
+        while not shoe.is_empty():
+            card = shoe.draw_from_top()
+            counts[card] = counts.get(card, 0) + 1
+        self.assertEqual(set(counts.values()), {6})
+        with self.assertRaises(ValueError):
+            Deck(decks=0)
+
+
 if __name__ == "__main__":
     unittest.main()
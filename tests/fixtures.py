@@ -0,0 +1,19 @@
+import atexit
+import tempfile
+
+from src.games_tui.games.rubiks.tables import Tables
+
+
+_tables = []
+
+
+def solver_tables() -> Tables:
+    """
+    Generates the solver tables once per test run, in a temporary directory
+    removed at exit, and shares them between the test modules.
+    """
+    if not _tables:
+        tmp = tempfile.TemporaryDirectory()
+        atexit.register(tmp.cleanup)
+        _tables.append(Tables(tmp.name))
+    return _tables[0]
@@ -0,0 +1,47 @@
+import unittest
+
+import numpy as np
+
+from src.games_tui.games.rubiks.batch import BatchCube, NO_MOVE
+from src.games_tui.games.rubiks.rubiks import RubiksCube
+
+
+class TestBatchCube(unittest.TestCase):
+    def setUp(self):
+        """
+        Initialize a batch of solved cubes before tests.
+        """
+        self.batch = BatchCube(100)
+        self.rng = np.random.default_rng(10)
+
+    def test_matches_single_cubes(self):
+        """
+        Test that per-cube moves give the same states as turning every
+        cube on its own, and that conversions round trip.
+        """
+        moves = self.batch.scramble(20, self.rng)
+        self.assertFalse((moves[:, 1:] // 3 == moves[:, :-1] // 3).any())
+        cubes = self.batch.to_cubes()
+        for cube, sequence in zip(cubes, moves):
+            single = RubiksCube()
+            for move in sequence:
+                single.apply(int(move))
+            self.assertEqual(cube, single)
+        self.assertTrue((BatchCube.from_cubes(cubes).states == self.batch.states).all())
+
+    def test_is_solved(self):
+        """
+        Test the solved check, and that NO_MOVE leaves cubes untouched.
+        """
+        self.assertTrue(self.batch.is_solved().all())
+        moves = np.full(len(self.batch), NO_MOVE)
+        moves[::2] = 4
+        self.batch.apply(moves)
+        np.testing.assert_array_equal(self.batch.is_solved(), moves == NO_MOVE)
+        self.batch.apply_sequence([4, 4, 4])
+        self.assertTrue(self.batch.is_solved()[::2].all())
+        self.assertFalse(self.batch.is_solved()[1::2].any())
+
+
+if __name__ == "__main__":
+    unittest.main()
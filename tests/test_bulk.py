@@ -0,0 +1,39 @@
+import unittest
+
+from src.games_tui.games.rubiks import notation
+from src.games_tui.games.rubiks.bulk import solve_all
+from src.games_tui.games.rubiks.rubiks import RubiksCube
+from tests.fixtures import solver_tables
+
+
+class TestBulk(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Share the solver tables of the test run.
+        """
+        cls.tables = solver_tables()
+        cls.directory = cls.tables.directory
+
+    def test_solve_all(self):
+        """
+        Test that bulk solving keeps input order with a small in-flight
+        bound, and that every solution solves its scramble.
+        """
+        scrambles = ["R U R' U'", "", "F2 D L'", "Q", "B U2 R"] * 3
+        results = list(
+            solve_all(scrambles, processes=2, in_flight=2, directory=self.directory)
+        )
+        self.assertEqual([r["index"] for r in results], [i for i, s in enumerate(scrambles) if s])
+        for result in results:
+            if result["scramble"] == "Q":
+                self.assertIn("error", result)
+                continue
+            cube = RubiksCube()
+            cube.apply_algorithm(result["scramble"] + " " + result["solution"])
+            self.assertTrue(cube.is_valid())
+            self.assertEqual(result["length"], len(notation.parse(result["solution"])))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+import contextlib
+import io
+import unittest
+
+from src.games_tui import cli
+
+
+class TestCli(unittest.TestCase):
+    def test_processes(self):
+        """
+        Test that --processes is accepted before or after a command, and
+        that counts below 1 are usage errors.
+        """
+        self.assertEqual(cli.parse_args(["--processes", "3", "verify"]).processes, 3)
+        self.assertEqual(cli.parse_args(["--processes", "3", "solve", "--processes", "2"]).processes, 2)
+        self.assertIsNone(cli.parse_args(["solve"]).processes)
+        for argv in (["--processes", "0"], ["solve", "--processes", "-1"], ["verify", "--chunk-size", "0"]):
+            with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+                cli.parse_args(argv)
+
+    def test_solve_limits(self):
+        """
+        Test that solve takes a positive length and a non-negative timeout.
+        """
+        args = cli.parse_args(["solve", "--max-length", "20", "--timeout", "0"])
+        self.assertEqual((args.max_length, args.timeout), (20, 0.0))
+        for argv in (["solve", "--max-length", "-3"], ["solve", "--timeout", "-1"], ["solve", "--timeout", "nan"]):
+            with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+                cli.parse_args(argv)
@@ -0,0 +1,75 @@
+import unittest
+import random
+
+from src.games_tui.games.rubiks import coords
+from src.games_tui.games.rubiks.cubie import CubieCube
+from src.games_tui.games.rubiks.rubiks import RubiksCube
+
+
+class TestCubieCube(unittest.TestCase):
+    def setUp(self):
+        """
+        Initialize a Rubik's cube and its cubie equivalent before tests.
+        """
+        self.cube = RubiksCube()
+        self.cc = CubieCube()
+
+    def test_conversion(self):
+        """
+        Test that facelet and cubie cubes stay equal under random moves,
+        and convert back and forth without loss.
+        """
+        rng = random.Random(1)
+        for _ in range(100):
+            move = rng.randrange(18)
+            self.cube.apply(move)
+            self.cc.move(move)
+            self.assertEqual(self.cube.to_cubie(), self.cc)
+            self.assertEqual(RubiksCube.from_cubie(self.cc).facelets(), self.cube.facelets())
+            self.assertTrue(self.cc.is_solvable())
+
+    def test_inverse(self):
+        """
+        Test that a cube multiplied by its inverse is solved.
+        """
+        for move in [3, 9, 14, 16, 0, 7]:
+            self.cc.move(move)
+        self.cc.multiply(self.cc.inverse())
+        self.assertEqual(self.cc, CubieCube())
+
+    def test_coordinates(self):
+        """
+        Test that coordinates survive a round trip through the cube.
+        """
+        for i in [0, 1, 23, 24, 4711, coords.N_SLICE_SORTED - 1]:
+            self.cc.set_slice_sorted(i)
+            self.assertEqual(self.cc.get_slice_sorted(), i)
+        for i in [0, 1, 1000, coords.N_CORNERS - 1]:
+            self.cc.set_corners(i)
+            self.assertEqual(self.cc.get_corners(), i)
+            self.cc.set_ud_edges(i)
+            self.assertEqual(self.cc.get_ud_edges(), i)
+        for i in [0, 5, coords.N_TWIST - 1]:
+            self.cc.set_twist(i)
+            self.assertEqual(self.cc.get_twist(), i)
+        for i in [0, 5, coords.N_FLIP - 1]:
+            self.cc.set_flip(i)
+            self.assertEqual(self.cc.get_flip(), i)
+
+    def test_move_tables(self):
+        """
+        Test that coordinate move tables agree with moving the cube.
+        """
+        twist = coords.twist_move_table()
+        flip = coords.flip_move_table()
+        rng = random.Random(2)
+        for _ in range(100):
+            move = rng.randrange(18)
+            t, f = self.cc.get_twist(), self.cc.get_flip()
+            self.cc.move(move)
+            self.assertEqual(twist[18 * t + move], self.cc.get_twist())
+            self.assertEqual(flip[18 * f + move], self.cc.get_flip())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import random
+import unittest
+
+from src.games_tui.games.rubiks import facelets, lastlayer, notation
+
+
+class TestLastLayer(unittest.TestCase):
+    def test_index_covers_every_case(self):
+        """
+        Test that every unsolved orientation and permutation of the last
+        layer, from any side, is indexed.
+        """
+        self.assertEqual([name for name, _ in lastlayer.OLL_CASES], [str(n) for n in range(1, 58)])
+        self.assertEqual(len(lastlayer.OLL_INDEX), 215)
+        self.assertEqual(len(lastlayer.PLL_INDEX), 288)
+
+    def test_fewest_moves(self):
+        """
+        Test that the index keeps the algorithm with the fewest moves, not
+        the shortest text.
+        """
+        index = lastlayer._build_index([("many", "R U F"), ("few", "R2' U2'")], lambda state: 0, False)
+        self.assertEqual(index[0], ("few", "R2' U2'"))
+
+    def test_cases_are_recognized_and_solved(self):
+        """
+        Test that setting up each case is recognized as that case, and that
+        its algorithm solves the cube.
+        """
+        for stage, cases in (("OLL", lastlayer.OLL_CASES), ("PLL", lastlayer.PLL_CASES)):
+            for name, algorithm in cases:
+                if not algorithm:
+                    continue
+                state = notation.apply(facelets.SOLVED, notation.invert(algorithm))
+                case = lastlayer.recognize(state)
+                self.assertEqual((case.stage, case.name), (stage, name))
+                state = notation.apply(state, case.algorithm)
+                self.assertEqual(lastlayer.recognize(state).stage, "Solved")
+
+    def test_first_two_layers(self):
+        """
+        Test that an unsolved first two layers are reported by progress.
+        """
+        state = notation.apply(facelets.SOLVED, "R U R'")
+        case = lastlayer.recognize(state)
+        self.assertEqual((case.stage, case.name), ("F2L", "3/4 pairs"))
+        case = lastlayer.recognize(notation.apply(facelets.SOLVED, "F"))
+        self.assertEqual((case.stage, case.name), ("F2L", "Cross"))
+
+    def test_drill(self):
+        """
+        Test that a drill scramble sets up one of the requested cases.
+        """
+        rng = random.Random(7)
+        for _ in range(10):
+            state = notation.apply(facelets.SOLVED, lastlayer.drill(["T", "Y", "27"], rng))
+            self.assertIn(lastlayer.recognize(state).name, ("T", "Y", "27"))
+        with self.assertRaises(ValueError):
+            lastlayer.drill(["Nope"])
@@ -0,0 +1,68 @@
+import unittest
+
+from src.games_tui.games.rubiks import facelets, notation
+from src.games_tui.games.rubiks.rubiks import RubiksCube, RubiksGame
+
+
+T_PERM = "R U R' U' R' F R2 U' R' U' R U R' F'"
+
+
+class TestNotation(unittest.TestCase):
+    def test_parse(self):
+        """
+        Test that notation maps onto face * 3 + direction, and back.
+        """
+        self.assertEqual(notation.parse("U D' L2 R F2' B"), (0, 4, 8, 9, 14, 15))
+        self.assertEqual(notation.format_moves(notation.parse(T_PERM)), T_PERM)
+        with self.assertRaises(ValueError):
+            notation.parse("R X")
+        with self.assertRaises(ValueError):
+            notation.parse("R3")
+
+    def test_wide_slice_rotation(self):
+        """
+        Test that wide moves, slice moves and rotations are parsed into the
+        face turns they amount to, turning the right faces after rotations.
+        """
+        apply = lambda text: notation.apply(facelets.SOLVED, text)
+        self.assertEqual(apply("r"), apply("R M'"))
+        self.assertEqual(apply("u"), apply("U E'"))
+        self.assertEqual(apply("f"), apply("F S"))
+        self.assertEqual(apply("M L R'"), facelets.SOLVED)
+        self.assertEqual(apply("x U x'"), apply("F"))
+        self.assertEqual(apply("y R U R' y'"), apply("B U B'"))
+        self.assertEqual(apply("r U R' U' r' F R F'"), apply("L F R' F' L' F R F'"))
+        self.assertEqual(notation.parse("x y2 z'"), ())
+
+    def test_compiled_matches_moves(self):
+        """
+        Test that the compiled algorithm equals turning move by move, and
+        that the T permutation has order 2.
+        """
+        state = facelets.SOLVED
+        for move in notation.parse(T_PERM):
+            state = facelets.apply(state, move)
+        self.assertEqual(notation.apply(facelets.SOLVED, T_PERM), state)
+        self.assertNotEqual(state, facelets.SOLVED)
+        self.assertEqual(notation.apply(state, T_PERM), facelets.SOLVED)
+
+    def test_game_play(self):
+        """
+        Test that a played algorithm is logged move by move.
+        """
+        game = RubiksGame()
+        game.history.interval = 4
+        self.assertFalse(game.play(T_PERM))
+        self.assertEqual(game.num_moves, 14)
+        game.seek(9)
+        cube = RubiksCube()
+        cube.apply_algorithm(" ".join(T_PERM.split()[:9]))
+        self.assertEqual(game.cube, cube)
+        while game.redo_move():
+            pass
+        self.assertFalse(game.cube.is_valid())
+        self.assertTrue(game.play(T_PERM))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import random
+import unittest
+
+import numpy as np
+
+from src.games_tui.games.rubiks import facelets, nxn
+from src.games_tui.games.rubiks.nxn import NxNCube, NxNGame
+
+
+class TestNxN(unittest.TestCase):
+    def test_outer_turns_match_rubiks_cube(self):
+        """
+        Test that on a 3x3x3, outer layer turns move the stickers like the
+        Rubik's cube moves.
+        """
+        for move in range(len(facelets.MOVES)):
+            cube = NxNCube.from_facelets(3, bytes(range(facelets.NUM_FACELETS)))
+            cube.apply(move)
+            self.assertEqual(tuple(cube.faces.ravel()), facelets.MOVES[move])
+
+    def test_layers(self):
+        """
+        Test that the deepest layer is the opposite face turned the other
+        way, and that four quarter turns of any layer restore the cube.
+        """
+        for size in range(nxn.MIN_SIZE, nxn.MAX_SIZE + 1):
+            stickers = np.arange(6 * size * size, dtype=np.uint8).reshape(6, size, size)
+            for face in range(facelets.NUM_FACES):
+                a, b = NxNCube(size), NxNCube(size)
+                a.faces[...] = b.faces[...] = stickers
+                a.turn(face, size - 1, facelets.CLOCKWISE)
+                b.turn(nxn.OPPOSITE[face], 0, facelets.COUNTER_CLOCKWISE)
+                self.assertTrue((a.faces == b.faces).all())
+                for layer in range(size):
+                    cube = NxNCube(size)
+                    for _ in range(4):
+                        cube.turn(face, layer, facelets.CLOCKWISE)
+                    self.assertTrue(cube.is_valid())
+
+    def test_notation(self):
+        """
+        Test that inner layers are written with their depth, and read back.
+        """
+        self.assertEqual(nxn.parse("R 2R' 3U2", 5), (9, 28, 38))
+        self.assertEqual(nxn.format_moves((9, 28, 38)), "R 2R' 3U2")
+        with self.assertRaises(ValueError):
+            nxn.parse("4R", 3)
+
+    def test_view(self):
+        """
+        Test that the view is read-only and follows the turns of the cube,
+        while a snapshot does not.
+        """
+        cube = NxNCube(4)
+        view, snapshot = cube.view(), cube.snapshot()
+        with self.assertRaises(ValueError):
+            view[0, 0, 0] = 5
+        cube.turn(0, 1, 0)
+        self.assertEqual(view.tobytes(), cube.facelets())
+        self.assertNotEqual(snapshot, cube.facelets())
+
+    def test_game_undo(self):
+        """
+        Test that undoing every move of a scrambled 7x7x7 solves it.
+        """
+        game = NxNGame(7)
+        scramble = nxn.random_scramble(7, nxn.scramble_length(7), random.Random(4))
+        self.assertFalse(game.play(nxn.format_moves(scramble)))
+        while game.revert_move():
+            pass
+        self.assertTrue(game.cube.is_valid())
+        self.assertTrue(game.redo_move())
+        self.assertEqual(game.move_count(), 1)
+
+    def test_game_log(self):
+        """
+        Test that a game seeks any move of its log, across checkpoints, and
+        records its scramble and turns like the Rubik's cube game.
+        """
+        game = NxNGame(4)
+        game.scramble("R 2U", seed=7)
+        scrambled = game.cube.facelets()
+        moves = nxn.random_scramble(4, 150, random.Random(2))
+        game.play(nxn.format_moves(moves))
+        end = game.cube.facelets()
+        game.seek(0)
+        self.assertEqual(game.cube.facelets(), scrambled)
+        game.seek(150)
+        self.assertEqual(game.cube.facelets(), end)
+
+        solve = game.to_solve()
+        self.assertEqual(solve.scramble, bytes(nxn.parse("R 2U", 4)))
+        self.assertEqual(solve.moves, bytes(moves))
+        self.assertEqual(solve.seed, 7)
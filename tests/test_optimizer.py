@@ -0,0 +1,64 @@
+import unittest
+import random
+
+from src.games_tui.games.rubiks import facelets, notation
+from src.games_tui.games.rubiks.optimizer import MoveOptimizer, optimize
+from src.games_tui.games.rubiks.rubiks import RubiksGame
+
+
+class TestMoveOptimizer(unittest.TestCase):
+    def reduce(self, text):
+        return notation.format_moves(optimize(notation.parse(text)))
+
+    def test_reductions(self):
+        """
+        Test merging mod 4, cancelling, and ordering of opposite faces.
+        """
+        self.assertEqual(self.reduce("U U U"), "U'")
+        self.assertEqual(self.reduce("R R'"), "")
+        self.assertEqual(self.reduce("R U U2 U R'"), "")
+        self.assertEqual(self.reduce("D U D'"), "U")
+        self.assertEqual(self.reduce("R L R"), "L R2")
+        self.assertEqual(self.reduce("F B' F' B"), "")
+        self.assertEqual(self.reduce("U D F B'"), "U D F B'")
+
+    def test_same_state(self):
+        """
+        Test that reduced random sequences of all 18 moves reach the same
+        state, are in canonical form, and that a sequence followed by its
+        inverse cancels out.
+        """
+        rng = random.Random(13)
+        for _ in range(200):
+            moves = [rng.randrange(18) for _ in range(rng.randrange(1, 40))]
+            self.assertEqual(optimize(moves + [facelets.inverse_move(m) for m in reversed(moves)]), b"")
+            reduced = optimize(moves)
+            a, b = facelets.SOLVED, facelets.SOLVED
+            for m in moves:
+                a = facelets.apply(a, m)
+            for m in reduced:
+                b = facelets.apply(b, m)
+            self.assertEqual(a, b)
+            self.assertEqual(optimize(reduced), reduced)
+            for x, y in zip(reduced, reduced[1:]):
+                self.assertTrue(x // 3 < y // 3 or x // 6 != y // 6)
+
+    def test_game_count(self):
+        """
+        Test that undo cancels out in the move count of a game.
+        """
+        game = RubiksGame()
+        for face, direction in [(3, 0), (0, 0), (0, 0)]:
+            game.move(face, direction)
+            game.add(face, direction)
+        self.assertEqual(game.solution.moves(), bytes([9, 2]))
+        game.revert_move()
+        game.revert_move()
+        self.assertEqual(game.move_count(), 1)
+        self.assertEqual(game.num_moves, 5)
+        game.seek(3)
+        self.assertEqual(game.move_count(), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import collections
+import random
+import tempfile
+import unittest
+
+from src.games_tui.games.rubiks import pocket
+from src.games_tui.games.rubiks.pocket import PocketCube, PocketGame, PocketSolver
+
+
+# Number of pocket cube states at each distance from solved, in face turns.
+
+DISTANCES = [1, 9, 54, 321, 1847, 9992, 50136, 227536, 870072, 1887748, 623800, 2644]
+
+
+class TestPocket(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Generate the pocket cube tables once, in a temporary directory.
+        """
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.solver = PocketSolver(cls.tmp.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_distance_table(self):
+        """
+        Test that the search reaches every state, at its known distance.
+        """
+        counts = collections.Counter(bytes(self.solver.distances))
+        self.assertEqual([counts[d] for d in range(len(DISTANCES))], DISTANCES)
+        self.assertEqual(sum(DISTANCES), pocket.N_STATES)
+
+    def test_optimal_solutions(self):
+        """
+        Test that solutions of cubes turned on every face, however the cube
+        is held, are as long as the distance and solve the cube.
+        """
+        rng = random.Random(5)
+        for _ in range(50):
+            cube = PocketCube()
+            for _ in range(25):
+                cube.apply(rng.randrange(18))
+            moves = self.solver.solve(cube.facelets())
+            self.assertEqual(len(moves), self.solver.distance(cube.facelets()))
+            for move in moves:
+                cube.apply(move)
+            self.assertTrue(cube.is_valid())
+
+    def test_game(self):
+        """
+        Test that a whole cube rotation counts as solved, and that scrambles
+        lead to states as far from solved as their length.
+        """
+        game = PocketGame()
+        self.assertTrue(game.play("U D'"))
+        scramble = self.solver.scramble(random.Random(2))
+        game.scramble(scramble)
+        self.assertEqual(self.solver.distance(game.cube.facelets()), len(scramble))
+        game.play("R")
+        game.seek(0)
+        self.assertIsInstance(game.cube, PocketCube)
+        self.assertEqual(self.solver.distance(game.cube.facelets()), len(scramble))
@@ -0,0 +1,122 @@
+import unittest
+import os
+import tempfile
+
+from src.games_tui.games.rubiks import facelets, nxn, replay, verify
+from src.games_tui.games.rubiks.rubiks import RubiksCube, RubiksGame
+
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        """
+        Create a temporary solves file path before tests.
+        """
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "rubiks", "solves.bin")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """
+        Test that appended solves stream back in order, and that a truncated
+        last record is skipped.
+        """
+        solves = [
+            replay.Solve(1700000000000 + i, bytes([i, 4, 17]), bytes([3, 0, 1]), [0, 127, 128 ** 3 + i])
+            for i in range(3)
+        ]
+        for solve in solves:
+            replay.append_solve(solve, self.path)
+        self.assertEqual(list(replay.read_solves(self.path)), solves)
+
+        with open(self.path, "ab") as f:
+            f.write(replay.encode_solve(solves[0])[:-2])
+        self.assertEqual(list(replay.read_solves(self.path)), solves)
+
+    def test_seed_and_upgrade(self):
+        """
+        Test that seeds are recorded, and that a version 1 file is upgraded
+        before solves are appended to it.
+        """
+        old = replay.Solve(5, bytes([1]), bytes([2]), [300])
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "wb") as f:
+            record = replay.encode_solve(old)
+            f.write(replay.MAGIC + bytes([1]) + record[:1] + record[2:])
+        self.assertEqual(list(replay.read_solves(self.path)), [old])
+
+        new = old._replace(seed=2 ** 64 - 1)
+        replay.append_solve(new, self.path)
+        with open(self.path, "rb") as f:
+            self.assertEqual(f.read(len(replay.MAGIC) + 1)[-1], replay.VERSION)
+        self.assertEqual(list(replay.read_solves(self.path)), [old, new])
+
+    def test_game_recording(self):
+        """
+        Test that a recorded game replays from its scramble to the state
+        the game ended in.
+        """
+        game = RubiksGame()
+        game.scramble("R U F'")
+        game.play("F U' R'")
+        game.revert_move()
+        game.redo_move()
+        self.assertTrue(game.cube.is_valid())
+        replay.append_solve(game.to_solve(), self.path)
+
+        solve = next(replay.read_solves(self.path))
+        cube = RubiksCube()
+        for move in solve.scramble + solve.moves:
+            cube.apply(move)
+        self.assertTrue(cube.is_valid())
+        self.assertEqual(len(solve.moves), 5)
+        self.assertEqual(solve.moves[3], facelets.inverse_move(solve.moves[2]))
+
+    def test_verify(self):
+        """
+        Test that bulk verification over a process pool flags the solves
+        that do not end solved.
+        """
+        for i in range(10):
+            moves = bytes([9, 0]) if i in (2, 7) else bytes([10, 1])
+            replay.append_solve(replay.Solve(0, bytes([0, 9]), moves, [1, 1]), self.path)
+        reports = list(verify.verify_files([self.path], processes=2, chunk_size=3))
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(reports[0].total, 10)
+        self.assertEqual(reports[0].failed, [2, 7])
+        self.assertFalse(verify.is_solved_by(b"", bytes([18])))
+
+    def test_cube_size(self):
+        """
+        Test that the cube size is recorded, and that solves are verified on
+        a cube of that size: U D' solves the pocket cube, not the Rubik's cube.
+        """
+        replay.append_solve(replay.Solve(0, bytes([0]), bytes([4]), [1]), self.path, 2)
+        self.assertEqual(replay.cube_size(self.path), 2)
+        self.assertEqual(next(verify.verify_files([self.path], processes=1)).failed, [])
+        self.assertFalse(verify.is_solved_by(bytes([0]), bytes([4])))
+
+        path = os.path.join(self.tmp.name, "cube4_solves.bin")
+        inner = nxn.move_index(0, 1, 0)
+        replay.append_solve(replay.Solve(0, bytes([inner]), bytes([inner + 1]), [1]), path, 4)
+        replay.append_solve(replay.Solve(0, bytes([inner]), bytes([inner]), [1]), path, 4)
+        self.assertEqual(next(verify.verify_files([path], processes=1)).failed, [1])
+
+    def test_slice_solve(self):
+        """
+        Test that a 3x3 solve of the NxN mode with inner layer turns, which
+        move the centers, is verified as solved.
+        """
+        inner = nxn.move_index(3, 1, 0)
+        undo = facelets.inverse_move(inner)
+        path = os.path.join(self.tmp.name, "cube3_solves.bin")
+        replay.append_solve(replay.Solve(0, bytes([inner]), bytes([undo]), [1]), path, 3)
+        replay.append_solve(replay.Solve(0, bytes([inner, 9]), bytes([undo]), [1]), path, 3)
+        self.assertEqual(next(verify.verify_files([path], processes=1)).failed, [1])
+        self.assertTrue(verify.is_solved_by(bytes([inner]), bytes([undo]), 3))
+        self.assertFalse(verify.is_solved_by(bytes([inner]), bytes([inner]), 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,4 @@
 import unittest
-import copy
 import random
 from src.games_tui.games.rubiks.rubiks import RubiksCube, RubiksGame 
 
@@ -15,10 +14,77 @@ class TestRubiksCube(unittest.TestCase):
         """
         Test rotating the top face clockwise.
         """
-        initial_state = copy.deepcopy(self.cube.get())
+        initial_state = self.cube.snapshot()
         self.cube.rotate(5, 1)
-        self.assertNotEqual(initial_state, self.cube.get())
-        
+        self.assertNotEqual(initial_state, self.cube.snapshot())
+
+    def test_rotation_inverse(self):
+        """
+        Test that every face turn is undone by its counter rotation, and that
+        four quarter turns or two half turns restore the cube.
+        """
+        for face in range(6):
+            self.assertFalse(self.cube.rotate(face, 0))
+            self.assertTrue(self.cube.rotate(face, 1))
+            for _ in range(3):
+                self.assertFalse(self.cube.rotate(face, 0))
+            self.assertTrue(self.cube.rotate(face, 0))
+            self.assertFalse(self.cube.rotate(face, 2))
+            self.assertTrue(self.cube.rotate(face, 2))
+
+    def test_commutator_order(self):
+        """
+        Test that the commutator R U R' U' has order 6, as on a physical cube.
+        """
+        for i in range(6):
+            for face, direction in [(3, 0), (0, 0), (3, 1), (0, 1)]:
+                solved = self.cube.rotate(face, direction)
+            self.assertEqual(solved, i == 5)
+
+    def test_pack(self):
+        """
+        Test that packed states round trip, and that equal states are equal
+        and hash equally, independent of copies.
+        """
+        rng = random.Random(8)
+        for _ in range(20):
+            self.cube.apply(rng.randrange(18))
+            key = self.cube.pack()
+            self.assertLess(key, 1 << 144)
+            restored = RubiksCube.unpack(key)
+            self.assertEqual(restored, self.cube)
+            self.assertEqual(hash(restored), hash(self.cube))
+        copied = self.cube.copy()
+        copied.apply(0)
+        self.assertNotEqual(copied, self.cube)
+        self.assertEqual(len({self.cube, self.cube.copy(), RubiksCube()}), 2)
+
+    def test_get_layout(self):
+        """
+        Test that the nested list adapter is indexed by face, row and column.
+        """
+        self.cube.rotate(0, 0)
+        cube = self.cube.get()
+        self.assertEqual(len(cube), 6)
+        self.assertEqual(cube[2][0], [4, 4, 4])     # front row moved to the left face
+        self.assertEqual(cube[2][1], [2, 2, 2])
+        cube[0][0][0] = 5
+        self.assertEqual(self.cube.get()[0][0][0], 0)
+
+    def test_view(self):
+        """
+        Test that the view shares the state read-only, and that it keeps
+        showing the state it was taken from.
+        """
+        self.cube.rotate(0, 0)
+        view = self.cube.view()
+        self.assertEqual((view[2, 0, 0], view[2, 1, 0]), (4, 2))
+        with self.assertRaises(TypeError):
+            view[0, 0, 0] = 5
+        self.cube.rotate(0, 1)
+        self.assertEqual(view[2, 0, 0], 4)
+        self.assertNotEqual(view.tobytes(), self.cube.snapshot())
+
 
 class TestRubiksGame(unittest.TestCase):
     def setUp(self):
@@ -27,6 +93,47 @@ class TestRubiksGame(unittest.TestCase):
         """
         self.game = RubiksGame()
 
+    def test_undo_redo(self):
+        """
+        Test that undo and redo walk the move log both ways, and that a new
+        move drops the undone moves.
+        """
+        self.game.scramble([3, 7])
+        start = self.game.cube.copy()
+        for face, direction in [(0, 0), (4, 1), (2, 0)]:
+            self.game.move(face, direction)
+            self.game.add(face, direction)
+        end = self.game.cube.copy()
+        while self.game.revert_move():
+            pass
+        self.assertEqual(self.game.cube, start)
+        while self.game.redo_move():
+            pass
+        self.assertEqual(self.game.cube, end)
+        self.game.revert_move()
+        self.game.move(1, 0)
+        self.game.add(1, 0)
+        self.assertFalse(self.game.redo_move())
+        self.assertEqual(self.game.history.moves(), bytes([0, 13, 3]))
+
+    def test_seek(self):
+        """
+        Test that seeking through a long log gives the states that were
+        played, across checkpoints.
+        """
+        rng = random.Random(11)
+        states = [self.game.cube.copy()]
+        for _ in range(300):
+            face, direction = rng.randrange(6), rng.randrange(3)
+            self.game.move(face, direction)
+            self.game.add(face, direction)
+            states.append(self.game.cube.copy())
+        for index in [0, 1, 63, 64, 65, 200, 300, 128]:
+            self.game.seek(index)
+            self.assertEqual(self.game.cube, states[index])
+        self.assertTrue(self.game.redo_move())
+        self.assertEqual(self.game.cube, states[129])
+
 
 if __name__ == "__main__":
     unittest.main()
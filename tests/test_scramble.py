@@ -0,0 +1,76 @@
+import os
+import random
+import unittest
+
+from src.games_tui.games import seeds
+from src.games_tui.games.rubiks.rubiks import RubiksCube
+from src.games_tui.games.rubiks.scramble import ScramblePool, random_cubie, read_pool, write_pool
+from tests.fixtures import solver_tables
+
+
+class TestScramble(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Share the solver tables of the test run.
+        """
+        cls.tables = solver_tables()
+        cls.directory = cls.tables.directory
+
+    def test_scramble_pool(self):
+        """
+        Test that scrambles reach a random state, and that the pool is
+        persisted between sessions.
+        """
+        path = os.path.join(self.directory, "scrambles.bin")
+        pool = ScramblePool(path, size=2, directory=self.directory)
+        try:
+            seed, scramble = pool.take()
+        finally:
+            pool.close()
+        cube = RubiksCube()
+        for move in scramble:
+            cube.apply(move)
+        self.assertTrue(cube.to_cubie().is_solvable())
+        self.assertFalse(cube.is_valid())
+        self.assertEqual(cube.to_cubie(), random_cubie(seeds.stream(seed)))
+
+        write_pool(path, [(1, [0, 4]), (2 ** 64 - 1, [17])])
+        saved = ScramblePool(path, size=0)
+        self.assertEqual(saved.take(), (1, [0, 4]))
+        self.assertEqual(read_pool(path), [(2 ** 64 - 1, [17])])
+        saved.close()
+
+    def test_seeded_pool(self):
+        """
+        Test that a pool kept in memory deals the scrambles of the root seed,
+        in order, even when its background process dies.
+        """
+        taken = []
+        for kill in (False, True):
+            seeds.reseed(5)
+            pool = ScramblePool(None, size=2, directory=self.directory)
+            try:
+                if kill:
+                    pool._ScramblePool__process.kill()
+                taken.append([pool.take() for _ in range(3)])
+            finally:
+                pool.close()
+        seeds.reseed()
+        self.assertEqual(taken[0], taken[1])
+        service = seeds.RandomService(5)
+        self.assertEqual(
+            [seed for seed, _ in taken[0]], [service.game_seed("rubiks") for _ in range(3)]
+        )
+
+    def test_random_cubie(self):
+        """
+        Test that random states are always solvable.
+        """
+        rng = random.Random(5)
+        for _ in range(100):
+            self.assertTrue(random_cubie(rng).is_solvable())
+
+
+if __name__ == "__main__":
+    unittest.main()
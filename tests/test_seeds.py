@@ -0,0 +1,32 @@
+import unittest
+
+from src.games_tui.games import seeds
+from src.games_tui.games.cards import Deck
+
+
+class TestSeeds(unittest.TestCase):
+    def test_reproducible(self):
+        """
+        Test that services with the same root seed hand out the same seeds,
+        and that every game and worker gets a seed of its own.
+        """
+        a, b = seeds.RandomService(42), seeds.RandomService(42)
+        got = [a.game_seed("solitaire"), a.game_seed("solitaire"), a.game_seed("rubiks"), a.worker_seed()]
+        self.assertEqual(got, [b.game_seed("solitaire"), b.game_seed("solitaire"), b.game_seed("rubiks"), b.worker_seed()])
+        self.assertEqual(len(set(got)), len(got))
+        self.assertTrue(all(0 <= seed < 2 ** seeds.SEED_BITS for seed in got))
+        self.assertNotEqual(seeds.RandomService(43).game_seed("solitaire"), got[0])
+        self.assertTrue(a.fixed)
+        self.assertFalse(seeds.RandomService().fixed)
+
+    def test_numbered_deal(self):
+        """
+        Test that a seed deals the same deck every time.
+        """
+        deal = list(Deck(shuffle=True, rng=seeds.stream(7)))
+        self.assertEqual(list(Deck(shuffle=True, rng=seeds.stream(7))), deal)
+        self.assertNotEqual(list(Deck(shuffle=True, rng=seeds.stream(8))), deal)
+
+
+if __name__ == "__main__":
+    unittest.main()
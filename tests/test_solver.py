@@ -0,0 +1,70 @@
+import random
+import unittest
+
+from src.games_tui.games.rubiks.rubiks import RubiksCube
+from src.games_tui.games.rubiks.solver import Solver
+from tests.fixtures import solver_tables
+
+
+class TestSolver(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Share the solver tables of the test run.
+        """
+        cls.tables = solver_tables()
+        cls.solver = Solver(cls.tables)
+
+    def test_solve_scrambles(self):
+        """
+        Test that solutions of random scrambles solve the cube.
+        """
+        rng = random.Random(3)
+        for _ in range(5):
+            cube = RubiksCube()
+            for _ in range(30):
+                cube.apply(rng.randrange(18))
+            solution = self.solver.solve(cube)
+            self.assertLessEqual(len(solution), 30)
+            for move in solution:
+                cube.apply(move)
+            self.assertTrue(cube.is_valid())
+
+    def test_solve_solved(self):
+        """
+        Test that a solved cube needs no moves.
+        """
+        self.assertEqual(self.solver.solve(RubiksCube()), [])
+
+    def test_solve_one_move(self):
+        """
+        Test that every one move scramble, and a few short ones, are solved
+        with the default arguments in as many moves as they were scrambled.
+        """
+        for move in range(18):
+            cube = RubiksCube()
+            cube.apply(move)
+            self.assertEqual(len(self.solver.solve(cube)), 1)
+        for algorithm in ("R U", "R U R' U'", "L F"):
+            cube = RubiksCube()
+            cube.apply_algorithm(algorithm)
+            solution = self.solver.solve(cube)
+            self.assertEqual(len(solution), len(algorithm.split()))
+            for move in solution:
+                cube.apply(move)
+            self.assertTrue(cube.is_valid())
+
+    def test_lower_bound(self):
+        """
+        Test that searching until the timeout finds the shortest solution
+        of a short scramble, and that it is proved optimal.
+        """
+        cube = RubiksCube()
+        cube.apply_algorithm("R U")
+        moves = self.solver.solve(cube, max_length=0, timeout=0.2)
+        self.assertEqual(len(moves), 2)
+        self.assertEqual(self.solver.lower_bound(cube), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
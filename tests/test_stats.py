@@ -0,0 +1,48 @@
+import unittest
+import random
+import statistics
+
+from src.games_tui.games.rubiks.replay import Solve
+from src.games_tui.games.rubiks.stats import SolveStats, TrimmedAverage
+
+
+class TestStats(unittest.TestCase):
+    def test_trimmed_average(self):
+        """
+        Test the rolling averages against recomputing over the window.
+        """
+        rng = random.Random(16)
+        times = [rng.randrange(5000, 60000) for _ in range(400)]
+        for size, trim in [(5, 1), (12, 1), (100, 5)]:
+            avg = TrimmedAverage(size)
+            self.assertEqual(avg.trim, trim)
+            best = None
+            for i, t in enumerate(times):
+                avg.add(t)
+                if i + 1 < size:
+                    self.assertIsNone(avg.current())
+                    continue
+                window = sorted(times[i + 1 - size:i + 1])[trim:size - trim]
+                expected = statistics.fmean(window)
+                self.assertAlmostEqual(avg.current(), expected)
+                best = expected if best is None else min(best, expected)
+            self.assertAlmostEqual(avg.best, best)
+
+    def test_solve_stats(self):
+        """
+        Test best time, best move count and mean of recorded solves.
+        """
+        solves = [
+            Solve(0, b"", bytes([0, 0, 3]), [1000, 2000, 500]),
+            Solve(0, b"", bytes([0, 1, 3, 9, 10, 12]), [4000, 100, 100, 100, 0, 0]),
+        ]
+        stats = SolveStats.from_solves(solves)
+        self.assertEqual(stats.count, 2)
+        self.assertEqual(stats.best_time, 3500)
+        self.assertEqual(stats.best_moves, 2)
+        self.assertEqual(stats.mean(), 3900)
+        self.assertIsNone(stats.averages[0].current())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import random
+
+from src.games_tui.games.rubiks import facelets, symmetry
+from src.games_tui.games.rubiks.cubie import CubieCube
+from src.games_tui.games.rubiks.rubiks import RubiksCube
+
+
+class TestSymmetry(unittest.TestCase):
+    def setUp(self):
+        """
+        Scramble a cube state before tests.
+        """
+        rng = random.Random(9)
+        self.state = facelets.SOLVED
+        for _ in range(25):
+            self.state = facelets.apply(self.state, rng.randrange(18))
+
+    def test_symmetries(self):
+        """
+        Test that there are 48 distinct symmetries, all keeping the solved
+        state, and all mapping a state to a reachable state.
+        """
+        self.assertEqual(len({g for g, _ in symmetry.SYMMETRIES}), symmetry.NUM_SYMMETRIES)
+        self.assertEqual(symmetry.SYMMETRIES[0][0], facelets.IDENTITY)
+        for s in range(symmetry.NUM_SYMMETRIES):
+            self.assertEqual(symmetry.conjugate(facelets.SOLVED, s), facelets.SOLVED)
+            cc = CubieCube.from_facelets(symmetry.conjugate(self.state, s))
+            self.assertTrue(cc.is_solvable())
+
+    def test_canonical(self):
+        """
+        Test that symmetric states share their canonical state, and that
+        every single face turn is the same state up to symmetry.
+        """
+        key = symmetry.canonical_pack(self.state)
+        for s in range(symmetry.NUM_SYMMETRIES):
+            self.assertEqual(symmetry.canonical_pack(symmetry.conjugate(self.state, s)), key)
+        quarter = {symmetry.canonical(facelets.apply(facelets.SOLVED, m)) for m in range(18) if m % 3 != 2}
+        self.assertEqual(len(quarter), 1)
+        cube = RubiksCube()
+        cube.apply(7)
+        self.assertEqual(cube.canonical_pack(), facelets.pack(quarter.pop()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import unittest
+
+from src.games_tui.games.rubiks.tables import Tables, build_pruning_table, missing_tables
+from tests.fixtures import solver_tables
+
+
+def _build_tables(directory):
+    Tables(directory, processes=2)
+
+
+class TestTables(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Share the solver tables of the test run.
+        """
+        cls.tables = solver_tables()
+        cls.directory = cls.tables.directory
+
+    def test_tables_reload(self):
+        """
+        Test that tables are mapped from disk instead of being rebuilt.
+        """
+        path = self.tables.path("slice_twist_prune")
+        mtime = os.path.getmtime(path)
+        reloaded = Tables(self.directory)
+        self.assertEqual(os.path.getmtime(path), mtime)
+        self.assertEqual(bytes(reloaded.slice_twist_prune), bytes(self.tables.slice_twist_prune))
+
+    def test_concurrent_build(self):
+        """
+        Test that processes building the same missing tables at once wait
+        for each other instead of clobbering each other's files.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            context = multiprocessing.get_context("spawn")
+            builders = [context.Process(target=_build_tables, args=(directory,)) for _ in range(3)]
+            for p in builders:
+                p.start()
+            for p in builders:
+                p.join()
+            self.assertEqual([p.exitcode for p in builders], [0, 0, 0])
+            self.assertEqual(missing_tables(directory), [])
+            built = Tables(directory)
+            self.assertEqual(bytes(built.perm4_ud_edges_prune), bytes(self.tables.perm4_ud_edges_prune))
+            self.assertFalse([f for f in os.listdir(directory) if f.endswith((".part", ".ckpt", ".tmp"))])
+
+    def test_resume_parallel_build(self):
+        """
+        Test that a pruning table build resumes from its checkpoint, across
+        a pool of worker processes, and ends with the same table.
+        """
+        name, _, _, spec = Tables.specs()[-1]
+        full = bytes(getattr(self.tables, name))
+        path = os.path.join(self.directory, "resumed.bin")
+        with open(f"{path}.part", "wb") as f:
+            f.write(bytes(d if d <= 5 else 0xFF for d in full))
+        with open(f"{path}.ckpt", "w") as f:
+            json.dump({"depth": 5, "size": len(full)}, f)
+
+        build_pruning_table(path, self.directory, spec, processes=2)
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), full)
+        self.assertFalse(os.path.exists(f"{path}.ckpt"))
+
+
+if __name__ == "__main__":
+    unittest.main()
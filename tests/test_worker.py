@@ -0,0 +1,61 @@
+import time
+import unittest
+
+from src.games_tui.games.rubiks.rubiks import RubiksCube
+from src.games_tui.games.rubiks.worker import Solution, SolutionCache, SolverWorker
+from tests.fixtures import solver_tables
+
+
+class TestWorker(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        """
+        Share the solver tables of the test run.
+        """
+        cls.tables = solver_tables()
+        cls.directory = cls.tables.directory
+
+    def test_worker_supersedes(self):
+        """
+        Test that the background worker only answers the latest request.
+        """
+        cube = RubiksCube()
+        for move in [0, 7, 14, 3]:
+            cube.apply(move)
+        worker = SolverWorker(self.directory)
+        try:
+            worker.submit(RubiksCube().facelets())
+            latest = worker.submit(cube.facelets())
+            deadline = time.time() + 60
+            result = None
+            while result is None and time.time() < deadline:
+                result = worker.poll()
+                time.sleep(0.05)
+        finally:
+            worker.close()
+        self.assertIsNotNone(result)
+        gen, state, solution = result
+        self.assertEqual((gen, state), (latest, cube.facelets()))
+        self.assertLessEqual(len(solution.moves), 4)
+        for move in solution.moves:
+            cube.apply(move)
+        self.assertTrue(cube.is_valid())
+
+    def test_solution_cache(self):
+        """
+        Test that the solution cache evicts the least recently used state.
+        """
+        a, b, c = Solution([0], True), Solution([3], False), Solution([], True)
+        cache = SolutionCache(2)
+        cache.put(1, a)
+        cache.put(2, b)
+        self.assertEqual(cache.get(1), a)
+        cache.put(3, c)
+        self.assertIsNone(cache.get(2))
+        self.assertEqual((cache.get(1), cache.get(3), len(cache)), (a, c, 2))
+        with self.assertRaises(ValueError):
+            SolutionCache(0)
+
+
+if __name__ == "__main__":
+    unittest.main()